@@ -0,0 +1,119 @@
+"""
+Bytes on the wire and client-side decode time for a large pod list, per transport.
+
+Compares the client's model objects (what the tools used to get) against the raw JSON the tools
+now read, with and without gzip. Protobuf is not measured, the Python client cannot decode it.
+
+Run with: uv run python benchmarks/bench_list_transport.py
+"""
+
+import gzip
+import json
+import time
+
+from kubernetes import client
+
+POD_COUNTS = [500, 2000, 5000]
+REPEATS = 3
+
+
+def pod(index):
+    name = f"web-{index // 10}-{index:05d}"
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": f"team-{index % 40}",
+            "uid": f"00000000-0000-0000-0000-{index:012d}",
+            "resourceVersion": str(100000 + index),
+            "creationTimestamp": "2024-05-01T12:00:00Z",
+            "labels": {"app": "web", "pod-template-hash": "5d9c8b7f6", "team": f"team-{index % 40}"},
+            "ownerReferences": [
+                {
+                    "apiVersion": "apps/v1",
+                    "kind": "ReplicaSet",
+                    "name": "web-5d9c8b7f6",
+                    "uid": "rs",
+                    "controller": True,
+                }
+            ],
+        },
+        "spec": {
+            "nodeName": f"node-{index % 50}",
+            "serviceAccountName": "default",
+            "containers": [
+                {
+                    "name": "web",
+                    "image": "registry.example.com/web:1.42.0",
+                    "ports": [{"containerPort": 8080, "protocol": "TCP"}],
+                    "env": [{"name": f"SETTING_{i}", "value": f"value-{i}"} for i in range(8)],
+                    "resources": {"requests": {"cpu": "100m", "memory": "128Mi"}, "limits": {"memory": "256Mi"}},
+                    "volumeMounts": [{"name": "token", "mountPath": "/var/run/secrets", "readOnly": True}],
+                }
+            ],
+            "volumes": [{"name": "token", "projected": {"sources": [{"serviceAccountToken": {"path": "token"}}]}}],
+        },
+        "status": {
+            "phase": "Running",
+            "podIP": f"10.0.{index // 250}.{index % 250}",
+            "startTime": "2024-05-01T12:00:05Z",
+            "conditions": [
+                {"type": kind, "status": "True", "lastTransitionTime": "2024-05-01T12:00:10Z"}
+                for kind in ("Initialized", "Ready", "ContainersReady", "PodScheduled")
+            ],
+            "containerStatuses": [
+                {
+                    "name": "web",
+                    "ready": True,
+                    "restartCount": 0,
+                    "image": "registry.example.com/web:1.42.0",
+                    "imageID": "registry.example.com/web@sha256:" + "a" * 64,
+                    "containerID": "containerd://" + "b" * 64,
+                    "state": {"running": {"startedAt": "2024-05-01T12:00:08Z"}},
+                }
+            ],
+        },
+    }
+
+
+def best_of(function):
+    timings = []
+    for _ in range(REPEATS):
+        start_time = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start_time)
+    return min(timings)
+
+
+def bench(pod_count):
+    body = json.dumps(
+        {"apiVersion": "v1", "kind": "PodList", "metadata": {}, "items": [pod(i) for i in range(pod_count)]}
+    )
+    raw = body.encode()
+    compressed = gzip.compress(raw, compresslevel=1)
+    api_client = client.ApiClient()
+
+    def as_models():
+        # What the generated list methods do with the body, the public deserialize() differs between versions
+        api_client._ApiClient__deserialize(json.loads(raw), "V1PodList")
+
+    def as_json():
+        json.loads(raw)
+
+    def as_gzip_json():
+        json.loads(gzip.decompress(compressed))
+
+    return len(raw), len(compressed), best_of(as_models), best_of(as_json), best_of(as_gzip_json)
+
+
+def main():
+    print(f"{'pods':>6} {'JSON':>10} {'gzip':>10} {'models':>10} {'raw JSON':>10} {'gzip+JSON':>10}")
+    for pod_count in POD_COUNTS:
+        raw_bytes, gzip_bytes, models, plain, gzipped = bench(pod_count)
+        print(
+            f"{pod_count:>6} {raw_bytes / 2**20:>8.1f}MB {gzip_bytes / 2**20:>8.2f}MB "
+            f"{models * 1000:>8.0f}ms {plain * 1000:>8.0f}ms {gzipped * 1000:>8.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
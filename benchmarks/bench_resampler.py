@@ -0,0 +1,43 @@
+"""
+CPU time spent resampling one second of microphone audio to 24 kHz.
+
+Run with: uv run python benchmarks/bench_resampler.py
+"""
+
+import time
+
+import numpy as np
+
+from kubewhisper.modules.config import Config
+from kubewhisper.modules.resampler import Resampler
+
+SECONDS = 60
+INPUT_RATES = [16000, 44100, 48000]
+
+
+def bench(input_rate, frame_ms):
+    rng = np.random.default_rng(0)
+    frame = int(input_rate * frame_ms / 1000)
+    audio = (rng.standard_normal(input_rate * SECONDS) * 3000).astype(np.int16)
+    frames = [audio[start : start + frame].tobytes() for start in range(0, len(audio), frame)]
+
+    resampler = Resampler(input_rate)
+    start_time = time.process_time()
+    output_bytes = sum(len(resampler.process(chunk)) for chunk in frames)
+    cpu_seconds = time.process_time() - start_time
+    return cpu_seconds / SECONDS, output_bytes // 2 / SECONDS
+
+
+def main():
+    print(f"{'input rate':>10} {'frame':>7} {'CPU per audio second':>22} {'share of one core':>18} {'output rate':>12}")
+    for input_rate in INPUT_RATES:
+        for frame_ms in (10, Config.AUDIO_FRAME_MS, 43):
+            cpu_per_second, output_rate = bench(input_rate, frame_ms)
+            print(
+                f"{input_rate:>10} {frame_ms:>5}ms {cpu_per_second * 1000:>20.3f}ms "
+                f"{cpu_per_second * 100:>17.3f}% {output_rate:>12.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
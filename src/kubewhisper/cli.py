@@ -1,19 +1,118 @@
 import os
+import argparse
 import asyncio
 
-from kubewhisper.modules.simple_assistant import SimpleAssistant
-from kubewhisper.modules.logging import log_info
-
 REALTIME_API_URL = "wss://api.openai.com/v1/realtime?model=gpt-4o-realtime-preview"
-API_KEY = os.getenv("OPENAI_API_KEY")
-if not API_KEY:
-    print("Error: OPENAI_API_KEY not found in environment variables.")
-    exit(1)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Talk to your Kubernetes cluster like a friend.")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report import and initialization time per module, then exit.",
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Run without microphone and speakers, reading prompts from stdin and printing text replies.",
+    )
+    parser.add_argument(
+        "--prompts-file",
+        help="Run headless with the prompts in this file, one per line, then exit.",
+    )
+    parser.add_argument(
+        "--realtime-url",
+        default=os.getenv("KUBEWHISPER_REALTIME_URL", REALTIME_API_URL),
+        help="Realtime API endpoint, e.g. a local stand-in server for testing.",
+    )
+    parser.add_argument(
+        "--gateway",
+        action="store_true",
+        help="Serve several clients from this process, sharing its Kubernetes clients and tool results.",
+    )
+    parser.add_argument("--gateway-host", help="Address the gateway listens on (default 127.0.0.1).")
+    parser.add_argument("--gateway-port", type=int, help="Port the gateway listens on (default 8765).")
+    parser.add_argument(
+        "--connect",
+        metavar="URL",
+        help="Connect to a gateway, e.g. ws://127.0.0.1:8765, instead of the Realtime API.",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Expose Prometheus metrics on http://127.0.0.1:PORT/metrics while running.",
+    )
+    return parser.parse_args()
+
+
+def run_gateway(api_key, args):
+    from kubewhisper.modules.gateway import Gateway
+    from kubewhisper.modules.kubernetes_tools import function_map, tools
+    from kubewhisper.modules.logging import log_info
+
+    gateway = Gateway(
+        api_key,
+        args.realtime_url,
+        function_map,
+        tools,
+        host=args.gateway_host,
+        port=args.gateway_port,
+        metrics_port=args.metrics_port,
+    )
+    try:
+        asyncio.run(gateway.serve_forever())
+    except KeyboardInterrupt:
+        log_info("Gateway stopped.")
 
 
 def main():
-    log_info("Starting assistant. Press Ctrl+C to quit.")
-    assistant = SimpleAssistant(API_KEY, REALTIME_API_URL)
+    args = parse_args()
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if args.connect:
+        # The gateway holds the API key, clients connect to it instead of the Realtime API
+        args.realtime_url = args.connect
+        api_key = api_key or "gateway-client"
+    elif not api_key:
+        print("Error: OPENAI_API_KEY not found in environment variables.")
+        exit(1)
+
+    if args.profile_startup:
+        from kubewhisper.modules.startup_profiler import profile_startup
+
+        profile_startup(api_key, args.realtime_url)
+        return
+
+    # Imported here so that argument errors and --help do not pay for audio, websocket and kubernetes imports
+    from kubewhisper.modules.logging import log_info, set_console_log_level, setup_file_logging
+    from kubewhisper.modules.simple_assistant import SimpleAssistant
+
+    setup_file_logging()
+    if args.gateway:
+        run_gateway(api_key, args)
+        return
+
+    headless = args.headless or args.prompts_file is not None
+    if headless:
+        from kubewhisper.modules.headless import read_prompts_file
+
+        prompts = read_prompts_file(args.prompts_file) if args.prompts_file else None
+        # Keep stdout for the replies, everything else still goes to the log file
+        set_console_log_level("WARNING")
+        assistant = SimpleAssistant(
+            api_key,
+            args.realtime_url,
+            headless=True,
+            prompts=prompts,
+            metrics_port=args.metrics_port,
+            gateway_client=bool(args.connect),
+        )
+    else:
+        log_info("Starting assistant. Press Ctrl+C to quit.")
+        assistant = SimpleAssistant(
+            api_key, args.realtime_url, metrics_port=args.metrics_port, gateway_client=bool(args.connect)
+        )
     try:
         asyncio.run(assistant.run())
     except KeyboardInterrupt:
@@ -2,23 +2,17 @@ import pyaudio
 import queue
 import logging
 from typing import Optional, Tuple
+from kubewhisper.modules.config import Config
+from kubewhisper.modules.microphone_state import MicrophoneState
+from kubewhisper.modules.audio_format import get_audio_format
+from kubewhisper.modules.resampler import Resampler
 
 
 class AudioConfig:
     """Configuration constants for audio recording"""
 
-    CHUNK_SIZE: int = 1024
     FORMAT: int = pyaudio.paInt16
     CHANNELS: int = 1
-    SAMPLE_RATE: int = 24000
-
-
-class MicrophoneState:
-    """Enum-like class for microphone states"""
-
-    IDLE = "idle"
-    RECORDING = "recording"
-    RECEIVING = "receiving"
 
 
 class AsyncMicrophone:
@@ -28,19 +22,37 @@ class AsyncMicrophone:
     """
 
     def __init__(self) -> None:
-        """Initialize the microphone with PyAudio and setup the audio stream."""
+        """Initialize the microphone state. The audio stream is opened by open()."""
+        self._pyaudio: Optional[pyaudio.PyAudio] = None
+        self._stream: Optional[pyaudio.Stream] = None
+        self._audio_queue: queue.Queue[bytes] = queue.Queue()
+        self._state: str = MicrophoneState.IDLE
+        self._resampler: Optional[Resampler] = None
+        # Audio is resampled to the rate of the wire format and encoded in the capture callback
+        self.audio_format = get_audio_format(Config.AUDIO_FORMAT)
+        self.input_rate: Optional[int] = None
+
+    def open(self) -> None:
+        """Initialize PyAudio and open the audio input stream.
+
+        This blocks while the audio device is opened, so it can be run in a worker thread
+        while other startup work continues.
+        """
         self._pyaudio = pyaudio.PyAudio()
+        # Capturing at the device's own rate avoids resampling in the OS audio stack, which is
+        # slower and on some USB headsets not available at all
+        rate = Config.AUDIO_INPUT_RATE or int(self._pyaudio.get_default_input_device_info()["defaultSampleRate"])
         self._stream = self._pyaudio.open(
             format=AudioConfig.FORMAT,
             channels=AudioConfig.CHANNELS,
-            rate=AudioConfig.SAMPLE_RATE,
+            rate=rate,
             input=True,
-            frames_per_buffer=AudioConfig.CHUNK_SIZE,
+            frames_per_buffer=max(1, rate * Config.AUDIO_FRAME_MS // 1000),
             stream_callback=self._audio_callback,
         )
-        self._audio_queue: queue.Queue[bytes] = queue.Queue()
-        self._state: str = MicrophoneState.IDLE
-        logging.info("AsyncMicrophone initialized")
+        self.input_rate = rate
+        self._resampler = Resampler(rate, self.audio_format.sample_rate)
+        logging.info(f"AsyncMicrophone initialized at {rate} Hz with {Config.AUDIO_FRAME_MS} ms frames")
 
     def _audio_callback(self, in_data: bytes, frame_count: int, time_info: dict, status: int) -> Tuple[None, int]:
         """PyAudio callback function for handling incoming audio data.
@@ -55,7 +67,7 @@ class AsyncMicrophone:
             Tuple of (None, pyaudio.paContinue) to continue streaming
         """
         if self._state == MicrophoneState.RECORDING:
-            self._audio_queue.put(in_data)
+            self._audio_queue.put(self.audio_format.encode(self._resampler.process(in_data)))
         return (None, pyaudio.paContinue)
 
     def start_recording(self) -> None:
@@ -101,15 +113,24 @@ class AsyncMicrophone:
 
     def close(self) -> None:
         """Clean up resources and close the audio stream."""
+        if self._pyaudio is None:
+            return
         try:
             self._stream.stop_stream()
             self._stream.close()
             self._pyaudio.terminate()
+            self._pyaudio = None
+            self._stream = None
             logging.info("AsyncMicrophone closed")
         except Exception as e:
             logging.error(f"Error closing microphone: {str(e)}")
             raise
 
+    @property
+    def queue_depth(self) -> int:
+        """Number of captured chunks not yet sent."""
+        return self._audio_queue.qsize()
+
     @property
     def state(self) -> str:
         """Get the current state of the microphone.
@@ -0,0 +1,49 @@
+from typing import Callable, Optional
+
+from kubewhisper.modules.g711 import alaw_decode, alaw_encode, ulaw_decode, ulaw_encode
+from kubewhisper.modules.resampler import Resampler
+
+# Audio is captured and played as 24 kHz PCM16, the rate of the pcm16 format
+PCM16_RATE = 24000
+
+
+class AudioFormat:
+    """An audio format of the Realtime API, with its sample rate and codec."""
+
+    def __init__(
+        self,
+        name: str,
+        sample_rate: int,
+        encode: Optional[Callable[[bytes], bytes]] = None,
+        decode: Optional[Callable[[bytes], bytes]] = None,
+    ):
+        self.name = name
+        self.sample_rate = sample_rate
+        self._encode = encode
+        self._decode = decode
+
+    def encode(self, pcm16: bytes) -> bytes:
+        """Encodes PCM16 audio already at this format's sample rate."""
+        return self._encode(pcm16) if self._encode else pcm16
+
+    def to_playback(self, audio: bytes) -> bytes:
+        """Decodes received audio to 24 kHz PCM16 for the speakers."""
+        pcm16 = self._decode(audio) if self._decode else audio
+        if self.sample_rate != PCM16_RATE:
+            pcm16 = Resampler(self.sample_rate, PCM16_RATE).process(pcm16)
+        return pcm16
+
+
+# G.711 runs at 8 kHz with one byte per sample: 8 KB/s instead of the 48 KB/s of pcm16
+AUDIO_FORMATS = {
+    "pcm16": AudioFormat("pcm16", PCM16_RATE),
+    "g711_ulaw": AudioFormat("g711_ulaw", 8000, ulaw_encode, ulaw_decode),
+    "g711_alaw": AudioFormat("g711_alaw", 8000, alaw_encode, alaw_decode),
+}
+
+
+def get_audio_format(name: str) -> AudioFormat:
+    try:
+        return AUDIO_FORMATS[name]
+    except KeyError:
+        raise ValueError(f"Unknown audio format {name!r}, expected one of {', '.join(AUDIO_FORMATS)}") from None
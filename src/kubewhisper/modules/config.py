@@ -1,3 +1,6 @@
+import os
+
+
 class Config:
     SESSION_INSTRUCTIONS = (
         "You are Kuby, a helpful assistant. Respond to Patrick. "
@@ -8,3 +11,99 @@ class Config:
     PREFIX_PADDING_MS = 300
     SILENCE_THRESHOLD = 0.5
     SILENCE_DURATION_MS = 500
+
+    # Microphone capture: frame duration, and the device rate (None for its native rate). Audio is
+    # resampled to the 24 kHz the Realtime API expects
+    AUDIO_FRAME_MS = 20
+    AUDIO_INPUT_RATE = int(os.getenv("KUBEWHISPER_AUDIO_INPUT_RATE", "0")) or None
+    # Audio format on the wire: pcm16, or g711_ulaw / g711_alaw for a sixth of the bandwidth
+    AUDIO_FORMAT = os.getenv("KUBEWHISPER_AUDIO_FORMAT", "pcm16")
+
+    # Latency budgets (seconds) for tool calls, keeping a voice turn bounded when the cluster is slow
+    DEFAULT_TOOL_TIMEOUT = 8.0
+    TOOL_TIMEOUTS = {
+        "analyze_deployment_logs": 15.0,
+        "get_cluster_status": 10.0,
+        "get_kubernetes_latest_version_information": 5.0,
+        "get_top_resource_consumers": 10.0,
+        "get_rollout_status": 45.0,
+    }
+
+    # Size budget for tool results sent to the model, larger results are compacted
+    TOOL_OUTPUT_MAX_BYTES = 16000
+    TOOL_OUTPUT_MAX_TOKENS = 3000
+
+    # Reconnect behaviour when the Realtime WebSocket drops
+    RECONNECT_BASE_DELAY = 0.5
+    RECONNECT_MAX_DELAY = 30.0
+    RECONNECT_MAX_ATTEMPTS = 10
+    RECONNECT_REPLAY_ITEMS = 10
+
+    # The server-side conversation is trimmed to the newest items fitting both budgets after each
+    # response, so long sessions do not get slower and costlier per turn (None disables a budget)
+    CONVERSATION_MAX_ITEMS = 40
+    CONVERSATION_MAX_BYTES = 64000
+
+    # Longest wait (seconds) for a headless turn to be answered, tool calls included
+    HEADLESS_TURN_TIMEOUT = 60.0
+
+    # Gateway mode, serving several clients from one process. Tool results are shared between
+    # clients for GATEWAY_CACHE_TTL seconds, except for tools that change state or track what was seen
+    GATEWAY_HOST = "127.0.0.1"
+    GATEWAY_PORT = 8765
+    GATEWAY_CACHE_TTL = 5.0
+    GATEWAY_UNCACHED_TOOLS = {"switch_cluster", "analyze_deployment_logs", "get_rollout_status"}
+
+    # Address the metrics endpoint listens on, when enabled with --metrics-port
+    METRICS_HOST = os.getenv("KUBEWHISPER_METRICS_HOST", "127.0.0.1")
+
+    # Ask the Kubernetes API server for gzip compressed responses, which it uses for large lists
+    KUBE_API_GZIP = os.getenv("KUBEWHISPER_KUBE_API_GZIP", "1") != "0"
+
+    # Per-cluster timeout (seconds) when a tool queries several clusters at once
+    CLUSTER_QUERY_TIMEOUT = 10.0
+    # Clusters time out this many seconds before the tool budget, so slow ones are reported as timed out
+    CLUSTER_QUERY_MARGIN = 0.5
+
+    # Cluster status lists at most this many nodes, flagging those at or above the utilization threshold (%)
+    NODE_DETAIL_LIMIT = 20
+    NODE_OUTLIER_THRESHOLD = 90.0
+
+    # Page size when listing pod metrics, and the largest top-N a caller may ask for
+    METRICS_PAGE_SIZE = 500
+    TOP_CONSUMERS_MAX = 50
+
+    # Resource names for fuzzy lookup are relisted when older than NAME_INDEX_TTL seconds, and a
+    # spoken name only resolves to a match scoring at least NAME_MATCH_MIN_SCORE (0 to 1)
+    NAME_INDEX_TTL = 30.0
+    NAME_MATCH_MIN_SCORE = 0.5
+
+    # Node and namespace usage is sampled every USAGE_SAMPLE_INTERVAL seconds (0 disables sampling).
+    # The last USAGE_RAW_SAMPLES are kept as is, older ones as averages of USAGE_DOWNSAMPLE_FACTOR
+    # samples, USAGE_COARSE_SAMPLES of them (24 hours with the defaults)
+    USAGE_SAMPLE_INTERVAL = float(os.getenv("KUBEWHISPER_USAGE_SAMPLE_INTERVAL", "30"))
+    USAGE_RAW_SAMPLES = 120
+    USAGE_DOWNSAMPLE_FACTOR = 10
+    USAGE_COARSE_SAMPLES = 288
+
+    # Longest a rollout status question waits for the rollout to finish, within its tool budget
+    ROLLOUT_WAIT_SECONDS = 30
+
+    # Log analysis looks back this many minutes, reading at most LOG_TAIL_LINES per container and request
+    LOG_ANALYSIS_WINDOW_MINUTES = 60
+    LOG_TAIL_LINES = 1000
+    LOG_DETAIL_LIMIT = 50
+    LOG_ANALYZER_MAX_DEPLOYMENTS = 32
+    # Worker processes classifying log lines (None for one per core, 0 to classify in a thread),
+    # batches are split in chunks of LOG_CLASSIFY_CHUNK_LINES and smaller batches stay in a thread
+    LOG_CLASSIFY_WORKERS = None
+    LOG_CLASSIFY_CHUNK_LINES = 500
+    LOG_CLASSIFY_MIN_PARALLEL_LINES = 200
+
+    # Base URL of the GitHub API, can point to a local stand-in server for testing
+    GITHUB_API_URL = os.getenv("KUBEWHISPER_GITHUB_API_URL", "https://api.github.com")
+    # On-disk cache for HTTP responses, entries younger than the max age are used without a request
+    CACHE_DIR = os.path.expanduser(os.getenv("KUBEWHISPER_CACHE_DIR", "~/.cache/kubewhisper"))
+    HTTP_CACHE_DIR = os.path.join(CACHE_DIR, "http")
+    HTTP_CACHE_MAX_AGE = 3600
+    HTTP_TIMEOUT = 10.0
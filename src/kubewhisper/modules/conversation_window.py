@@ -0,0 +1,61 @@
+"""Bookkeeping for keeping the server-side Realtime conversation within a size budget."""
+
+import json
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+class ConversationWindow:
+    """The conversation items the server holds, oldest first, and which to delete to stay in budget.
+
+    A function call and its output are evicted together, the server rejects an output whose call
+    is gone. The newest item is never evicted, however large it is.
+    """
+
+    def __init__(self, max_items: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        # Item id -> (size in bytes, call id or None)
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+        self.byte_count = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, item: Dict[str, Any]):
+        """Records an item from a conversation.item.created event."""
+        item_id = item.get("id")
+        if not item_id or item_id in self._items:
+            return
+        size = len(json.dumps(item))
+        self._items[item_id] = (size, item.get("call_id"))
+        self.byte_count += size
+
+    def discard(self, item_id: str):
+        entry = self._items.pop(item_id, None)
+        if entry:
+            self.byte_count -= entry[0]
+
+    def clear(self):
+        self._items.clear()
+        self.byte_count = 0
+
+    def _over_budget(self) -> bool:
+        too_many = self.max_items is not None and len(self._items) > self.max_items
+        too_large = self.max_bytes is not None and self.byte_count > self.max_bytes
+        return too_many or too_large
+
+    def evictions(self) -> List[str]:
+        """Ids of the oldest items to delete, forgotten here right away so they are only returned once."""
+        evicted = []
+        while len(self._items) > 1 and self._over_budget():
+            item_id, (_, call_id) = next(iter(self._items.items()))
+            group = [item_id]
+            if call_id:
+                group += [other for other, (_, other_call) in self._items.items() if other_call == call_id][1:]
+            if len(group) == len(self._items):
+                break
+            for member in group:
+                self.discard(member)
+            evicted += group
+        return evicted
@@ -1,21 +1,29 @@
 import time
 import base64
 import json
+import asyncio
 from kubewhisper.modules.logging import log_tool_call, log_error, log_info, logger
 from kubewhisper.utils.utils import log_runtime
-from kubewhisper.modules.audio import play_audio
+from kubewhisper.modules.tool_deadline import run_with_deadline
+from kubewhisper.modules.config import Config
+from kubewhisper.modules.metrics import TOOL_ERRORS, TOOL_SECONDS, TURN_SECONDS
 
 
 class EventHandler:
-    def __init__(self, mic, ws_manager, function_map):
+    def __init__(self, mic, ws_manager, function_map, echo_text=True):
         self.mic = mic
         self.ws_manager = ws_manager
         self.function_map = function_map
+        self.echo_text = echo_text
         self.assistant_reply = ""
+        # Set once a response ends without tool calls, the user's turn is then fully answered
+        self.turn_complete = asyncio.Event()
+        self.last_reply = ""
+        self.turn_start_time = None
         self.audio_chunks = []
         self.response_in_progress = False
-        self.function_call = None
-        self.function_call_args = ""
+        self.function_calls = {}
+        self.function_call_tasks = {}
         self.response_start_time = None
 
     async def handle_event(self, event):
@@ -23,9 +31,8 @@ class EventHandler:
         handlers = {
             "response.created": self.handle_response_created,
             "response.output_item.added": lambda: self.handle_output_item_added(event),
-            "response.function_call_arguments.delta": lambda: self.handle_function_call_arguments_delta(
-                event.get("delta", "")
-            ),
+            "response.output_item.done": lambda: self.handle_output_item_done(event),
+            "response.function_call_arguments.delta": lambda: self.handle_function_call_arguments_delta(event),
             "response.function_call_arguments.done": lambda: self.handle_function_call(event),
             "response.text.delta": lambda: self.handle_text_delta(event.get("delta", "")),
             "response.audio.delta": lambda: self.handle_audio_delta(event["delta"]),
@@ -48,15 +55,33 @@ class EventHandler:
             self.response_start_time = None
 
         log_info("Assistant response complete.")
+        turn_complete = not self.function_call_tasks
+        if self.function_call_tasks:
+            await self.send_function_call_results()
         if self.audio_chunks:
-            audio_data = b"".join(self.audio_chunks)
+            # Imported on first playback, so text-only sessions never load the audio libraries
+            from kubewhisper.modules.audio import play_audio
+            from kubewhisper.modules.audio_format import get_audio_format
+
+            audio_format = get_audio_format(Config.AUDIO_FORMAT)
+            audio_data = audio_format.to_playback(b"".join(self.audio_chunks))
             logger.info(f"Sending {len(audio_data)} bytes of audio data to play_audio()")
             await play_audio(audio_data)
             logger.info("Finished play_audio()")
+        self.last_reply = self.assistant_reply
         self.assistant_reply = ""
         self.audio_chunks = []
         logger.info("Calling stop_receiving()")
         self.mic.stop_receiving()
+        if turn_complete:
+            if self.turn_start_time is not None:
+                TURN_SECONDS.observe(time.perf_counter() - self.turn_start_time)
+                self.turn_start_time = None
+            self.turn_complete.set()
+
+    def start_turn(self):
+        """Mark the moment the user finished asking, turn latency is measured from here."""
+        self.turn_start_time = time.perf_counter()
 
     async def handle_response_created(self):
         self.mic.start_receiving()
@@ -64,13 +89,16 @@ class EventHandler:
 
     async def handle_text_delta(self, delta):
         self.assistant_reply += delta
-        print(f"Assistant: {delta}", end="", flush=True)
+        if self.echo_text:
+            print(f"Assistant: {delta}", end="", flush=True)
 
     async def handle_audio_delta(self, delta):
         self.audio_chunks.append(base64.b64decode(delta))
 
-    async def handle_function_call_arguments_delta(self, delta):
-        self.function_call_args += delta
+    async def handle_function_call_arguments_delta(self, event):
+        function_call = self.function_calls.get(event.get("call_id"))
+        if function_call:
+            function_call["arguments"] += event.get("delta", "")
 
     async def handle_speech_started(self):
         logger.info("Speech detected, listening...")
@@ -79,6 +107,7 @@ class EventHandler:
         self.mic.stop_recording()
         logger.info("Speech ended, processing...")
         self.response_start_time = time.perf_counter()
+        self.start_turn()
         await self.ws_manager.send_message({"type": "input_audio_buffer.commit"})
 
     async def handle_rate_limits_updated(self):
@@ -89,24 +118,55 @@ class EventHandler:
     async def handle_output_item_added(self, event):
         item = event.get("item", {})
         if item.get("type") == "function_call":
-            self.function_call = item
-            self.function_call_args = ""
+            self.function_calls[item.get("call_id")] = {"name": item.get("name"), "arguments": ""}
 
-    async def handle_function_call(self, event):
-        if self.function_call:
-            function_name = self.function_call.get("name")
-            call_id = self.function_call.get("call_id")
-            logger.info(f"Function call: {function_name} with args: {self.function_call_args}")
-            try:
-                args = json.loads(self.function_call_args) if self.function_call_args else {}
-            except json.JSONDecodeError:
-                args = {}
-            await self.execute_function_call(function_name, call_id, args)
+    async def handle_output_item_done(self, event):
+        item = event.get("item", {})
+        if item.get("type") == "function_call":
+            self.ws_manager.remember_item(
+                {
+                    "type": "function_call",
+                    "call_id": item.get("call_id"),
+                    "name": item.get("name"),
+                    "arguments": item.get("arguments", ""),
+                }
+            )
+        elif item.get("type") == "message" and item.get("role") == "assistant":
+            text = "".join(part.get("transcript") or part.get("text") or "" for part in item.get("content", []))
+            if text:
+                self.ws_manager.remember_item(
+                    {"type": "message", "role": "assistant", "content": [{"type": "text", "text": text}]}
+                )
 
-    async def execute_function_call(self, function_name, call_id, args):
+    async def handle_function_call(self, event):
+        call_id = event.get("call_id")
+        function_call = self.function_calls.pop(call_id, None)
+        if function_call is None:
+            return
+
+        function_name = function_call["name"] or event.get("name")
+        function_call_args = event.get("arguments") or function_call["arguments"]
+        logger.info(f"Function call: {function_name} with args: {function_call_args}")
+        try:
+            args = json.loads(function_call_args) if function_call_args else {}
+        except json.JSONDecodeError:
+            args = {}
+
+        # Start executing right away so calls from the same response run concurrently
+        self.function_call_tasks[call_id] = asyncio.create_task(self.execute_function_call(function_name, args))
+
+    async def execute_function_call(self, function_name, args):
+        start_time = time.perf_counter()
+        result = await self._execute_function_call(function_name, args)
+        TOOL_SECONDS.observe(time.perf_counter() - start_time, tool=function_name)
+        if isinstance(result, dict) and "error" in result:
+            TOOL_ERRORS.inc(tool=function_name)
+        return result
+
+    async def _execute_function_call(self, function_name, args):
         if function_name in self.function_map:
             try:
-                result = await self.function_map[function_name](**args)
+                result = await run_with_deadline(function_name, self.function_map[function_name], args)
                 log_tool_call(function_name, args, result)
             except Exception as e:
                 error_message = f"Error executing function '{function_name}': {str(e)}"
@@ -118,12 +178,27 @@ class EventHandler:
             log_error(error_message)
             result = {"error": error_message}
             await self.send_error_message_to_assistant(error_message)
-
-        await self.ws_manager.send_function_call_output(call_id, result)
-
-        # Reset function call state
-        self.function_call = None
-        self.function_call_args = ""
+        return result
+
+    async def send_function_call_results(self):
+        """Wait for all function calls of the response and send their outputs in one batch."""
+        call_ids = list(self.function_call_tasks)
+        results = await asyncio.gather(*self.function_call_tasks.values())
+        self.function_call_tasks = {}
+        self.function_calls = {}
+        await self.ws_manager.send_function_call_outputs(list(zip(call_ids, results)))
+
+    def reset(self):
+        """Drop the state of a response that was interrupted by a lost connection."""
+        for task in self.function_call_tasks.values():
+            task.cancel()
+        self.function_call_tasks = {}
+        self.function_calls = {}
+        self.assistant_reply = ""
+        self.audio_chunks = []
+        self.response_in_progress = False
+        self.response_start_time = None
+        self.turn_start_time = None
 
     async def handle_error(self, event):
         error_message = event.get("error", {}).get("message", "")
@@ -0,0 +1,152 @@
+"""Gateway mode: one process serving many assistant clients over a local WebSocket.
+
+Clients connect with ``kubewhisper --connect`` and speak the Realtime protocol as if the gateway
+were the API. Every client gets its own upstream Realtime connection, but tool calls are answered
+by the gateway, so all clients share its Kubernetes client pool and result cache.
+"""
+
+import asyncio
+import json
+
+import websockets
+from websockets.asyncio.server import serve
+
+from kubewhisper.modules.config import Config
+from kubewhisper.modules.event_handler import EventHandler
+from kubewhisper.modules.headless import NullMicrophone
+from kubewhisper.modules.http_cache import close_http_session
+from kubewhisper.modules.kube_client import start_session
+from kubewhisper.modules.kubernetes_tools import run_usage_sampler
+from kubewhisper.modules.log_analyzer import shutdown_process_pool
+from kubewhisper.modules.logging import log_info, log_warning
+from kubewhisper.modules.metrics import start_metrics_server
+from kubewhisper.modules.result_cache import ResultCache, cached_function_map
+from kubewhisper.modules.websocket_manager import WebSocketManager
+
+# Upstream events about tool calls, answered by the gateway and never shown to the client
+TOOL_CALL_EVENTS = {
+    "response.function_call_arguments.delta",
+    "response.function_call_arguments.done",
+}
+
+
+class GatewayEventHandler(EventHandler):
+    """Runs the tool calls of one client's conversation, leaving audio and text to the client."""
+
+    HANDLED_EVENTS = TOOL_CALL_EVENTS | {
+        "response.output_item.added",
+        "response.output_item.done",
+        "response.done",
+    }
+
+    async def handle_event(self, event):
+        if event.get("type") in self.HANDLED_EVENTS:
+            await super().handle_event(event)
+
+    async def handle_response_done(self):
+        if self.function_call_tasks:
+            await self.send_function_call_results()
+
+
+def is_tool_call_event(event) -> bool:
+    """Whether the event only concerns tool calls, which the client does not need to see."""
+    event_type = event.get("type")
+    if event_type in TOOL_CALL_EVENTS:
+        return True
+    if event_type in ("response.output_item.added", "response.output_item.done"):
+        return event.get("item", {}).get("type") == "function_call"
+    if event_type == "response.done":
+        # The gateway answers with the tool outputs, the client only sees the response that follows
+        output = event.get("response", {}).get("output", [])
+        return any(item.get("type") == "function_call" for item in output)
+    return False
+
+
+class Gateway:
+    def __init__(self, openai_api_key, realtime_api_url, function_map, tools, host=None, port=None, metrics_port=None):
+        self.openai_api_key = openai_api_key
+        self.realtime_api_url = realtime_api_url
+        self.tools = tools
+        self.host = host or Config.GATEWAY_HOST
+        self.port = Config.GATEWAY_PORT if port is None else port
+        self.cache = ResultCache(Config.GATEWAY_CACHE_TTL)
+        self.function_map = cached_function_map(function_map, self.cache, Config.GATEWAY_UNCACHED_TOOLS)
+        self.sessions = 0
+        self.metrics_port = metrics_port
+        self._server = None
+
+    async def start(self) -> str:
+        """Start accepting clients, returning the URL they connect to."""
+        self._server = await serve(self._handle_client, self.host, self.port)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        url = f"ws://{host}:{port}"
+        log_info(f"🛰️ Gateway listening on {url}")
+        return url
+
+    async def serve_forever(self):
+        metrics_server = None
+        if self.metrics_port is not None:
+            metrics_server = await start_metrics_server(self.metrics_port, Config.METRICS_HOST)
+        await self.start()
+        usage_sampler = None
+        if Config.USAGE_SAMPLE_INTERVAL > 0:
+            usage_sampler = asyncio.create_task(run_usage_sampler(Config.USAGE_SAMPLE_INTERVAL))
+        try:
+            await self._server.serve_forever()
+        finally:
+            if usage_sampler:
+                usage_sampler.cancel()
+            await self.close()
+            await close_http_session()
+            shutdown_process_pool()
+            if metrics_server:
+                await metrics_server.cleanup()
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_client(self, client):
+        # Switching clusters in one client's conversation must not switch them for the others
+        start_session()
+        self.sessions += 1
+        # The client trims its own conversation, trimming here as well would delete items twice
+        ws_manager = WebSocketManager(self.openai_api_key, self.realtime_api_url, trim_conversation=False)
+        event_handler = GatewayEventHandler(NullMicrophone(), ws_manager, self.function_map, echo_text=False)
+        log_info(f"🛰️ Client connected ({self.sessions} active)")
+        try:
+            await ws_manager.connect()
+            to_upstream = asyncio.create_task(self._client_to_upstream(client, ws_manager))
+            to_client = asyncio.create_task(self._upstream_to_client(client, ws_manager, event_handler))
+            done, pending = await asyncio.wait({to_upstream, to_client}, return_when=asyncio.FIRST_COMPLETED)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    log_warning(f"Gateway session ended: {task.exception()}")
+        except (OSError, websockets.WebSocketException) as e:
+            log_warning(f"Could not connect a gateway client to the Realtime API: {e}")
+        finally:
+            event_handler.reset()
+            await ws_manager.close()
+            await client.close()
+            self.sessions -= 1
+            log_info(f"🛰️ Client disconnected ({self.sessions} active)")
+
+    async def _client_to_upstream(self, client, ws_manager):
+        async for message in client:
+            event = json.loads(message)
+            if event.get("type") == "session.update":
+                # The gateway runs the tools, so it decides which ones the model is offered
+                event["session"] = dict(event.get("session", {}), tools=self.tools)
+            await ws_manager.send_message(event)
+
+    async def _upstream_to_client(self, client, ws_manager, event_handler):
+        while True:
+            event = await ws_manager.receive_message()
+            await event_handler.handle_event(event)
+            if not is_tool_call_event(event):
+                await client.send(json.dumps(event))
@@ -0,0 +1,82 @@
+import asyncio
+import sys
+from collections import deque
+from typing import Iterable, List, Optional
+
+from kubewhisper.modules.microphone_state import MicrophoneState
+
+
+class NullMicrophone:
+    """Stands in for AsyncMicrophone when running without audio devices.
+
+    It follows the same state changes, so the event handler can drive it unchanged, but never
+    produces audio.
+    """
+
+    def __init__(self) -> None:
+        self._state: str = MicrophoneState.IDLE
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def start_recording(self) -> None:
+        self._state = MicrophoneState.RECORDING
+
+    def stop_recording(self) -> None:
+        if self._state == MicrophoneState.RECORDING:
+            self._state = MicrophoneState.IDLE
+
+    def start_receiving(self) -> None:
+        self._state = MicrophoneState.RECEIVING
+
+    def stop_receiving(self) -> None:
+        if self._state == MicrophoneState.RECEIVING:
+            self._state = MicrophoneState.IDLE
+
+    def get_audio_data(self) -> Optional[bytes]:
+        return None
+
+    @property
+    def queue_depth(self) -> int:
+        return 0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+
+def read_prompts_file(path: str) -> List[str]:
+    """Prompts from a file, one per line. Blank lines and lines starting with # are skipped."""
+    with open(path, encoding="utf-8") as prompts_file:
+        lines = (line.strip() for line in prompts_file)
+        return [line for line in lines if line and not line.startswith("#")]
+
+
+class PromptSource:
+    """Prompts from a list, or from stdin until end of input when no list is given."""
+
+    def __init__(self, prompts: Optional[Iterable[str]] = None):
+        self._prompts = deque(prompts) if prompts is not None else None
+
+    async def next_prompt(self) -> Optional[str]:
+        """The next prompt, or None when there are no more."""
+        if self._prompts is not None:
+            return self._prompts.popleft() if self._prompts else None
+        while True:
+            line = await asyncio.to_thread(sys.stdin.readline)
+            if not line:
+                return None
+            if line.strip():
+                return line.strip()
+
+
+async def run_turn(ws_manager, event_handler, prompt: str, timeout: float) -> str:
+    """Sends a text prompt and waits until the assistant has fully answered it, tool calls included."""
+    event_handler.turn_complete.clear()
+    event_handler.start_turn()
+    await ws_manager.send_user_input(prompt)
+    await asyncio.wait_for(event_handler.turn_complete.wait(), timeout)
+    return event_handler.last_reply
@@ -0,0 +1,151 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from kubewhisper.modules.config import Config
+from kubewhisper.modules.logging import log_warning, logger
+from kubewhisper.modules.metrics import CACHE_REQUESTS
+
+if TYPE_CHECKING:
+    import aiohttp
+
+_session: Optional["aiohttp.ClientSession"] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+_revalidations: Dict[str, asyncio.Task] = {}
+
+
+class HttpStatusError(Exception):
+    """Raised when a server answers with an unexpected status code."""
+
+    def __init__(self, status: int) -> None:
+        super().__init__(f"request failed with status {status}")
+        self.status = status
+
+
+async def get_http_session() -> "aiohttp.ClientSession":
+    """Returns the HTTP session shared by all tools, so connections are reused between questions."""
+    import aiohttp
+
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=Config.HTTP_TIMEOUT))
+        _session_loop = loop
+    return _session
+
+
+async def close_http_session() -> None:
+    """Close the shared HTTP session, e.g. when the assistant stops."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+class HttpCache:
+    """On-disk cache of JSON responses, revalidated with ETag / Last-Modified headers."""
+
+    def __init__(self, cache_dir: Optional[str] = None) -> None:
+        self.cache_dir = cache_dir or Config.HTTP_CACHE_DIR
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def load(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(url)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, url: str, entry: Dict[str, Any]) -> None:
+        """Write an entry atomically, so a concurrent reader never sees a partial file."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(temp_path, self._path(url))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+async def _revalidate(cache: HttpCache, url: str, entry: Optional[Dict[str, Any]]) -> Any:
+    """Fetch a URL, sending the cached validators so an unchanged resource costs a 304 only."""
+    headers = {}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    session = await get_http_session()
+    async with session.get(url, headers=headers) as response:
+        if response.status == 304 and entry:
+            logger.debug(f"HTTP cache revalidated {url}")
+            entry = {**entry, "fetched_at": time.time()}
+        elif response.status == 200:
+            entry = {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+                "body": await response.json(),
+            }
+        else:
+            raise HttpStatusError(response.status)
+
+    await asyncio.to_thread(cache.store, url, entry)
+    return entry["body"]
+
+
+async def _revalidate_in_background(cache: HttpCache, url: str, entry: Dict[str, Any]) -> None:
+    try:
+        await _revalidate(cache, url, entry)
+    except Exception as e:
+        log_warning(f"Background refresh of {url} failed: {str(e)}")
+    finally:
+        _revalidations.pop(url, None)
+
+
+async def fetch_json(
+    url: str,
+    max_age: Optional[float] = None,
+    stale_while_revalidate: bool = True,
+    cache: Optional[HttpCache] = None,
+) -> Tuple[Any, str]:
+    """Returns the JSON body of a URL and where it came from: "fresh", "stale" or "network".
+
+    Cached bodies younger than ``max_age`` are returned without a request. Older ones are
+    returned right away in stale-while-revalidate mode while a refresh runs in the
+    background, otherwise they are revalidated first. If the server cannot be reached, a
+    stale cached body is returned rather than an error.
+    """
+    body, source = await _fetch_json(url, max_age, stale_while_revalidate, cache or HttpCache())
+    CACHE_REQUESTS.inc(cache="http", result=source)
+    return body, source
+
+
+async def _fetch_json(url, max_age, stale_while_revalidate, cache):
+    max_age = Config.HTTP_CACHE_MAX_AGE if max_age is None else max_age
+    entry = await asyncio.to_thread(cache.load, url)
+
+    if entry:
+        if time.time() - entry["fetched_at"] < max_age:
+            return entry["body"], "fresh"
+        if stale_while_revalidate:
+            if url not in _revalidations:
+                _revalidations[url] = asyncio.create_task(_revalidate_in_background(cache, url, entry))
+            return entry["body"], "stale"
+
+    try:
+        return await _revalidate(cache, url, entry), "network"
+    except Exception as e:
+        if entry is None:
+            raise
+        log_warning(f"Using stale cached response for {url}: {str(e)}")
+        return entry["body"], "stale"
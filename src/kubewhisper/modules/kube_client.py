@@ -0,0 +1,164 @@
+import json
+import os
+import tempfile
+import threading
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from kubewhisper.modules.config import Config
+from kubewhisper.modules.kubeconfig_index import get_kubeconfig_index
+
+if TYPE_CHECKING:
+    from kubernetes import client
+
+# The kubernetes package is slow to import, so it is only imported on first use (or during
+# the startup warm-up, which runs in a worker thread)
+
+# Request timeout for the warm-up call, it only exists to open the connection early
+WARM_UP_TIMEOUT = 5.0
+
+_api_clients: Dict[Optional[str], "client.ApiClient"] = {}
+# Kubeconfig entries each client was built from, so a reload only drops the clients whose entries changed
+_api_client_sources: Dict[Optional[str], str] = {}
+_api_clients_generation = 0
+_lock = threading.Lock()
+
+# Context selected with switch_cluster, None means the kubeconfig current-context. The holder is shared
+# by the whole process unless start_session() gives a task (and the tasks it creates) its own.
+_session: ContextVar[Dict[str, Optional[str]]] = ContextVar("kube_session", default={"context": None})
+
+
+def start_session() -> None:
+    """Give the current task its own active context, e.g. for one client of the gateway."""
+    _session.set({"context": None})
+
+
+def get_active_context() -> Optional[str]:
+    """Returns the context selected for this session, or None if the kubeconfig current-context is used."""
+    return _session.get()["context"]
+
+
+def set_active_context(context: str) -> None:
+    """Switch the session to another context without touching the kubeconfig file."""
+    _session.get()["context"] = context
+
+
+def get_api_client(context: Optional[str] = None) -> "client.ApiClient":
+    """Returns a shared API client for the given kubeconfig context (the active one if None).
+
+    Reusing one client per context keeps its connection pool, so only the first request
+    pays for building the configuration and the TLS handshake. Clients are rebuilt when the
+    kubeconfig entries of their context change.
+    """
+    from kubernetes import config
+
+    global _api_clients_generation
+    index = get_kubeconfig_index()
+    context = context or get_active_context() or index.current_context_name
+    with _lock:
+        if _api_clients_generation != index.generation:
+            # Switching clusters rewrites the current-context, which leaves every context's own entries as they were
+            for name in list(_api_clients):
+                if _context_source(index, name) != _api_client_sources.get(name):
+                    del _api_clients[name]
+                    del _api_client_sources[name]
+            _api_clients_generation = index.generation
+        api_client = _api_clients.get(context)
+        if api_client is None:
+            api_client = config.new_client_from_config_dict(index.config, context=context, persist_config=False)
+            if Config.KUBE_API_GZIP:
+                # The API server compresses large responses when asked, urllib3 decompresses them
+                api_client.set_default_header("Accept-Encoding", "gzip")
+            _api_clients[context] = api_client
+            _api_client_sources[context] = _context_source(index, context)
+        return api_client
+
+
+def _context_source(index, context: Optional[str]) -> str:
+    """The context, cluster and user entries a client for the context is built from."""
+    entry = index.contexts_by_name.get(context) or {}
+    cluster_name = entry.get("context", {}).get("cluster")
+    user_name = entry.get("context", {}).get("user")
+    cluster = next(
+        (cluster for cluster in index.config.get("clusters", []) if cluster.get("name") == cluster_name), None
+    )
+    user = next((user for user in index.config.get("users", []) if user.get("name") == user_name), None)
+    return json.dumps([entry, cluster, user], sort_keys=True, default=str)
+
+
+def prebuild_api_clients() -> None:
+    """Create a client for every context, so switching clusters later needs no kubeconfig parsing.
+
+    This is blocking and meant to run in a worker thread.
+    """
+    for context_name in list(get_kubeconfig_index().contexts_by_name):
+        get_api_client(context_name)
+
+
+def persist_current_context(context: str, config_file: Optional[str] = None) -> None:
+    """Write the current-context to the kubeconfig file.
+
+    By default this is the file kubectl would write it to when KUBECONFIG lists several files.
+    The file is written to a temporary file next to it and renamed over the original, so
+    readers such as kubectl never see a partially written kubeconfig.
+    """
+    import yaml
+
+    config_file = config_file or get_kubeconfig_index().current_context_file
+    with open(config_file) as f:
+        kube_config = yaml.safe_load(f)
+    kube_config["current-context"] = context
+
+    directory = os.path.dirname(os.path.abspath(config_file))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".kubeconfig-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            yaml.safe_dump(kube_config, f)
+        os.chmod(temp_path, os.stat(config_file).st_mode & 0o777)
+        os.replace(temp_path, config_file)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def list_json(list_call: Callable, *args, **kwargs) -> Dict[str, Any]:
+    """Calls a generated list method and returns the decoded JSON body.
+
+    Skips building the client's model objects, which takes far longer than parsing the JSON for
+    large lists. Items are the plain API dicts, with camelCase keys and string timestamps.
+    """
+    response = list_call(*args, _preload_content=False, **kwargs)
+    return json.loads(response.data)
+
+
+def core_v1_api(context: Optional[str] = None) -> "client.CoreV1Api":
+    from kubernetes import client
+
+    return client.CoreV1Api(get_api_client(context))
+
+
+def apps_v1_api(context: Optional[str] = None) -> "client.AppsV1Api":
+    from kubernetes import client
+
+    return client.AppsV1Api(get_api_client(context))
+
+
+def custom_objects_api(context: Optional[str] = None) -> "client.CustomObjectsApi":
+    from kubernetes import client
+
+    return client.CustomObjectsApi(get_api_client(context))
+
+
+def version_api(context: Optional[str] = None) -> "client.VersionApi":
+    from kubernetes import client
+
+    return client.VersionApi(get_api_client(context))
+
+
+def warm_up() -> str:
+    """Create the client for the current context and open its connection to the API server.
+
+    Returns the API server version. This is blocking and meant to run in a worker thread.
+    """
+    version = version_api().get_code(_request_timeout=WARM_UP_TIMEOUT)
+    return version.git_version
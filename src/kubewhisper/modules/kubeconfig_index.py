@@ -0,0 +1,128 @@
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+DEFAULT_KUBECONFIG = "~/.kube/config"
+
+# Named lists that are merged across kubeconfig files, the first file defining a name wins
+NAMED_SECTIONS = {"clusters": "cluster", "contexts": "context", "users": "user"}
+
+# File references that are relative to the kubeconfig file they appear in
+PATH_FIELDS = {
+    "cluster": ["certificate-authority"],
+    "user": ["client-certificate", "client-key", "tokenFile"],
+}
+
+
+def get_kubeconfig_paths() -> List[str]:
+    """Returns the kubeconfig files to use, following the KUBECONFIG rules of kubectl."""
+    kubeconfig = os.environ.get("KUBECONFIG", "")
+    paths = [path for path in kubeconfig.split(os.pathsep) if path] or [DEFAULT_KUBECONFIG]
+    return [os.path.abspath(os.path.expanduser(path)) for path in paths]
+
+
+def _resolve_paths(entry: Dict[str, Any], kind: str, base_dir: str) -> Dict[str, Any]:
+    """Make file references in a cluster or user entry absolute, so they survive merging."""
+    data = entry.get(kind)
+    if not isinstance(data, dict):
+        return entry
+    resolved = dict(data)
+    for field in PATH_FIELDS.get(kind, []):
+        if resolved.get(field) and not os.path.isabs(resolved[field]):
+            resolved[field] = os.path.join(base_dir, os.path.expanduser(resolved[field]))
+    return {**entry, kind: resolved}
+
+
+class KubeconfigIndex:
+    """Parsed and merged view of all kubeconfig files, reloaded only when one of them changes.
+
+    Contexts are indexed by context name and by cluster name, so lookups do not have to
+    walk the (possibly large) kubeconfig.
+    """
+
+    def __init__(self, paths: Optional[List[str]] = None) -> None:
+        self._paths = paths
+        self._lock = threading.Lock()
+        self._mtimes: Dict[str, Optional[int]] = {}
+        self.generation = 0
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.config: Dict[str, Any] = {}
+        self.contexts: List[Dict[str, Any]] = []
+        self.contexts_by_name: Dict[str, Dict[str, Any]] = {}
+        self.contexts_by_cluster: Dict[str, Dict[str, Any]] = {}
+        self.current_context_name: Optional[str] = None
+        self.current_context_file: Optional[str] = None
+
+    @property
+    def paths(self) -> List[str]:
+        return self._paths or get_kubeconfig_paths()
+
+    def refresh(self) -> "KubeconfigIndex":
+        """Reload the kubeconfig if any file was added, removed or modified since the last load."""
+        paths = self.paths
+        mtimes = {}
+        for path in paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                mtimes[path] = None
+
+        with self._lock:
+            if mtimes != self._mtimes:
+                self._load(paths, mtimes)
+        return self
+
+    def _load(self, paths: List[str], mtimes: Dict[str, Optional[int]]) -> None:
+        import yaml
+
+        files = {}
+        for path in paths:
+            if mtimes[path] is not None:
+                with open(path) as f:
+                    files[path] = yaml.safe_load(f) or {}
+
+        merged: Dict[str, Any] = {section: [] for section in NAMED_SECTIONS}
+        seen = {section: set() for section in NAMED_SECTIONS}
+        current_context_name = None
+        current_context_file = None
+        for path, kube_config in files.items():
+            base_dir = os.path.dirname(path)
+            for section, kind in NAMED_SECTIONS.items():
+                for entry in kube_config.get(section) or []:
+                    if entry.get("name") in seen[section]:
+                        continue
+                    seen[section].add(entry.get("name"))
+                    merged[section].append(_resolve_paths(entry, kind, base_dir))
+            if current_context_file is None and kube_config.get("current-context"):
+                current_context_name = kube_config["current-context"]
+                current_context_file = path
+        merged["current-context"] = current_context_name
+
+        self.files = files
+        self.config = merged
+        self.contexts = merged["contexts"]
+        self.contexts_by_name = {ctx["name"]: ctx for ctx in self.contexts}
+        self.contexts_by_cluster = {}
+        for ctx in self.contexts:
+            self.contexts_by_cluster.setdefault(ctx.get("context", {}).get("cluster"), ctx)
+        self.current_context_name = current_context_name
+        # kubectl writes the current-context to the first file that sets it, or else the first file
+        self.current_context_file = current_context_file or (next(iter(files), None) or paths[0])
+        self._mtimes = mtimes
+        self.generation += 1
+
+    @property
+    def current_context(self) -> Optional[Dict[str, Any]]:
+        return self.contexts_by_name.get(self.current_context_name)
+
+    def find_context(self, name: str) -> Optional[Dict[str, Any]]:
+        """Look up a context by its context name or by the name of its cluster."""
+        return self.contexts_by_name.get(name) or self.contexts_by_cluster.get(name)
+
+
+_kubeconfig_index = KubeconfigIndex()
+
+
+def get_kubeconfig_index() -> KubeconfigIndex:
+    """Returns the shared kubeconfig index, reloaded first if a kubeconfig file changed."""
+    return _kubeconfig_index.refresh()
@@ -1,165 +1,297 @@
+import asyncio
 import datetime
-import re
-import os
-import json
-from collections import defaultdict
-import aiohttp
-import yaml
-from kubernetes import client, config
-from typing import Dict, Any
+import functools
+import time
+from collections import Counter, deque
+from typing import Dict, Any, Optional
+from kubewhisper.modules.tool_deadline import ToolDeadline
+from kubewhisper.modules.kube_client import (
+    apps_v1_api,
+    core_v1_api,
+    custom_objects_api,
+    get_active_context,
+    list_json,
+    persist_current_context,
+    set_active_context,
+    version_api,
+)
+from kubewhisper.modules.kubeconfig_index import get_kubeconfig_index
+from kubewhisper.modules.logging import log_error, log_info, log_warning
+from kubewhisper.modules.config import Config
+from kubewhisper.modules.http_cache import HttpStatusError, fetch_json
+from kubewhisper.modules.log_analyzer import LogAnalyzer, classify_batch, get_process_pool
+from kubewhisper.modules.multi_cluster import CLUSTERS_PARAMETER, for_clusters
+from kubewhisper.modules.name_index import NameIndex
 
 
-async def get_number_of_nodes():
+# Keeps references to fire-and-forget tasks so they are not garbage collected while running
+_background_tasks = set()
+
+
+def _request_kwargs(deadline: Optional[ToolDeadline]) -> Dict[str, Any]:
+    """Keyword arguments bounding a Kubernetes API request by the remaining tool budget."""
+    return {"_request_timeout": deadline.request_timeout()} if deadline else {}
+
+
+def _context_name(context: Optional[str] = None) -> str:
+    """The name of the given context, or of the active one when None."""
+    return context or get_active_context() or get_kubeconfig_index().current_context_name
+
+
+def _list_in_scope(api, resource: str, namespace: Optional[str] = None, **kwargs):
+    """Lists a namespaced resource in one namespace, or across all when none is given."""
+    if namespace:
+        return getattr(api, f"list_namespaced_{resource}")(namespace, **kwargs)
+    return getattr(api, f"list_{resource}_for_all_namespaces")(**kwargs)
+
+
+def _scope(namespace: Optional[str], label_selector: Optional[str]) -> Dict[str, str]:
+    """Describes the namespace and labels a result was limited to, for the model to repeat back."""
+    scope = {"namespace": namespace or "all"}
+    if label_selector:
+        scope["label_selector"] = label_selector
+    return scope
+
+
+def _event_filter(pods):
+    """Keeps events about the given pods, so label-selected questions only see their own events.
+
+    Events carry no labels of their own, so a label selector is applied to the pods and matched by name.
+    """
+    names = {(pod["metadata"].get("namespace"), pod["metadata"]["name"]) for pod in pods}
+
+    def matches(namespace, kind, name):
+        return kind == "Pod" and (namespace, name) in names
+
+    return matches
+
+
+async def get_number_of_nodes(context: Optional[str] = None):
     """Returns the number of nodes in the current Kubernetes cluster."""
     try:
-        # Load kube config from default location
-        config.load_kube_config()
-
         # Create API client
-        v1 = client.CoreV1Api()
+        v1 = core_v1_api(context)
 
         # List all nodes
-        nodes = v1.list_node()
+        nodes = await asyncio.to_thread(v1.list_node)
 
         return {"node_count": len(nodes.items)}
     except Exception as e:
         return {"error": f"Failed to get node count: {str(e)}"}
 
 
-async def get_number_of_pods():
-    """Returns the number of pods in the current Kubernetes cluster."""
+async def get_number_of_pods(
+    namespace: Optional[str] = None, label_selector: Optional[str] = None, context: Optional[str] = None
+):
+    """Returns the number of pods in the current Kubernetes cluster, optionally scoped."""
     try:
-        # Load kube config from default location
-        config.load_kube_config()
-
         # Create API client
-        v1 = client.CoreV1Api()
+        v1 = core_v1_api(context)
 
-        # List all pods across all namespaces
-        pods = v1.list_pod_for_all_namespaces()
+        # Namespace and labels are filtered by the API server, only matching pods are transferred
+        selector_kwargs = {"label_selector": label_selector} if label_selector else {}
+        pods = await asyncio.to_thread(list_json, _list_in_scope, v1, "pod", namespace, **selector_kwargs)
 
-        return {"pod_count": len(pods.items)}
+        return {"pod_count": len(pods.get("items", [])), **_scope(namespace, label_selector)}
     except Exception as e:
         return {"error": f"Failed to get pod count: {str(e)}"}
 
 
-async def get_number_of_namespaces():
+async def get_number_of_namespaces(context: Optional[str] = None):
     """Returns the number of namespaces in the current Kubernetes cluster."""
     try:
-        # Load kube config from default location
-        config.load_kube_config()
-
         # Create API client
-        v1 = client.CoreV1Api()
+        v1 = core_v1_api(context)
 
         # List all namespaces
-        namespaces = v1.list_namespace()
+        namespaces = await asyncio.to_thread(v1.list_namespace)
 
         return {"namespace_count": len(namespaces.items)}
     except Exception as e:
         return {"error": f"Failed to get namespace count: {str(e)}"}
 
 
-async def analyze_deployment_logs(deployment_name: str, namespace: str = "default"):
+# Resource names per context, for resolving names that speech-to-text got slightly wrong
+_name_indexes: Dict[str, NameIndex] = {}
+
+# List calls per indexable kind, by API group. Only kinds that tools look up by spoken name belong here
+_NAME_INDEX_KINDS = {
+    "deployment": ("apps", "list_deployment_for_all_namespaces"),
+}
+
+
+async def resolve_resource_name(
+    kind: str,
+    name: str,
+    namespace: Optional[str] = None,
+    context: Optional[str] = None,
+    deadline: Optional[ToolDeadline] = None,
+):
+    """The existing resource of a kind whose name is closest to the given one, or None."""
+    context = _context_name(context)
+    index = _name_indexes.setdefault(context, NameIndex())
+    if index.is_stale(kind, Config.NAME_INDEX_TTL):
+        group, list_call = _NAME_INDEX_KINDS[kind]
+        api = apps_v1_api(context) if group == "apps" else core_v1_api(context)
+        # Only names are needed, so the response is not turned into model objects
+        response = await asyncio.to_thread(list_json, getattr(api, list_call), **_request_kwargs(deadline))
+        items = response.get("items", [])
+        index.replace(kind, ((item["metadata"]["namespace"], item["metadata"]["name"]) for item in items))
+    return index.best_match(name, kind, namespace, Config.NAME_MATCH_MIN_SCORE)
+
+
+# Remembers per-container log cursors between calls, so follow-up questions only read new lines
+log_analyzer = LogAnalyzer(
+    max_deployments=Config.LOG_ANALYZER_MAX_DEPLOYMENTS,
+    window_minutes=Config.LOG_ANALYSIS_WINDOW_MINUTES,
+    detail_limit=Config.LOG_DETAIL_LIMIT,
+)
+
+
+async def analyze_deployment_logs(
+    deployment_name: str,
+    namespace: str = "default",
+    context: Optional[str] = None,
+    deadline: Optional[ToolDeadline] = None,
+):
     """Analyze logs from all pods in a deployment for criticals/errors/warnings in the last hour."""
     try:
-        config.load_kube_config()
-        core_v1 = client.CoreV1Api()
-        apps_v1 = client.AppsV1Api()
+        core_v1 = core_v1_api(context)
+        apps_v1 = apps_v1_api(context)
 
         # Get pods from deployment
-        deployment = apps_v1.read_namespaced_deployment(name=deployment_name, namespace=namespace)
+        resolved_from = None
+        try:
+            deployment = await asyncio.to_thread(
+                apps_v1.read_namespaced_deployment,
+                name=deployment_name,
+                namespace=namespace,
+                **_request_kwargs(deadline),
+            )
+        except Exception as e:
+            if getattr(e, "status", None) != 404:
+                raise
+            # Spoken names rarely match exactly, look for the closest deployment in any namespace
+            match = await resolve_resource_name("deployment", deployment_name, namespace, context, deadline)
+            if not match:
+                return {"error": f"No deployment named or resembling {deployment_name!r} was found"}
+            resolved_from = {"deployment_name": deployment_name, "namespace": namespace}
+            deployment_name, namespace = match.name, match.namespace
+            deployment = await asyncio.to_thread(
+                apps_v1.read_namespaced_deployment,
+                name=deployment_name,
+                namespace=namespace,
+                **_request_kwargs(deadline),
+            )
 
         # Get label selector
         selector = deployment.spec.selector.match_labels
         label_selector = ",".join([f"{k}={v}" for k, v in selector.items()])
 
         # Get pods with this selector
-        pods = core_v1.list_namespaced_pod(namespace=namespace, label_selector=label_selector)
-
-        error_patterns = {
-            "exception": r"(?i)(exception|error|failure|failed|traceback)",
-            "warning": r"(?i)(warning|warn)",
-            "critical": r"(?i)(critical|fatal|panic)",
-            "timeout": r"(?i)(timeout|timed out)",
-            "connection": r"(?i)(connection refused|connection reset|connection closed)",
-            "permission": r"(?i)(permission denied|unauthorized|forbidden)",
-            "memory": r"(?i)(out of memory|memory limit)",
-            "disk": r"(?i)(disk full|no space left)",
-        }
-
-        errors = defaultdict(list)
-        error_counts = defaultdict(int)
-        total_errors = 0
-        current_time = datetime.datetime.now(datetime.timezone.utc)
-        time_threshold = current_time - datetime.timedelta(minutes=60)
+        pods = await asyncio.to_thread(
+            core_v1.list_namespaced_pod,
+            namespace=namespace,
+            label_selector=label_selector,
+            **_request_kwargs(deadline),
+        )
+
+        state = log_analyzer.state(_context_name(context), namespace, deployment_name)
+        executor = get_process_pool(Config.LOG_CLASSIFY_WORKERS) if Config.LOG_CLASSIFY_WORKERS != 0 else None
+        async with state.lock:
+            current_time = datetime.datetime.now(datetime.timezone.utc)
+            new_counts = Counter()
+            access_errors = []
+            live_containers = set()
+            # Classification runs in worker processes while the next logs are fetched, results are
+            # recorded in fetch order so the outcome matches classifying serially
+            pending = deque()
+
+            def record_classified(wait_for_all=False):
+                while pending and (wait_for_all or pending[0][1].done()):
+                    batch, classified = pending.popleft()
+                    new_counts.update(state.record(batch, classified.result()))
 
-        for pod in pods.items:
             try:
-                logs = core_v1.read_namespaced_pod_log(
-                    name=pod.metadata.name, namespace=namespace, tail_lines=1000, timestamps=True
-                )
-
-                for line in logs.split("\n"):
-                    if not line.strip():
-                        continue
-
-                    try:
-                        # Split timestamp and log message
-                        timestamp_str = line.split()[0]
-                        timestamp = datetime.datetime.fromisoformat(timestamp_str.rstrip("Z")).replace(
-                            tzinfo=datetime.timezone.utc
-                        )
-
-                        # Check if log is within time window
-                        if timestamp < time_threshold:
+                for pods_analyzed, pod in enumerate(pods.items):
+                    # Keep what we have so far available in case the budget runs out
+                    if deadline:
+                        record_classified()
+                        deadline.partial = state.result(current_time, pods_analyzed, new_counts, access_errors)
+                        deadline.partial["summary"]["pods_total"] = len(pods.items)
+
+                    for container in pod.spec.containers:
+                        live_containers.add((pod.metadata.name, container.name))
+                        cursor = state.cursor(pod.metadata.name, container.name)
+                        # Only ask for what was written since the last line we read
+                        if cursor.timestamp:
+                            since_seconds = cursor.since_seconds(current_time)
+                        else:
+                            since_seconds = state.window_minutes * 60
+                        try:
+                            logs = await asyncio.to_thread(
+                                core_v1.read_namespaced_pod_log,
+                                name=pod.metadata.name,
+                                namespace=namespace,
+                                container=container.name,
+                                since_seconds=since_seconds,
+                                tail_lines=Config.LOG_TAIL_LINES,
+                                timestamps=True,
+                                **_request_kwargs(deadline),
+                            )
+                        except Exception as e:
+                            access_errors.append(
+                                f"Could not access logs for pod {pod.metadata.name}/{container.name}: {str(e)}"
+                            )
                             continue
 
-                        # Check for different error patterns
-                        for error_type, pattern in error_patterns.items():
-                            if re.search(pattern, line):
-                                errors[error_type].append(
-                                    {
-                                        "timestamp": timestamp_str,
-                                        "message": line.strip(),
-                                        "age_minutes": round((current_time - timestamp).total_seconds() / 60, 1),
-                                    }
-                                )
-                                error_counts[error_type] += 1
-                                total_errors += 1
-
-                    except Exception:
-                        continue
-
-            except Exception as e:
-                errors["pod_access_errors"].append(f"Could not access logs for pod {pod.metadata.name}: {str(e)}")
-
-        return {
-            "summary": {
-                "total_errors": total_errors,
-                "error_types": dict(error_counts),
-                "pods_analyzed": len(pods.items),
-                "time_window_minutes": 60,
-            },
-            "detailed_errors": dict(errors),
-        }
+                        # The cursor only moves when the batch is recorded, so a batch cancelled by
+                        # the deadline is read again on the next call
+                        batch = state.select_new(pod.metadata.name, container.name, logs, current_time)
+                        classified = asyncio.ensure_future(
+                            classify_batch(
+                                batch.lines,
+                                executor,
+                                chunk_lines=Config.LOG_CLASSIFY_CHUNK_LINES,
+                                min_parallel_lines=Config.LOG_CLASSIFY_MIN_PARALLEL_LINES,
+                            )
+                        )
+                        pending.append((batch, classified))
+
+                if pending:
+                    await asyncio.wait([classified for _, classified in pending])
+                record_classified(wait_for_all=True)
+            finally:
+                for _, classified in pending:
+                    classified.cancel()
+
+            state.forget_missing(live_containers)
+            state.prune(current_time)
+            result = state.result(current_time, len(pods.items), new_counts, access_errors)
+            state.last_checked = current_time
+            if resolved_from:
+                result["resolved"] = {
+                    "requested": resolved_from,
+                    "deployment_name": deployment_name,
+                    "namespace": namespace,
+                }
+            return result
 
     except Exception as e:
         return {"error": f"Failed to analyze logs: {str(e)}"}
 
 
-async def get_version_info():
+async def get_version_info(context: Optional[str] = None):
     """Returns version information for both Kubernetes API server and nodes."""
     try:
-        config.load_kube_config()
-        version_api = client.VersionApi()
-        core_api = client.CoreV1Api()
+        version_client = version_api(context)
+        core_api = core_v1_api(context)
 
         # Get API server version
-        api_version = version_api.get_code()
+        api_version = await asyncio.to_thread(version_client.get_code)
 
         # Get node versions
-        nodes = core_api.list_node()
+        nodes = await asyncio.to_thread(core_api.list_node)
         node_versions = {}
         for node in nodes.items:
             version = node.status.node_info.kubelet_version
@@ -180,51 +312,57 @@ async def get_version_info():
 async def get_kubernetes_latest_version_information() -> Dict[str, Any]:
     """Retrieves the latest stable version information from the Kubernetes GitHub repository."""
     try:
-        async with aiohttp.ClientSession() as session:
-            # Get releases from GitHub API
-            async with session.get("https://api.github.com/repos/kubernetes/kubernetes/releases") as response:
-                if response.status != 200:
-                    return {"error": f"GitHub API request failed with status {response.status}"}
-
-                releases = await response.json()
-
-                # Filter and process releases
-                stable_releases = []
-                for release in releases:
-                    if not release["prerelease"] and not release["draft"]:
-                        version = release["tag_name"].lstrip("v")
-                        published_at = release["published_at"]
-                        stable_releases.append(
-                            {"version": version, "published_at": published_at, "html_url": release["html_url"]}
-                        )
-                        if len(stable_releases) >= 5:  # Get latest 5 stable releases
-                            break
+        # Get releases from GitHub API, answered from the on-disk cache when possible
+        url = f"{Config.GITHUB_API_URL.rstrip('/')}/repos/kubernetes/kubernetes/releases"
+        try:
+            releases, source = await fetch_json(url)
+        except HttpStatusError as e:
+            return {"error": f"GitHub API request failed with status {e.status}"}
+
+        # Filter and process releases
+        stable_releases = []
+        for release in releases:
+            if not release["prerelease"] and not release["draft"]:
+                version = release["tag_name"].lstrip("v")
+                published_at = release["published_at"]
+                stable_releases.append(
+                    {"version": version, "published_at": published_at, "html_url": release["html_url"]}
+                )
+                if len(stable_releases) >= 5:  # Get latest 5 stable releases
+                    break
 
-                if not stable_releases:
-                    return {"error": "No stable releases found"}
+        if not stable_releases:
+            return {"error": "No stable releases found"}
 
-                return {
-                    "latest_stable_version": stable_releases[0]["version"],
-                    "latest_releases": stable_releases,
-                    "retrieved_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-                }
+        return {
+            "latest_stable_version": stable_releases[0]["version"],
+            "latest_releases": stable_releases,
+            "retrieved_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "source": source,
+        }
 
     except Exception as e:
         return {"error": f"Failed to get Kubernetes version information: {str(e)}"}
 
 
+def _find_active_context(index):
+    """Returns the context used by this session, falling back to the kubeconfig current-context."""
+    return index.contexts_by_name.get(get_active_context()) or index.current_context
+
+
 async def get_available_clusters():
     """Returns a list of all available Kubernetes clusters from the kubeconfig."""
     try:
         # Get all contexts from kubeconfig
-        contexts, active_context = config.list_kube_config_contexts()
-        if not contexts:
+        index = get_kubeconfig_index()
+        if not index.contexts:
             return {"error": "No Kubernetes contexts found in kubeconfig"}
 
+        active_context = _find_active_context(index)
         clusters = []
         active_cluster = None
 
-        for ctx in contexts:
+        for ctx in index.contexts:
             cluster_info = {
                 "name": ctx["context"]["cluster"],
                 "context_name": ctx["name"],
@@ -235,87 +373,100 @@ async def get_available_clusters():
                 active_cluster = cluster_info
 
         return {"clusters": clusters, "active_cluster": active_cluster, "total_clusters": len(clusters)}
-    except config.config_exception.ConfigException as e:
+    except Exception as e:
         return {"error": f"Failed to get cluster information: {str(e)}"}
 
 
-async def switch_cluster(cluster_name: str):
-    """Switch to a different Kubernetes cluster context and persist the change."""
+async def _persist_current_context(context: str):
     try:
-        # Get all available contexts
-        contexts, active_context = config.list_kube_config_contexts()
+        await asyncio.to_thread(persist_current_context, context)
+        log_info(f"Persisted current-context '{context}' to kubeconfig")
+    except Exception as e:
+        log_error(f"Failed to persist current-context '{context}': {str(e)}")
 
-        # Find the context that matches the requested cluster name
-        target_context = None
-        for ctx in contexts:
-            if ctx["context"]["cluster"] == cluster_name:
-                target_context = ctx["name"]
-                break
 
-        if not target_context:
+async def switch_cluster(cluster_name: str, persist: bool = False):
+    """Switch this session to a different Kubernetes cluster context, optionally persisting the change."""
+    try:
+        # Find the context that matches the requested cluster name
+        index = get_kubeconfig_index()
+        target = index.contexts_by_cluster.get(cluster_name)
+        if not target:
             return {
                 "error": f"Cluster '{cluster_name}' not found in kubeconfig",
-                "available_clusters": [ctx["context"]["cluster"] for ctx in contexts],
+                "available_clusters": list(index.contexts_by_cluster),
             }
+        target_context = target["name"]
 
-        # Use the config module to directly modify current context
-        config_file = os.path.expanduser(config.kube_config.KUBE_CONFIG_DEFAULT_LOCATION)
-        config.kube_config.load_kube_config()
-
-        # Load and modify the config file
-        with open(config_file) as f:
-            kube_config = yaml.safe_load(f)
-
-        # Update the current-context
-        kube_config["current-context"] = target_context
+        # Switch in memory, the client for the context is reused if it already exists
+        set_active_context(target_context)
 
-        # Save the changes back to the config file
-        with open(config_file, "w") as f:
-            yaml.safe_dump(kube_config, f)
-
-        # Load the new context for the current session
-        config.load_kube_config(context=target_context)
+        if persist:
+            # Written in the background so the answer does not wait for the disk
+            _background_tasks.add(task := asyncio.create_task(_persist_current_context(target_context)))
+            task.add_done_callback(_background_tasks.discard)
 
         return {
             "success": True,
-            "message": f"Successfully switched to cluster '{cluster_name}' and persisted the change",
+            "message": f"Successfully switched to cluster '{cluster_name}'"
+            + (" and persisted the change" if persist else " for this session"),
             "context": target_context,
         }
 
-    except config.config_exception.ConfigException as e:
+    except Exception as e:
         return {"error": f"Failed to switch cluster: {str(e)}"}
 
 
 async def get_cluster_name():
     """Returns the name of the current Kubernetes cluster."""
     try:
-        # Load kube config
-        config.load_kube_config()
-
         # Get current context info
-        contexts, active_context = config.list_kube_config_contexts()
+        active_context = _find_active_context(get_kubeconfig_index())
         if not active_context:
             return {"error": "No active Kubernetes context found"}
 
         cluster_name = active_context["context"]["cluster"]
         return {"cluster_name": cluster_name, "context_name": active_context["name"]}
-    except config.config_exception.ConfigException as e:
+    except Exception as e:
         return {"error": f"Failed to get cluster name: {str(e)}"}
 
 
-async def get_last_events():
-    """Retrieve the message of the last four events in the cluster."""
+async def get_last_events(
+    namespace: Optional[str] = None, label_selector: Optional[str] = None, context: Optional[str] = None
+):
+    """Retrieve the message of the last four events in the cluster, optionally scoped."""
     try:
-        config.load_kube_config()
-        v1 = client.CoreV1Api()
+        v1 = core_v1_api(context)
 
-        # Get last 4 events, sorted by last timestamp
-        events = v1.list_event_for_all_namespaces(limit=4, _preload_content=False)
-        events_data = json.loads(events.data)
+        if label_selector:
+            # Only pod events can match, the selected pods are fetched first to match them by name
+            pods = await asyncio.to_thread(
+                list_json, _list_in_scope, v1, "pod", namespace, label_selector=label_selector
+            )
+            matches = _event_filter(pods.get("items", []))
+            events = await asyncio.to_thread(
+                list_json, _list_in_scope, v1, "event", namespace, field_selector="involvedObject.kind=Pod"
+            )
+            items = [
+                event
+                for event in events.get("items", [])
+                if matches(
+                    event.get("involvedObject", {}).get("namespace"),
+                    event.get("involvedObject", {}).get("kind"),
+                    event.get("involvedObject", {}).get("name"),
+                )
+            ]
+            # The list comes back in storage order, the newest events are the last ones to answer about
+            items.sort(key=lambda event: event.get("lastTimestamp") or "", reverse=True)
+            items = items[:4]
+        else:
+            # Get last 4 events, sorted by last timestamp
+            events = await asyncio.to_thread(list_json, _list_in_scope, v1, "event", namespace, limit=4)
+            items = events.get("items", [])
 
         # Extract relevant information
         event_messages = []
-        for event in events_data.get("items", []):
+        for event in items:
             event_messages.append(
                 {
                     "type": event.get("type"),
@@ -332,90 +483,115 @@ async def get_last_events():
         return {
             "events": event_messages,
             "count": len(event_messages),
+            **_scope(namespace, label_selector),
             "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
         }
     except Exception as e:
         return {"error": f"Failed to get events: {str(e)}"}
 
 
-async def get_cluster_status():
-    """Returns detailed status information about the Kubernetes cluster."""
+async def get_cluster_status(
+    namespace: Optional[str] = None,
+    label_selector: Optional[str] = None,
+    context: Optional[str] = None,
+    deadline: Optional[ToolDeadline] = None,
+):
+    """Returns detailed status information about the Kubernetes cluster.
+
+    Node usage always covers the whole cluster, pods and recent issues can be scoped.
+    """
+    # Filled in as each part completes, so a timed out call still reports what it gathered
+    status_response = deadline.partial if deadline else {}
+    status_response["scope"] = _scope(namespace, label_selector)
+    cluster_health = status_response.setdefault("cluster_health", {})
     try:
-        # Load kube config
-        config.load_kube_config()
-
         # Initialize API clients
-        v1 = client.CoreV1Api()
-        custom = client.CustomObjectsApi()
+        v1 = core_v1_api(context)
+        custom = custom_objects_api(context)
 
         # Get nodes info
-        nodes = v1.list_node()
+        nodes = await asyncio.to_thread(v1.list_node, **_request_kwargs(deadline))
         node_count = len(nodes.items)
+        cluster_health["total_nodes"] = node_count
 
         # Get metrics using metrics API
-        metrics = custom.list_cluster_custom_object(group="metrics.k8s.io", version="v1beta1", plural="nodes")
-
-        # Calculate resource usage
-        total_cpu_usage = 0
-        total_memory_usage = 0
-        for item in metrics["items"]:
-            cpu = item["usage"]["cpu"]
-            memory = item["usage"]["memory"]
-            # Convert CPU from 'n' format to percentage
-            total_cpu_usage += int(cpu.rstrip("n")) / 1000000000 * 100
-
-            # Convert memory to bytes
-            if memory.endswith("Ki"):
-                memory_bytes = float(memory.rstrip("Ki")) * 1024
-            elif memory.endswith("Mi"):
-                memory_bytes = float(memory.rstrip("Mi")) * 1024 * 1024
-            elif memory.endswith("Gi"):
-                memory_bytes = float(memory.rstrip("Gi")) * 1024 * 1024 * 1024
-            elif memory.endswith("Ti"):
-                memory_bytes = float(memory.rstrip("Ti")) * 1024 * 1024 * 1024 * 1024
-            else:
-                # Assume it's in bytes if no suffix
-                memory_bytes = float(memory)
-
-            # Convert to GB
-            total_memory_usage += memory_bytes / (1024 * 1024 * 1024)
-
-        avg_cpu = total_cpu_usage / node_count if node_count > 0 else 0
-        avg_memory = total_memory_usage / node_count if node_count > 0 else 0
-
-        # Get pods across all namespaces
-        pods = v1.list_pod_for_all_namespaces()
+        metrics = await asyncio.to_thread(
+            custom.list_cluster_custom_object,
+            group="metrics.k8s.io",
+            version="v1beta1",
+            plural="nodes",
+            **_request_kwargs(deadline),
+        )
+
+        # Deferred so numpy is only loaded once cluster status is first asked for
+        from kubewhisper.modules.node_usage import summarize_node_usage
+
+        # Compare usage against what each node can allocate to pods
+        node_capacity = [
+            {
+                "name": node.metadata.name,
+                "cpu": (node.status.allocatable or {}).get("cpu", "0"),
+                "memory": (node.status.allocatable or {}).get("memory", "0"),
+            }
+            for node in nodes.items
+        ]
+        cluster_health.update(
+            summarize_node_usage(
+                node_capacity,
+                metrics["items"],
+                detail_limit=Config.NODE_DETAIL_LIMIT,
+                outlier_threshold=Config.NODE_OUTLIER_THRESHOLD,
+            )
+        )
+
+        # Get pods in scope, filtered by the API server. Only phases are needed, so the JSON is read as is
+        selector_kwargs = {"label_selector": label_selector} if label_selector else {}
+        pods = await asyncio.to_thread(
+            list_json, _list_in_scope, v1, "pod", namespace, **selector_kwargs, **_request_kwargs(deadline)
+        )
+        pod_items = pods.get("items", [])
         pod_status = {}
         total_pods = 0
 
-        for pod in pods.items:
-            status = pod.status.phase
+        for pod in pod_items:
+            status = pod.get("status", {}).get("phase")
             pod_status[status] = pod_status.get(status, 0) + 1
             total_pods += 1
-
-        # Get recent events (last 15 minutes)
-        events = v1.list_event_for_all_namespaces()
+        cluster_health["pod_count"] = {"total": total_pods, **pod_status}
+
+        # Get recent warnings (last 15 minutes), the type is filtered by the API server
+        event_kwargs = {"field_selector": "type=Warning"}
+        if label_selector:
+            event_kwargs["field_selector"] += ",involvedObject.kind=Pod"
+        events = await asyncio.to_thread(
+            list_json, _list_in_scope, v1, "event", namespace, **event_kwargs, **_request_kwargs(deadline)
+        )
+        matches = _event_filter(pod_items) if label_selector else None
         recent_issues = []
         fifteen_mins_ago = datetime.datetime.now(datetime.timezone.utc).timestamp() - (15 * 60)
 
-        for event in events.items:
-            if event.type == "Warning" and event.last_timestamp and event.last_timestamp.timestamp() > fifteen_mins_ago:
+        for event in events.get("items", []):
+            involved = event.get("involvedObject", {})
+            if matches and not matches(involved.get("namespace"), involved.get("kind"), involved.get("name")):
+                continue
+            last_timestamp = event.get("lastTimestamp")
+            if (
+                event.get("type") == "Warning"
+                and last_timestamp
+                and datetime.datetime.fromisoformat(last_timestamp).timestamp() > fifteen_mins_ago
+            ):
                 recent_issues.append(
-                    {"reason": event.reason, "message": event.message, "component": event.involved_object.kind}
+                    {"reason": event.get("reason"), "message": event.get("message"), "component": involved.get("kind")}
                 )
 
         # Prepare status response
-        status_response = {
-            "cluster_health": {
-                "total_nodes": node_count,
-                "avg_cpu_usage": f"{avg_cpu:.1f}%",
-                "avg_memory_usage": f"{avg_memory:.1f}GB",
-                "pod_count": {"total": total_pods, **pod_status},
-            },
-            "recent_issues": {"count": len(recent_issues), "summary": recent_issues} if recent_issues else None,
-            "status_summary": ("Issues Detected" if recent_issues else "All Systems Normal"),
-            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-        }
+        status_response.update(
+            {
+                "recent_issues": {"count": len(recent_issues), "summary": recent_issues} if recent_issues else None,
+                "status_summary": ("Issues Detected" if recent_issues else "All Systems Normal"),
+                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            }
+        )
 
         return status_response
 
@@ -423,15 +599,306 @@ async def get_cluster_status():
         return {"error": "Failed to get cluster status", "message": str(e)}
 
 
+async def get_top_resource_consumers(
+    resource: str = "memory",
+    count: int = 5,
+    namespace: Optional[str] = None,
+    context: Optional[str] = None,
+    deadline: Optional[ToolDeadline] = None,
+):
+    """Returns the pods using the most CPU or memory, optionally within one namespace."""
+    from kubewhisper.modules.top_consumers import TopConsumers
+
+    try:
+        top = TopConsumers(resource, max(1, min(int(count), Config.TOP_CONSUMERS_MAX)))
+    except ValueError as e:
+        return {"error": str(e)}
+
+    def result():
+        return {
+            "resource": resource,
+            "namespace": namespace or "all",
+            "pods_scanned": top.pods_seen,
+            "top_consumers": top.results(),
+        }
+
+    try:
+        custom = custom_objects_api(context)
+        if namespace:
+            list_page = functools.partial(custom.list_namespaced_custom_object, namespace=namespace)
+        else:
+            list_page = custom.list_cluster_custom_object
+
+        # Page through pod metrics, only the current top-N is kept between pages
+        continue_token = None
+        while True:
+            page_kwargs = {"_continue": continue_token} if continue_token else {}
+            page = await asyncio.to_thread(
+                list_page,
+                group="metrics.k8s.io",
+                version="v1beta1",
+                plural="pods",
+                limit=Config.METRICS_PAGE_SIZE,
+                **page_kwargs,
+                **_request_kwargs(deadline),
+            )
+            top.add_page(page.get("items", []))
+            if deadline:
+                deadline.partial = result()
+            continue_token = page.get("metadata", {}).get("continue")
+            if not continue_token:
+                break
+
+        return result()
+
+    except Exception as e:
+        return {"error": "Failed to get top resource consumers", "message": str(e)}
+
+
+def _watch_rollout(watcher, apps_v1, namespace: str, name: str, resource_version: str, timeout: float, on_update):
+    """Follows a Deployment until its rollout finishes or timeout seconds pass, returning its last state.
+
+    Blocking, meant for a worker thread. Returns None if the deployment was deleted.
+    """
+    from kubewhisper.modules.rollout_status import rollout_status
+
+    deployment = {}
+    # With timeout_seconds the API server ends the watch, so this never outlives the timeout by much
+    for event in watcher.stream(
+        apps_v1.list_namespaced_deployment,
+        namespace,
+        field_selector=f"metadata.name={name}",
+        resource_version=resource_version,
+        timeout_seconds=max(1, int(timeout)),
+        _request_timeout=timeout + 5,
+    ):
+        if event["type"] == "DELETED":
+            watcher.stop()
+            return None
+        if event["type"] in ("ADDED", "MODIFIED"):
+            deployment = event["raw_object"]
+            on_update(deployment)
+            if rollout_status(deployment).finished:
+                watcher.stop()
+                break
+    return deployment
+
+
+async def _follow_rollout(apps_v1, namespace: str, name: str, resource_version: str, timeout: float, on_update):
+    """Runs _watch_rollout in a worker thread, stopping the watch when the caller gives up."""
+    from kubernetes import watch
+
+    watcher = watch.Watch()
+    cancelled = False
+
+    def update(deployment):
+        # The caller may already have answered with what it had
+        if not cancelled:
+            on_update(deployment)
+
+    try:
+        return await asyncio.to_thread(
+            _watch_rollout, watcher, apps_v1, namespace, name, resource_version, timeout, update
+        )
+    except asyncio.CancelledError:
+        cancelled = True
+        watcher.stop()
+        raise
+
+
+async def get_rollout_status(
+    deployment_name: str,
+    namespace: str = "default",
+    wait: bool = True,
+    timeout_seconds: Optional[int] = None,
+    context: Optional[str] = None,
+    deadline: Optional[ToolDeadline] = None,
+):
+    """Reports whether a deployment has rolled out, waiting for it to finish when asked."""
+    from kubewhisper.modules.rollout_status import rollout_status
+
+    def result(deployment, timed_out=False):
+        status = rollout_status(deployment)
+        response = {
+            "deployment": deployment["metadata"]["name"],
+            "namespace": deployment["metadata"]["namespace"],
+            "state": status.state,
+            "message": status.message,
+            "replicas": {
+                "desired": deployment.get("spec", {}).get("replicas", 1),
+                "updated": deployment.get("status", {}).get("updatedReplicas", 0),
+                "available": deployment.get("status", {}).get("availableReplicas", 0),
+            },
+        }
+        if timed_out:
+            response["still_waiting"] = True
+        return response
+
+    try:
+        apps_v1 = apps_v1_api(context)
+
+        async def list_deployment(name, namespace):
+            return await asyncio.to_thread(
+                list_json,
+                apps_v1.list_namespaced_deployment,
+                namespace,
+                field_selector=f"metadata.name={name}",
+                **_request_kwargs(deadline),
+            )
+
+        deployments = await list_deployment(deployment_name, namespace)
+        if not deployments.get("items"):
+            match = await resolve_resource_name("deployment", deployment_name, namespace, context, deadline)
+            if not match:
+                return {"error": f"No deployment named or resembling {deployment_name!r} was found"}
+            deployment_name, namespace = match.name, match.namespace
+            deployments = await list_deployment(deployment_name, namespace)
+            if not deployments.get("items"):
+                return {"error": f"Deployment {deployment_name} disappeared while looking it up"}
+        deployment = deployments["items"][0]
+
+        if not wait or rollout_status(deployment).finished:
+            return result(deployment)
+
+        wait_seconds = min(timeout_seconds or Config.ROLLOUT_WAIT_SECONDS, Config.ROLLOUT_WAIT_SECONDS)
+        if deadline:
+            # Leave time to answer before the tool budget runs out
+            wait_seconds = min(wait_seconds, deadline.remaining() - 2)
+        if context is not None:
+            # Queried as one of several clusters, each of which is cancelled after CLUSTER_QUERY_TIMEOUT
+            wait_seconds = min(wait_seconds, Config.CLUSTER_QUERY_TIMEOUT - 2)
+
+        def on_update(latest):
+            if deadline:
+                deadline.partial = result(latest, timed_out=True)
+
+        on_update(deployment)
+        if wait_seconds >= 1:
+            # One watch instead of polling, in a worker thread so the audio loop keeps running
+            latest = await _follow_rollout(
+                apps_v1,
+                namespace,
+                deployment_name,
+                deployments["metadata"]["resourceVersion"],
+                wait_seconds,
+                on_update,
+            )
+            if latest is None:
+                return {"error": f"Deployment {deployment_name} was deleted during the rollout"}
+            deployment = latest or deployment
+        status = rollout_status(deployment)
+        return result(deployment, timed_out=not status.finished)
+
+    except Exception as e:
+        return {"error": "Failed to get rollout status", "message": str(e)}
+
+
+# Usage history per context, filled in by the background sampler
+_usage_histories = {}
+
+
+async def _list_metrics(custom, plural: str):
+    """All items of a metrics.k8s.io list, fetched page by page."""
+    items, continue_token = [], None
+    while True:
+        page_kwargs = {"_continue": continue_token} if continue_token else {}
+        page = await asyncio.to_thread(
+            custom.list_cluster_custom_object,
+            group="metrics.k8s.io",
+            version="v1beta1",
+            plural=plural,
+            limit=Config.METRICS_PAGE_SIZE,
+            **page_kwargs,
+        )
+        items.extend(page.get("items", []))
+        continue_token = page.get("metadata", {}).get("continue")
+        if not continue_token:
+            return items
+
+
+async def sample_usage(context: Optional[str] = None):
+    """Records the current node and namespace usage of a context in its history."""
+    from kubewhisper.modules.usage_history import UsageHistory
+
+    context = _context_name(context)
+    custom = custom_objects_api(context)
+    node_metrics = await _list_metrics(custom, "nodes")
+    pod_metrics = await _list_metrics(custom, "pods")
+    history = _usage_histories.get(context)
+    if history is None:
+        history = _usage_histories[context] = UsageHistory(
+            raw_capacity=Config.USAGE_RAW_SAMPLES,
+            factor=Config.USAGE_DOWNSAMPLE_FACTOR,
+            coarse_capacity=Config.USAGE_COARSE_SAMPLES,
+            interval=Config.USAGE_SAMPLE_INTERVAL,
+        )
+    history.record(time.time(), node_metrics, pod_metrics)
+
+
+async def run_usage_sampler(interval: float):
+    """Samples the usage of the active context every interval seconds, until cancelled."""
+    failing = False
+    while True:
+        try:
+            await sample_usage()
+            failing = False
+        except Exception as e:
+            # Clusters without a metrics server fail every time, one warning is enough
+            if not failing:
+                log_warning(f"Could not sample resource usage: {e}")
+            failing = True
+        await asyncio.sleep(interval)
+
+
+async def get_usage_trend(
+    resource: str = "memory",
+    scope: str = "node",
+    name: Optional[str] = None,
+    minutes: int = 60,
+    limit: int = 5,
+    context: Optional[str] = None,
+):
+    """Returns how CPU or memory usage of nodes or namespaces developed, from the sampled history."""
+    from kubewhisper.modules.usage_history import RESOURCES, SCOPES
+
+    if resource not in RESOURCES:
+        return {"error": f"Unknown resource {resource!r}, expected one of {', '.join(RESOURCES)}"}
+    if scope not in SCOPES:
+        return {"error": f"Unknown scope {scope!r}, expected one of {', '.join(SCOPES)}"}
+    try:
+        history = _usage_histories.get(_context_name(context))
+        if history is None or history.last_sample is None:
+            if Config.USAGE_SAMPLE_INTERVAL <= 0:
+                return {"error": "Usage sampling is disabled"}
+            return {"error": "No usage history yet, it is built up while KubeWhisper runs"}
+
+        since = time.time() - float(minutes) * 60
+        response = {"resource": resource, "scope": scope, "minutes": minutes}
+        if name:
+            trend = history.trend(scope, name, resource, since)
+            if trend is None:
+                return {"error": f"No usage history for {scope} {name!r}"}
+            response["trend"] = trend
+        else:
+            response["trends"] = history.trends(scope, resource, since, max(1, int(limit)))
+        return response
+    except Exception as e:
+        return {"error": "Failed to get usage trend", "message": str(e)}
+
+
 # Map function names to their corresponding functions
 function_map = {
-    "get_last_events": get_last_events,
-    "get_number_of_nodes": get_number_of_nodes,
-    "get_number_of_pods": get_number_of_pods,
-    "get_number_of_namespaces": get_number_of_namespaces,
-    "get_cluster_status": get_cluster_status,
-    "analyze_deployment_logs": analyze_deployment_logs,
-    "get_version_info": get_version_info,
+    "get_last_events": for_clusters(get_last_events),
+    "get_number_of_nodes": for_clusters(get_number_of_nodes),
+    "get_number_of_pods": for_clusters(get_number_of_pods),
+    "get_number_of_namespaces": for_clusters(get_number_of_namespaces),
+    "get_cluster_status": for_clusters(get_cluster_status),
+    "get_top_resource_consumers": for_clusters(get_top_resource_consumers),
+    # Not per cluster, the history is only sampled for the active context
+    "get_usage_trend": get_usage_trend,
+    "get_rollout_status": for_clusters(get_rollout_status),
+    "analyze_deployment_logs": for_clusters(analyze_deployment_logs),
+    "get_version_info": for_clusters(get_version_info),
     "get_kubernetes_latest_version_information": get_kubernetes_latest_version_information,
     "get_cluster_name": get_cluster_name,
     "get_available_clusters": get_available_clusters,
@@ -443,10 +910,17 @@ tools = [
     {
         "type": "function",
         "name": "get_last_events",
-        "description": "Retrieve the message of the last four events in the cluster.",
+        "description": "Retrieve the message of the last four events in the cluster, optionally scoped.",
         "parameters": {
             "type": "object",
-            "properties": {},
+            "properties": {
+                "namespace": {"type": "string", "description": "Only look at this namespace"},
+                "label_selector": {
+                    "type": "string",
+                    "description": "Only look at pods matching this label selector, for example app=web",
+                },
+                "clusters": CLUSTERS_PARAMETER,
+            },
             "required": [],
         },
     },
@@ -456,7 +930,14 @@ tools = [
         "description": "Switch to a different Kubernetes cluster using its name.",
         "parameters": {
             "type": "object",
-            "properties": {"cluster_name": {"type": "string", "description": "The name of the cluster to switch to"}},
+            "properties": {
+                "cluster_name": {"type": "string", "description": "The name of the cluster to switch to"},
+                "persist": {
+                    "type": "boolean",
+                    "description": "Also make it the current context in kubeconfig, only when explicitly asked",
+                    "default": False,
+                },
+            },
             "required": ["cluster_name"],
         },
     },
@@ -496,19 +977,26 @@ tools = [
         "description": "Returns version information for both Kubernetes API server and nodes.",
         "parameters": {
             "type": "object",
-            "properties": {},
+            "properties": {"clusters": CLUSTERS_PARAMETER},
             "required": [],
         },
     },
     {
         "type": "function",
         "name": "analyze_deployment_logs",
-        "description": ("Analyzes logs from all pods in a deployment for criticals/errors/warnings in the last hour."),
+        "description": (
+            "Analyzes logs from all pods in a deployment for criticals/errors/warnings in the last hour, "
+            "including what is new since the last check."
+        ),
         "parameters": {
             "type": "object",
             "properties": {
-                "deployment_name": {"type": "string", "description": "The name of the deployment to analyze"},
+                "deployment_name": {
+                    "type": "string",
+                    "description": "The name of the deployment to analyze, as heard, the closest match is used",
+                },
                 "namespace": {"type": "string", "description": "The namespace of the deployment", "default": "default"},
+                "clusters": CLUSTERS_PARAMETER,
             },
             "required": ["deployment_name"],
         },
@@ -519,17 +1007,24 @@ tools = [
         "description": "Returns the number of nodes in a Kubernetes cluster.",
         "parameters": {
             "type": "object",
-            "properties": {},
+            "properties": {"clusters": CLUSTERS_PARAMETER},
             "required": [],
         },
     },
     {
         "type": "function",
         "name": "get_number_of_pods",
-        "description": "Returns the number of pods in a Kubernetes cluster.",
+        "description": "Returns the number of pods in a Kubernetes cluster, optionally scoped.",
         "parameters": {
             "type": "object",
-            "properties": {},
+            "properties": {
+                "namespace": {"type": "string", "description": "Only look at this namespace"},
+                "label_selector": {
+                    "type": "string",
+                    "description": "Only look at pods matching this label selector, for example app=web",
+                },
+                "clusters": CLUSTERS_PARAMETER,
+            },
             "required": [],
         },
     },
@@ -539,7 +1034,7 @@ tools = [
         "description": "Returns the number of namespaces in a Kubernetes cluster.",
         "parameters": {
             "type": "object",
-            "properties": {},
+            "properties": {"clusters": CLUSTERS_PARAMETER},
             "required": [],
         },
     },
@@ -548,12 +1043,75 @@ tools = [
         "name": "get_cluster_status",
         "description": (
             "Returns detailed status information about the Kubernetes cluster "
-            "including node metrics, pod status, resource usage, and recent issues."
+            "including node metrics, pod status, resource usage, and recent issues. "
+            "Pods and issues can be scoped to a namespace or label selector."
         ),
         "parameters": {
             "type": "object",
-            "properties": {},
+            "properties": {
+                "namespace": {"type": "string", "description": "Only look at this namespace"},
+                "label_selector": {
+                    "type": "string",
+                    "description": "Only look at pods matching this label selector, for example app=web",
+                },
+                "clusters": CLUSTERS_PARAMETER,
+            },
+            "required": [],
+        },
+    },
+    {
+        "type": "function",
+        "name": "get_top_resource_consumers",
+        "description": "Returns the pods using the most CPU or memory, like kubectl top pods.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "resource": {"type": "string", "enum": ["cpu", "memory"], "default": "memory"},
+                "count": {"type": "integer", "description": "How many pods to return", "default": 5},
+                "namespace": {"type": "string", "description": "Only look at pods in this namespace"},
+                "clusters": CLUSTERS_PARAMETER,
+            },
+            "required": [],
+        },
+    },
+    {
+        "type": "function",
+        "name": "get_usage_trend",
+        "description": (
+            "Returns how CPU or memory usage of nodes or namespaces developed over the last minutes, "
+            "e.g. whether memory has been climbing. Without a name, lists the fastest growing first."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "resource": {"type": "string", "enum": ["cpu", "memory"], "default": "memory"},
+                "scope": {"type": "string", "enum": ["node", "namespace"], "default": "node"},
+                "name": {"type": "string", "description": "The node or namespace to look at"},
+                "minutes": {"type": "integer", "description": "How far to look back", "default": 60},
+            },
             "required": [],
         },
     },
+    {
+        "type": "function",
+        "name": "get_rollout_status",
+        "description": (
+            "Tells whether a deployment has finished rolling out, like kubectl rollout status. "
+            "Waits up to timeout_seconds for a rollout in progress to complete or fail."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "deployment_name": {
+                    "type": "string",
+                    "description": "The name of the deployment, as heard, the closest match is used",
+                },
+                "namespace": {"type": "string", "description": "The namespace of the deployment", "default": "default"},
+                "wait": {"type": "boolean", "description": "Wait for a rollout in progress to finish", "default": True},
+                "timeout_seconds": {"type": "integer", "description": "How long to wait at most", "default": 30},
+                "clusters": CLUSTERS_PARAMETER,
+            },
+            "required": ["deployment_name"],
+        },
+    },
 ]
@@ -0,0 +1,129 @@
+"""Runs many concurrent headless sessions and reports turn throughput and latency.
+
+By default the sessions talk to an in-process RealtimeStub, so what is measured is the assistant's
+own event handling and tool layer rather than the model:
+
+    python -m kubewhisper.modules.load_generator --sessions 50 --turns 20 --tool get_number_of_pods
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from kubewhisper.modules.config import Config
+from kubewhisper.modules.event_handler import EventHandler
+from kubewhisper.modules.headless import NullMicrophone, run_turn
+from kubewhisper.modules.logging import set_console_log_level
+from kubewhisper.modules.realtime_stub import RealtimeStub
+from kubewhisper.modules.session_config import SessionConfig
+from kubewhisper.modules.websocket_manager import WebSocketManager
+
+
+class LoadSession:
+    """One text-only conversation, without the reconnect and startup handling of SimpleAssistant."""
+
+    def __init__(self, api_key: str, url: str, function_map: Dict, tools: List):
+        self.ws_manager = WebSocketManager(api_key, url)
+        self.event_handler = EventHandler(NullMicrophone(), self.ws_manager, function_map, echo_text=False)
+        self.session_config = SessionConfig(tools, text_only=True)
+
+    async def run(self, prompts: List[str], latencies: List[float], errors: List[str], timeout: float):
+        await self.ws_manager.connect()
+        receiver = asyncio.create_task(self._receive())
+        try:
+            await self.ws_manager.initialize_session(self.session_config.config)
+            for prompt in prompts:
+                start_time = time.perf_counter()
+                try:
+                    await run_turn(self.ws_manager, self.event_handler, prompt, timeout)
+                    latencies.append(time.perf_counter() - start_time)
+                except asyncio.TimeoutError:
+                    errors.append(f"Turn timed out after {timeout:.0f}s")
+                if receiver.done():
+                    break
+        finally:
+            receiver.cancel()
+            await asyncio.gather(receiver, return_exceptions=True)
+            await self.ws_manager.close()
+        if receiver.done() and not receiver.cancelled() and receiver.exception():
+            errors.append(f"Connection lost: {receiver.exception()}")
+
+    async def _receive(self):
+        while True:
+            await self.event_handler.handle_event(await self.ws_manager.receive_message())
+
+
+def summarize_turns(latencies: List[float], elapsed: float, errors: List[str]) -> Dict:
+    """Throughput and latency percentiles (milliseconds) of the completed turns."""
+    summary = {"turns": len(latencies), "errors": len(errors), "elapsed_seconds": round(elapsed, 3)}
+    summary["turns_per_second"] = round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0
+    if latencies:
+        p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 95, 99])
+        summary.update({"p50_ms": round(float(p50), 1), "p95_ms": round(float(p95), 1), "p99_ms": round(float(p99), 1)})
+    return summary
+
+
+async def run_load(
+    sessions: int,
+    turns: int,
+    url: Optional[str] = None,
+    api_key: str = "load-test",
+    tool_calls: Optional[List[str]] = None,
+    model_latency: float = 0.0,
+    function_map: Optional[Dict] = None,
+    tools: Optional[List] = None,
+    timeout: float = Config.HEADLESS_TURN_TIMEOUT,
+) -> Dict:
+    """Runs the sessions concurrently against url, or against a local stub when no url is given."""
+    if function_map is None:
+        from kubewhisper.modules.kubernetes_tools import function_map, tools
+
+    stub = None
+    if url is None:
+        stub = RealtimeStub(tool_calls=tool_calls, model_latency=model_latency)
+        url = await stub.start()
+
+    latencies, errors = [], []
+    prompts = [f"Question {turn + 1}" for turn in range(turns)]
+    start_time = time.perf_counter()
+    try:
+        results = await asyncio.gather(
+            *(
+                LoadSession(api_key, url, function_map, tools).run(prompts, latencies, errors, timeout)
+                for _ in range(sessions)
+            ),
+            return_exceptions=True,
+        )
+        errors.extend(f"Session failed: {result}" for result in results if isinstance(result, BaseException))
+    finally:
+        if stub:
+            await stub.close()
+    return summarize_turns(latencies, time.perf_counter() - start_time, errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure turn throughput and latency of concurrent sessions.")
+    parser.add_argument("--sessions", type=int, default=10, help="Number of concurrent sessions.")
+    parser.add_argument("--turns", type=int, default=10, help="Turns per session.")
+    parser.add_argument("--url", help="Realtime endpoint to use instead of the local stand-in server.")
+    parser.add_argument(
+        "--tool", action="append", default=[], help="Tool the stand-in server calls on every turn, repeatable."
+    )
+    parser.add_argument(
+        "--model-latency", type=float, default=0.0, help="Seconds the stand-in server waits per response."
+    )
+    args = parser.parse_args()
+
+    set_console_log_level("WARNING")
+    summary = asyncio.run(
+        run_load(args.sessions, args.turns, url=args.url, tool_calls=args.tool, model_latency=args.model_latency)
+    )
+    for key, value in summary.items():
+        print(f"{key:<16} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""Incremental analysis of deployment logs.
+
+Each container has a cursor holding the timestamp of the last line read, so a follow-up question
+only fetches and classifies lines written since. Matches are counted in per-minute buckets that
+roll off once they leave the analysis window.
+"""
+
+import asyncio
+import datetime
+import math
+import multiprocessing
+import re
+from collections import Counter, OrderedDict, defaultdict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+ERROR_PATTERNS = {
+    "exception": r"(?i)(exception|error|failure|failed|traceback)",
+    "warning": r"(?i)(warning|warn)",
+    "critical": r"(?i)(critical|fatal|panic)",
+    "timeout": r"(?i)(timeout|timed out)",
+    "connection": r"(?i)(connection refused|connection reset|connection closed)",
+    "permission": r"(?i)(permission denied|unauthorized|forbidden)",
+    "memory": r"(?i)(out of memory|memory limit)",
+    "disk": r"(?i)(disk full|no space left)",
+}
+
+_COMPILED_PATTERNS = {error_type: re.compile(pattern) for error_type, pattern in ERROR_PATTERNS.items()}
+
+
+def parse_log_line(line: str) -> Optional[Tuple[datetime.datetime, str]]:
+    """Splits a line read with timestamps=True into its RFC 3339 timestamp and the timestamp text."""
+    timestamp_str = line.split(" ", 1)[0]
+    try:
+        # Kubernetes writes nanoseconds, fromisoformat keeps the first six digits
+        timestamp = datetime.datetime.fromisoformat(timestamp_str)
+    except ValueError:
+        return None
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=datetime.timezone.utc)
+    return timestamp, timestamp_str
+
+
+def classify_line(line: str) -> List[str]:
+    """The error types whose pattern matches the line."""
+    return [error_type for error_type, pattern in _COMPILED_PATTERNS.items() if pattern.search(line)]
+
+
+def classify_lines(lines: List[str]) -> List[List[str]]:
+    """Classifies a batch of lines, the unit of work sent to a worker process."""
+    return [classify_line(line) for line in lines]
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Shared pool for log classification, workers are started on first use."""
+    global _process_pool
+    if _process_pool is None:
+        # Spawned rather than forked, the assistant runs audio and API threads that must not be copied
+        _process_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _process_pool
+
+
+def shutdown_process_pool():
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+async def classify_batch(
+    lines: List[str], executor: Optional[Executor] = None, chunk_lines: int = 500, min_parallel_lines: int = 200
+) -> List[List[str]]:
+    """Classifies lines off the event loop, in the same order as classify_lines.
+
+    Large batches are split in chunks and spread over the executor's processes; small ones run in
+    a thread, where they finish before a worker round trip would.
+    """
+    if not lines:
+        return []
+    if executor is None or len(lines) < min_parallel_lines:
+        return await asyncio.to_thread(classify_lines, lines)
+    loop = asyncio.get_running_loop()
+    chunks = [lines[start : start + chunk_lines] for start in range(0, len(lines), chunk_lines)]
+    results = await asyncio.gather(*(loop.run_in_executor(executor, classify_lines, chunk) for chunk in chunks))
+    return [categories for chunk_result in results for categories in chunk_result]
+
+
+class LogCursor:
+    """Position in one container's log, the newest timestamp read and the lines seen at it."""
+
+    def __init__(self):
+        self.timestamp: Optional[datetime.datetime] = None
+        # Several lines can share a timestamp, these tell a repeat from a new line at the boundary
+        self.lines_at_timestamp = set()
+
+    def since_seconds(self, now: datetime.datetime) -> int:
+        """Seconds to ask the API server for, rounded up so the boundary line is included."""
+        return max(1, math.ceil((now - self.timestamp).total_seconds()) + 1)
+
+    def is_new(self, timestamp: datetime.datetime, line: str) -> bool:
+        if self.timestamp is None or timestamp > self.timestamp:
+            return True
+        return timestamp == self.timestamp and line not in self.lines_at_timestamp
+
+    def advance(self, timestamp: datetime.datetime, line: str):
+        if self.timestamp is None or timestamp > self.timestamp:
+            self.timestamp = timestamp
+            self.lines_at_timestamp = set()
+        self.lines_at_timestamp.add(line)
+
+
+class LogBatch(NamedTuple):
+    """Lines not read before from one container, the cursor only moves once they are recorded."""
+
+    container: Tuple[str, str]
+    # (timestamp, timestamp text, line) for the lines inside the window, which are classified
+    entries: List[tuple]
+    # (timestamp, line) for every new line, inside the window or not
+    read: List[tuple]
+
+    @property
+    def lines(self) -> List[str]:
+        return [line for _, _, line in self.entries]
+
+
+class DeploymentLogState:
+    """Cursors and rolling counts for one deployment."""
+
+    def __init__(self, window_minutes: int = 60, detail_limit: int = 50):
+        self.window_minutes = window_minutes
+        self.cursors: Dict[Tuple[str, str], LogCursor] = {}
+        # Minute (epoch // 60) to counts per error type
+        self.buckets: Dict[int, Counter] = defaultdict(Counter)
+        self.recent = defaultdict(lambda: deque(maxlen=detail_limit))
+        self.last_checked: Optional[datetime.datetime] = None
+        # Serializes checks of the same deployment, so a delta is never counted twice
+        self.lock = asyncio.Lock()
+
+    def cursor(self, pod: str, container: str) -> LogCursor:
+        return self.cursors.setdefault((pod, container), LogCursor())
+
+    def select_new(self, pod: str, container: str, logs: str, now: datetime.datetime) -> LogBatch:
+        """The unread lines of a container, leaving the cursor where it is until they are recorded."""
+        cursor = self.cursor(pod, container)
+        window_start = now - datetime.timedelta(minutes=self.window_minutes)
+        entries, read, seen = [], [], set()
+        for line in logs.split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+            parsed = parse_log_line(line)
+            if parsed is None:
+                continue
+            timestamp, timestamp_str = parsed
+            if not cursor.is_new(timestamp, line) or (timestamp, line) in seen:
+                continue
+            seen.add((timestamp, line))
+            read.append((timestamp, line))
+            if timestamp >= window_start:
+                entries.append((timestamp, timestamp_str, line))
+        return LogBatch((pod, container), entries, read)
+
+    def record(self, batch: LogBatch, categories: List[List[str]]) -> Counter:
+        """Counts a classified batch and moves its cursor past it, returning the new counts per error type."""
+        cursor = self.cursor(*batch.container)
+        for timestamp, line in batch.read:
+            cursor.advance(timestamp, line)
+        new_counts = Counter()
+        for (timestamp, timestamp_str, line), error_types in zip(batch.entries, categories):
+            for error_type in error_types:
+                self.buckets[int(timestamp.timestamp() // 60)][error_type] += 1
+                self.recent[error_type].append({"timestamp": timestamp_str, "message": line, "time": timestamp})
+                new_counts[error_type] += 1
+        return new_counts
+
+    def forget_missing(self, live: set):
+        """Drops cursors of containers whose pods are gone."""
+        for key in set(self.cursors) - live:
+            del self.cursors[key]
+
+    def prune(self, now: datetime.datetime):
+        """Rolls off buckets and details older than the window."""
+        window_start = now - datetime.timedelta(minutes=self.window_minutes)
+        first_minute = int(window_start.timestamp() // 60)
+        for minute in [minute for minute in self.buckets if minute < first_minute]:
+            del self.buckets[minute]
+        for entries in self.recent.values():
+            while entries and entries[0]["time"] < window_start:
+                entries.popleft()
+
+    def counts(self, since: Optional[datetime.datetime] = None) -> Counter:
+        first_minute = int(since.timestamp() // 60) if since else None
+        total = Counter()
+        for minute, counts in self.buckets.items():
+            if first_minute is None or minute >= first_minute:
+                total.update(counts)
+        return total
+
+    def result(self, now, pods_analyzed, new_counts, access_errors=None):
+        counts = self.counts()
+        detailed_errors = {
+            error_type: [
+                {
+                    "timestamp": entry["timestamp"],
+                    "message": entry["message"],
+                    "age_minutes": round((now - entry["time"]).total_seconds() / 60, 1),
+                }
+                for entry in entries
+            ]
+            for error_type, entries in self.recent.items()
+            if entries
+        }
+        if access_errors:
+            detailed_errors["pod_access_errors"] = access_errors
+        return {
+            "summary": {
+                "total_errors": sum(counts.values()),
+                "error_types": dict(counts),
+                "errors_last_5_minutes": sum(self.counts(now - datetime.timedelta(minutes=4)).values()),
+                "new_since_last_check": {"total": sum(new_counts.values()), "error_types": dict(new_counts)},
+                "last_checked": self.last_checked.isoformat() if self.last_checked else None,
+                "pods_analyzed": pods_analyzed,
+                "time_window_minutes": self.window_minutes,
+            },
+            "detailed_errors": detailed_errors,
+        }
+
+
+class LogAnalyzer:
+    """Per-deployment log state, keeping the most recently analyzed deployments."""
+
+    def __init__(self, max_deployments: int = 32, window_minutes: int = 60, detail_limit: int = 50):
+        self.max_deployments = max_deployments
+        self.window_minutes = window_minutes
+        self.detail_limit = detail_limit
+        self._states: "OrderedDict[tuple, DeploymentLogState]" = OrderedDict()
+
+    def state(self, context: str, namespace: str, deployment: str) -> DeploymentLogState:
+        key = (context, namespace, deployment)
+        if key in self._states:
+            self._states.move_to_end(key)
+        else:
+            self._states[key] = DeploymentLogState(self.window_minutes, self.detail_limit)
+            while len(self._states) > self.max_deployments:
+                self._states.popitem(last=False)
+        return self._states[key]
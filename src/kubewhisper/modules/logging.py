@@ -3,18 +3,34 @@ from loguru import logger
 
 
 # Configure loguru
+CONSOLE_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}"
 logger.remove()
-logger.add(sys.stdout, format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}", level="INFO")
-
-# Add file output with rotation
-logger.add(
-    "kubewhisper.log",
-    rotation="10 MB",  # Rotate when file reaches 10MB
-    retention="1 week",  # Keep logs for 1 week
-    compression="zip",  # Compress rotated logs
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
-    level="INFO",
-)
+_console_handler_id = logger.add(sys.stdout, format=CONSOLE_FORMAT, level="INFO")
+
+_file_logging_enabled = False
+
+
+def set_console_log_level(level):
+    """Change what is logged to the console, e.g. WARNING when stdout carries headless replies."""
+    global _console_handler_id
+    logger.remove(_console_handler_id)
+    _console_handler_id = logger.add(sys.stdout, format=CONSOLE_FORMAT, level=level)
+
+
+def setup_file_logging():
+    """Add file output with rotation. Called by the CLI so importing this module has no side effects on disk."""
+    global _file_logging_enabled
+    if _file_logging_enabled:
+        return
+    logger.add(
+        "kubewhisper.log",
+        rotation="10 MB",  # Rotate when file reaches 10MB
+        retention="1 week",  # Keep logs for 1 week
+        compression="zip",  # Compress rotated logs
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
+        level="INFO",
+    )
+    _file_logging_enabled = True
 
 
 # Function to log WebSocket events
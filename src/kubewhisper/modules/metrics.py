@@ -0,0 +1,172 @@
+"""In-process metrics, exposed in the Prometheus text format on an optional local HTTP endpoint."""
+
+import bisect
+import threading
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from kubewhisper.modules.logging import log_info
+
+_lock = threading.Lock()
+_metrics = []
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metric:
+    type = ""
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        with _lock:
+            _metrics.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        return tuple(labels.get(name, "") for name in self.labelnames)
+
+    def render(self) -> str:
+        header = f"# HELP {self.name} {self.description}\n# TYPE {self.name} {self.type}\n"
+        return header + "".join(f"{line}\n" for line in self._samples())
+
+    def _samples(self):
+        return []
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name, description, labelnames=()):
+        super().__init__(name, description, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        with _lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in values]
+
+
+class Gauge(Metric):
+    """A value that goes up and down, either set directly or read from a function when scraped."""
+
+    type = "gauge"
+
+    def __init__(self, name, description, labelnames=()):
+        super().__init__(name, description, labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._functions: Dict[Tuple, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels):
+        with _lock:
+            self._values[self._key(labels)] = value
+
+    def set_function(self, function: Optional[Callable[[], float]], **labels):
+        with _lock:
+            if function is None:
+                self._functions.pop(self._key(labels), None)
+            else:
+                self._functions[self._key(labels)] = function
+
+    def _samples(self):
+        with _lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, function in functions.items():
+            try:
+                values[key] = function()
+            except Exception:
+                continue
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in sorted(values.items())]
+
+
+class Histogram(Metric):
+    type = "histogram"
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, name, description, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: counts per bucket (the last one is +Inf), sum and count
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with _lock:
+            series = self._series.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0, 0])
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def _samples(self):
+        with _lock:
+            series = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._series.items())
+        lines = []
+        for key, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = _format_labels(self.labelnames, key, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def render_metrics() -> str:
+    with _lock:
+        metrics = list(_metrics)
+    return "".join(metric.render() for metric in metrics)
+
+
+TURN_SECONDS = Histogram(
+    "kubewhisper_turn_seconds", "Time from the end of the user's question to the complete answer, tool calls included."
+)
+TOOL_SECONDS = Histogram("kubewhisper_tool_seconds", "Duration of tool calls.", ["tool"])
+TOOL_ERRORS = Counter("kubewhisper_tool_errors_total", "Tool calls that returned an error.", ["tool"])
+AUDIO_QUEUE_DEPTH = Gauge("kubewhisper_audio_queue_depth", "Captured audio chunks waiting to be sent.")
+WEBSOCKET_BYTES = Counter(
+    "kubewhisper_websocket_bytes_total", "Bytes sent and received on the Realtime WebSocket.", ["direction"]
+)
+RECONNECTS = Counter("kubewhisper_reconnects_total", "Realtime WebSocket reconnects by outcome.", ["outcome"])
+CACHE_REQUESTS = Counter("kubewhisper_cache_requests_total", "Cache lookups by cache and result.", ["cache", "result"])
+
+
+async def start_metrics_server(port: int, host: str = "127.0.0.1"):
+    """Serve /metrics on the given port, returning the runner to clean up on exit."""
+    # Imported here, the metrics endpoint is optional
+    from aiohttp import web
+
+    async def handle_metrics(request):
+        return web.Response(text=render_metrics(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    log_info(f"📈 Metrics available on http://{host}:{port}/metrics")
+    return runner
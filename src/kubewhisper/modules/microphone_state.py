@@ -0,0 +1,6 @@
+class MicrophoneState:
+    """Enum-like class for microphone states"""
+
+    IDLE = "idle"
+    RECORDING = "recording"
+    RECEIVING = "receiving"
@@ -0,0 +1,107 @@
+import asyncio
+import functools
+import inspect
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from kubewhisper.modules.config import Config
+from kubewhisper.modules.kubeconfig_index import get_kubeconfig_index
+from kubewhisper.modules.tool_deadline import ToolDeadline, accepts_deadline
+
+# Schema of the parameter that cluster-scoped tools accept for querying several clusters at once
+CLUSTERS_PARAMETER = {
+    "type": "array",
+    "items": {"type": "string"},
+    "description": (
+        'Cluster or context names to query at the same time, or ["all"] for every cluster in kubeconfig. '
+        "Omit to query only the current cluster."
+    ),
+}
+
+
+def resolve_contexts(clusters: Union[str, List[str]]) -> Dict[str, Optional[str]]:
+    """Map each requested cluster to its kubeconfig context name, None if it is unknown."""
+    index = get_kubeconfig_index()
+    if isinstance(clusters, str):
+        clusters = [clusters]
+    if any(cluster.lower() == "all" for cluster in clusters):
+        return {name: name for name in index.contexts_by_name}
+
+    contexts = {cluster: index.find_context(cluster) for cluster in clusters}
+    return {cluster: ctx["name"] if ctx else None for cluster, ctx in contexts.items()}
+
+
+def merge_cluster_results(results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine per-cluster results, separating errors and summing numeric counts."""
+    merged = {"clusters": {}, "errors": {}, "totals": {}}
+    for cluster, result in results.items():
+        if "error" in result:
+            merged["errors"][cluster] = result["error"]
+            continue
+        merged["clusters"][cluster] = result
+        for key, value in result.items():
+            if isinstance(value, int) and not isinstance(value, bool):
+                merged["totals"][key] = merged["totals"].get(key, 0) + value
+    merged["clusters_queried"] = len(results)
+    if not merged["errors"]:
+        del merged["errors"]
+    if not merged["totals"]:
+        del merged["totals"]
+    return merged
+
+
+async def query_clusters(
+    tool: Callable, clusters: Union[str, List[str]], deadline: Optional[ToolDeadline] = None, **kwargs
+) -> Dict[str, Any]:
+    """Run a tool against several clusters concurrently, each through its own client."""
+    try:
+        contexts = await asyncio.to_thread(resolve_contexts, clusters)
+    except Exception as e:
+        return {"error": f"Failed to read clusters from kubeconfig: {str(e)}"}
+
+    timeout = Config.CLUSTER_QUERY_TIMEOUT
+    if deadline:
+        timeout = min(timeout, deadline.remaining() - Config.CLUSTER_QUERY_MARGIN)
+    if timeout <= 0:
+        # Every cluster would time out at once, without a chance to answer
+        return {"error": "No time left in the tool budget to query the clusters"}
+    # Clusters still pending when the tool budget runs out are reported as timed out
+    results = {cluster: {"error": f"Timed out after {timeout:.1f} seconds"} for cluster in contexts}
+    if deadline:
+        deadline.partial = merge_cluster_results(results)
+
+    async def query(cluster, context):
+        if context is None:
+            results[cluster] = {"error": f"Cluster '{cluster}' not found in kubeconfig"}
+            return
+        cluster_kwargs = dict(kwargs, context=context)
+        cluster_deadline = ToolDeadline(timeout)
+        if accepts_deadline(tool):
+            cluster_kwargs["deadline"] = cluster_deadline
+        try:
+            results[cluster] = await asyncio.wait_for(tool(**cluster_kwargs), timeout=timeout)
+        except TimeoutError:
+            if cluster_deadline.partial:
+                results[cluster] = {**cluster_deadline.partial, "truncated": True}
+            else:
+                results[cluster] = {"error": f"Timed out after {timeout:.1f} seconds"}
+        if deadline:
+            deadline.partial = merge_cluster_results(results)
+
+    await asyncio.gather(*(query(cluster, context) for cluster, context in contexts.items()))
+    return merge_cluster_results(results)
+
+
+def for_clusters(tool: Callable) -> Callable:
+    """Wrap a cluster-scoped tool so it also accepts the ``clusters`` parameter."""
+
+    @functools.wraps(tool)
+    async def wrapper(clusters: Union[str, List[str], None] = None, deadline: Optional[ToolDeadline] = None, **kwargs):
+        if clusters:
+            return await query_clusters(tool, clusters, deadline, **kwargs)
+        if deadline is not None and accepts_deadline(tool):
+            kwargs["deadline"] = deadline
+        return await tool(**kwargs)
+
+    # The wrapper always takes a deadline, even when the wrapped tool does not
+    wrapper.__signature__ = inspect.signature(wrapper, follow_wrapped=False)
+    return wrapper
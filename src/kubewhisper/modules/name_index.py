@@ -0,0 +1,121 @@
+"""Fuzzy lookup of Kubernetes resource names, for names that arrive through speech-to-text."""
+
+import re
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Spoken words and the short forms resource names tend to use instead
+_SPOKEN_FORMS = {
+    "service": "svc",
+    "database": "db",
+    "deployment": "deploy",
+    "application": "app",
+    "configuration": "config",
+    "controller": "ctrl",
+    "kubernetes": "k8s",
+    "production": "prod",
+    "development": "dev",
+    "zero": "0",
+    "one": "1",
+    "two": "2",
+    "three": "3",
+    "four": "4",
+    "five": "5",
+    "six": "6",
+    "seven": "7",
+    "eight": "8",
+    "nine": "9",
+}
+
+Key = Tuple[str, str, str]
+
+
+class NameMatch(NamedTuple):
+    kind: str
+    namespace: str
+    name: str
+    score: float
+
+
+def normalize(name: str) -> str:
+    """Reduces a name to lowercase words without separators, plurals or long spoken forms."""
+    words = []
+    for word in re.split(r"[^a-z0-9]+", name.lower()):
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        if word:
+            words.append(_SPOKEN_FORMS.get(word, word))
+    return "".join(words)
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Resource names per kind, searchable by trigram similarity.
+
+    An inverted index from trigram to names means a lookup only scores names sharing a trigram
+    with the query. Refreshing with replace() only touches the names that were added or removed.
+    """
+
+    def __init__(self):
+        self._trigrams: Dict[Key, Set[str]] = {}
+        self._postings: Dict[str, Set[Key]] = {}
+        self._refreshed_at: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._trigrams)
+
+    def is_stale(self, kind: str, ttl: float) -> bool:
+        refreshed_at = self._refreshed_at.get(kind)
+        return refreshed_at is None or time.monotonic() - refreshed_at > ttl
+
+    def replace(self, kind: str, names: Iterable[Tuple[str, str]]) -> Tuple[int, int]:
+        """Sets the (namespace, name) pairs of a kind, returning how many were added and removed."""
+        current = {(kind, namespace, name) for namespace, name in names}
+        existing = {key for key in self._trigrams if key[0] == kind}
+        for key in existing - current:
+            self._remove(key)
+        for key in current - existing:
+            self._add(key)
+        self._refreshed_at[kind] = time.monotonic()
+        return len(current - existing), len(existing - current)
+
+    def _add(self, key: Key):
+        grams = trigrams(normalize(key[2]))
+        self._trigrams[key] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(key)
+
+    def _remove(self, key: Key):
+        for gram in self._trigrams.pop(key):
+            keys = self._postings[gram]
+            keys.discard(key)
+            if not keys:
+                del self._postings[gram]
+
+    def match(self, query: str, kind: str, namespace: Optional[str] = None, limit: int = 3) -> List[NameMatch]:
+        """The closest names of a kind, best first, preferring the given namespace on equal scores."""
+        query_grams = trigrams(normalize(query))
+        shared = Counter()
+        for gram in query_grams:
+            for key in self._postings.get(gram, ()):
+                if key[0] == kind:
+                    shared[key] += 1
+
+        # Dice coefficient of the trigram sets
+        matches = [
+            NameMatch(kind, key[1], key[2], 2 * count / (len(query_grams) + len(self._trigrams[key])))
+            for key, count in shared.items()
+        ]
+        matches.sort(key=lambda match: (-match.score, match.namespace != namespace, match.namespace, match.name))
+        return matches[:limit]
+
+    def best_match(
+        self, query: str, kind: str, namespace: Optional[str] = None, min_score: float = 0.5
+    ) -> Optional[NameMatch]:
+        matches = self.match(query, kind, namespace, limit=1)
+        return matches[0] if matches and matches[0].score >= min_score else None
@@ -0,0 +1,74 @@
+"""Cluster-wide aggregation of node metrics against node allocatable capacity."""
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+from kubewhisper.modules.quantity import parse_quantities
+
+GIB = 2.0**30
+
+
+def summarize_node_usage(
+    nodes: List[Dict[str, Any]],
+    metrics: List[Dict[str, Any]],
+    detail_limit: int = 20,
+    outlier_threshold: float = 90.0,
+) -> Dict[str, Any]:
+    """Summarizes usage per node and for the cluster.
+
+    nodes holds {"name", "cpu", "memory"} with allocatable quantities, metrics holds the
+    items of the metrics.k8s.io node list. Nodes without metrics are left out of averages.
+    """
+    names = [node["name"] for node in nodes]
+    position = {name: index for index, name in enumerate(names)}
+    allocatable_cpu = parse_quantities(node["cpu"] for node in nodes)
+    allocatable_memory = parse_quantities(node["memory"] for node in nodes)
+
+    usage_cpu = np.full(len(names), np.nan)
+    usage_memory = np.full(len(names), np.nan)
+    measured = [item for item in metrics if item["metadata"]["name"] in position]
+    if measured:
+        rows = np.array([position[item["metadata"]["name"]] for item in measured])
+        usage_cpu[rows] = parse_quantities(item["usage"]["cpu"] for item in measured)
+        usage_memory[rows] = parse_quantities(item["usage"]["memory"] for item in measured)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cpu_percent = np.where(allocatable_cpu > 0, usage_cpu / allocatable_cpu * 100, np.nan)
+        memory_percent = np.where(allocatable_memory > 0, usage_memory / allocatable_memory * 100, np.nan)
+
+    has_metrics = ~np.isnan(usage_cpu)
+    summary = {"nodes_with_metrics": int(has_metrics.sum())}
+    if not has_metrics.any():
+        return summary
+
+    used_cpu = usage_cpu[has_metrics].sum()
+    used_memory = usage_memory[has_metrics].sum()
+    total_cpu = allocatable_cpu[has_metrics].sum()
+    total_memory = allocatable_memory[has_metrics].sum()
+    summary.update(
+        {
+            "avg_cpu_usage": f"{np.nanmean(cpu_percent):.1f}%",
+            "avg_memory_usage": f"{used_memory / has_metrics.sum() / GIB:.1f}GB",
+            "avg_memory_utilization": f"{np.nanmean(memory_percent):.1f}%",
+            "cpu_cores": {"used": round(float(used_cpu), 2), "allocatable": round(float(total_cpu), 2)},
+            "memory_gb": {
+                "used": round(float(used_memory / GIB), 1),
+                "allocatable": round(float(total_memory / GIB), 1),
+            },
+        }
+    )
+
+    # Busiest nodes first, ranked by whichever resource is closer to its limit
+    pressure = np.fmax(cpu_percent, memory_percent)
+    order = np.argsort(np.where(has_metrics, -pressure, np.inf), kind="stable")
+    summary["node_utilization"] = [
+        {"node": names[i], "cpu": f"{cpu_percent[i]:.1f}%", "memory": f"{memory_percent[i]:.1f}%"}
+        for i in order[: min(detail_limit, int(has_metrics.sum()))]
+    ]
+
+    # Nodes well above the rest of the cluster, or close to full
+    mean, spread = np.nanmean(pressure), np.nanstd(pressure)
+    is_outlier = has_metrics & ((pressure >= outlier_threshold) | (pressure > mean + 2 * spread))
+    summary["outliers"] = [names[i] for i in order if is_outlier[i]]
+    return summary
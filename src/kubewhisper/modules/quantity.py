@@ -0,0 +1,67 @@
+"""Parsing of Kubernetes resource quantities such as "250m", "1.5Gi" or "12e3"."""
+
+import re
+from typing import Iterable
+
+import numpy as np
+
+# Multipliers for every suffix a Kubernetes quantity can carry
+SUFFIX_MULTIPLIERS = {
+    "n": 1e-9,
+    "u": 1e-6,
+    "m": 1e-3,
+    "k": 1e3,
+    "M": 1e6,
+    "G": 1e9,
+    "T": 1e12,
+    "P": 1e15,
+    "E": 1e18,
+    "Ki": 2.0**10,
+    "Mi": 2.0**20,
+    "Gi": 2.0**30,
+    "Ti": 2.0**40,
+    "Pi": 2.0**50,
+    "Ei": 2.0**60,
+}
+
+# Binary suffixes first, so "Mi" is not mistaken for a value ending in "i" with suffix "M"
+_SUFFIXES_BY_LENGTH = sorted(SUFFIX_MULTIPLIERS, key=len, reverse=True)
+
+_QUANTITY_PATTERN = re.compile(
+    r"^([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)(" + "|".join(_SUFFIXES_BY_LENGTH) + r")?$"
+)
+
+
+def parse_quantity(quantity) -> float:
+    """Converts a single quantity to a float in base units (cores or bytes)."""
+    if isinstance(quantity, (int, float)):
+        return float(quantity)
+    match = _QUANTITY_PATTERN.match(str(quantity).strip())
+    if not match:
+        raise ValueError(f"Invalid resource quantity: {quantity!r}")
+    number, suffix = match.groups()
+    return float(number) * SUFFIX_MULTIPLIERS.get(suffix, 1.0)
+
+
+def parse_quantities(quantities: Iterable) -> np.ndarray:
+    """Converts many quantities at once, grouping them by suffix instead of looping per value."""
+    values = np.asarray([str(quantity).strip() for quantity in quantities], dtype=np.str_)
+    result = np.empty(values.shape, dtype=np.float64)
+    remaining = np.ones(values.shape, dtype=bool)
+    for suffix in _SUFFIXES_BY_LENGTH:
+        # A decimal exponent ("1e3") never ends in a letter, so an "E" at the end is always exa
+        matches = remaining & np.char.endswith(values, suffix)
+        if matches.any():
+            numbers = np.char.rstrip(values[matches], suffix)
+            result[matches] = _to_float(numbers) * SUFFIX_MULTIPLIERS[suffix]
+            remaining &= ~matches
+    if remaining.any():
+        result[remaining] = _to_float(values[remaining])
+    return result
+
+
+def _to_float(numbers: np.ndarray) -> np.ndarray:
+    try:
+        return numbers.astype(np.float64)
+    except ValueError as e:
+        raise ValueError(f"Invalid resource quantity: {e}") from e
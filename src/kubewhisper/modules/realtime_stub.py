@@ -0,0 +1,115 @@
+"""A local stand-in for the OpenAI Realtime API, speaking the text subset of its protocol.
+
+Every user message is answered with calls to the configured tools, followed by a short text reply
+once their outputs arrive. Used by the load generator and tests to exercise the assistant without
+network access or API costs.
+"""
+
+import asyncio
+import itertools
+import json
+from typing import List, Optional
+
+from websockets.asyncio.server import serve
+
+
+class RealtimeStub:
+    def __init__(self, tool_calls: Optional[List[str]] = None, model_latency: float = 0.0):
+        self.tool_calls = tool_calls or []
+        self.model_latency = model_latency
+        self.sessions = 0
+        self.events_received = 0
+        # Most items any one conversation held at once
+        self.largest_conversation = 0
+        self._ids = itertools.count(1)
+        self._server = None
+
+    def _id(self, prefix):
+        return f"{prefix}_{next(self._ids)}"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Starts listening, returning the ws:// URL to connect to."""
+        self._server = await serve(self._handle_connection, host, port)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"ws://{host}:{port}"
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_connection(self, connection):
+        self.sessions += 1
+        # Items of the conversation, and whether tools were already called for the latest user message
+        conversation = {}
+        state = {"user_text": None, "tools_called": False}
+
+        async def send(event):
+            event.setdefault("event_id", self._id("event"))
+            await connection.send(json.dumps(event))
+
+        await send({"type": "session.created", "session": {"id": self._id("sess")}})
+        async for message in connection:
+            event = json.loads(message)
+            self.events_received += 1
+            event_type = event.get("type")
+            if event_type == "session.update":
+                await send({"type": "session.updated", "session": event.get("session", {})})
+            elif event_type == "conversation.item.create":
+                item = dict(event["item"], id=event["item"].get("id") or self._id("item"))
+                conversation[item["id"]] = item
+                self.largest_conversation = max(self.largest_conversation, len(conversation))
+                if item.get("type") == "message" and item.get("role") == "user":
+                    state["user_text"] = "".join(part.get("text", "") for part in item.get("content", []))
+                    state["tools_called"] = False
+                await send({"type": "conversation.item.created", "item": item})
+            elif event_type == "conversation.item.delete":
+                conversation.pop(event.get("item_id"), None)
+                await send({"type": "conversation.item.deleted", "item_id": event.get("item_id")})
+            elif event_type == "response.create":
+                if self.model_latency:
+                    await asyncio.sleep(self.model_latency)
+                if self.tool_calls and not state["tools_called"]:
+                    state["tools_called"] = True
+                    await self._respond_with_tool_calls(send)
+                else:
+                    await self._respond_with_text(send, f"Done: {state['user_text']}")
+
+    async def _respond_with_tool_calls(self, send):
+        response_id = self._id("resp")
+        await send({"type": "response.created", "response": {"id": response_id}})
+        output = []
+        for name in self.tool_calls:
+            item = {
+                "id": self._id("item"),
+                "type": "function_call",
+                "call_id": self._id("call"),
+                "name": name,
+                "arguments": "{}",
+            }
+            output.append(item)
+            await send({"type": "response.output_item.added", "item": dict(item, arguments="")})
+            await send(
+                {
+                    "type": "response.function_call_arguments.done",
+                    "call_id": item["call_id"],
+                    "name": name,
+                    "arguments": item["arguments"],
+                }
+            )
+            await send({"type": "response.output_item.done", "item": item})
+        await send({"type": "response.done", "response": {"id": response_id, "output": output}})
+
+    async def _respond_with_text(self, send, text):
+        response_id = self._id("resp")
+        item = {"id": self._id("item"), "type": "message", "role": "assistant", "content": []}
+        await send({"type": "response.created", "response": {"id": response_id}})
+        await send({"type": "response.output_item.added", "item": item})
+        for index, word in enumerate(text.split(" ")):
+            delta = word if index == 0 else f" {word}"
+            await send({"type": "response.text.delta", "item_id": item["id"], "delta": delta})
+        await send({"type": "response.text.done", "item_id": item["id"], "text": text})
+        item = dict(item, content=[{"type": "text", "text": text}])
+        await send({"type": "response.output_item.done", "item": item})
+        await send({"type": "response.done", "response": {"id": response_id, "output": [item]}})
@@ -0,0 +1,57 @@
+import random
+
+from websockets.exceptions import ConnectionClosed, InvalidStatus
+
+from kubewhisper.modules.config import Config
+
+# Close codes after which reconnecting is expected to succeed
+# 1001 going away, 1006 abnormal closure, 1011 internal error (also used for keepalive ping timeouts),
+# 1012 service restart, 1013 try again later, 1014 bad gateway
+TRANSIENT_CLOSE_CODES = {1001, 1006, 1011, 1012, 1013, 1014}
+
+
+def get_close_code(error: ConnectionClosed) -> int:
+    """Returns the close code of a closed connection, 1006 if no close frame was exchanged."""
+    if error.rcvd is not None:
+        return error.rcvd.code
+    if error.sent is not None:
+        return error.sent.code
+    return 1006
+
+
+class ReconnectPolicy:
+    """Exponential backoff with full jitter for reconnecting the Realtime WebSocket."""
+
+    def __init__(
+        self,
+        base_delay: float = Config.RECONNECT_BASE_DELAY,
+        max_delay: float = Config.RECONNECT_MAX_DELAY,
+        max_attempts: int = Config.RECONNECT_MAX_ATTEMPTS,
+    ) -> None:
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.attempt = 0
+
+    @staticmethod
+    def is_transient(error: BaseException) -> bool:
+        """Returns True if the error is worth retrying with a new connection."""
+        if isinstance(error, ConnectionClosed):
+            return get_close_code(error) in TRANSIENT_CLOSE_CODES
+        if isinstance(error, InvalidStatus):
+            status = error.response.status_code
+            return status == 429 or status >= 500
+        return isinstance(error, (OSError, TimeoutError))
+
+    def should_retry(self, error: BaseException) -> bool:
+        return self.is_transient(error) and self.attempt < self.max_attempts
+
+    def next_delay(self) -> float:
+        """Returns the delay before the next attempt and advances the attempt counter."""
+        ceiling = min(self.max_delay, self.base_delay * (2**self.attempt))
+        self.attempt += 1
+        return random.uniform(0, ceiling)
+
+    def reset(self) -> None:
+        """Start over after a connection has been successfully re-established."""
+        self.attempt = 0
@@ -0,0 +1,58 @@
+"""Streaming sample rate conversion of 16-bit mono PCM."""
+
+import numpy as np
+
+
+class Resampler:
+    """Converts PCM16 audio from input_rate to output_rate one chunk at a time.
+
+    Linear interpolation between samples, preceded by a windowed-sinc low-pass filter when
+    downsampling so content above the new Nyquist frequency does not alias. Filter history and the
+    interpolation position carry over between chunks, so chunk boundaries leave no clicks.
+    """
+
+    def __init__(self, input_rate: int, output_rate: int = 24000, taps: int = 31):
+        self.input_rate = input_rate
+        self.output_rate = output_rate
+        # Input samples advanced per output sample
+        self.step = input_rate / output_rate
+        self._position = 0.0
+        self._last_sample = np.zeros(1, dtype=np.float32)
+        self._filter = None
+        if input_rate > output_rate:
+            self._filter = _low_pass(0.9 * output_rate / input_rate, taps)
+            self._filter_history = np.zeros(taps - 1, dtype=np.float32)
+
+    @property
+    def passthrough(self) -> bool:
+        return self.input_rate == self.output_rate
+
+    def process(self, pcm16: bytes) -> bytes:
+        if self.passthrough or not pcm16:
+            return pcm16
+        samples = np.frombuffer(pcm16, dtype=np.int16).astype(np.float32)
+
+        if self._filter is not None:
+            padded = np.concatenate((self._filter_history, samples))
+            self._filter_history = padded[len(padded) - len(self._filter) + 1 :]
+            samples = np.convolve(padded, self._filter, mode="valid").astype(np.float32)
+
+        # The last sample of the previous chunk is index 0, so interpolation can span the boundary
+        buffer = np.concatenate((self._last_sample, samples))
+        span = len(buffer) - 1
+        count = max(0, int(np.ceil((span - self._position) / self.step)))
+        positions = self._position + np.arange(count) * self.step
+        indices = positions.astype(np.int64)
+        fractions = (positions - indices).astype(np.float32)
+        output = buffer[indices] * (1 - fractions) + buffer[indices + 1] * fractions
+
+        self._position += count * self.step - span
+        self._last_sample = buffer[-1:]
+        return np.clip(np.rint(output), -32768, 32767).astype(np.int16).tobytes()
+
+
+def _low_pass(cutoff: float, taps: int) -> np.ndarray:
+    """Windowed-sinc FIR with the cutoff as a fraction of the input Nyquist frequency, unity gain."""
+    n = np.arange(taps) - (taps - 1) / 2
+    kernel = np.sinc(cutoff * n) * np.blackman(taps)
+    return (kernel / kernel.sum()).astype(np.float32)
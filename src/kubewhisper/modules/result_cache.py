@@ -0,0 +1,95 @@
+"""Tool results shared between sessions, so users asking the same thing cause one API call."""
+
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional
+
+from kubewhisper.modules.kube_client import get_active_context
+from kubewhisper.modules.metrics import CACHE_REQUESTS
+from kubewhisper.modules.tool_deadline import ToolDeadline, get_tool_budget, run_with_deadline
+
+
+class ResultCache:
+    """Keeps results for ttl seconds, and lets concurrent callers of the same key share one call."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._results: Dict[Hashable, tuple] = {}
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+    async def get_or_run(self, key: Hashable, factory: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        entry = self._results.get(key)
+        if entry and entry[0] > time.monotonic():
+            self.hits += 1
+            CACHE_REQUESTS.inc(cache="tool_results", result="hit")
+            return entry[1]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            self.misses += 1
+            CACHE_REQUESTS.inc(cache="tool_results", result="miss")
+            task = asyncio.create_task(factory())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda finished: self._store(key, finished))
+        else:
+            self.hits += 1
+            CACHE_REQUESTS.inc(cache="tool_results", result="hit")
+        # Shielded, so one caller giving up does not cancel the call for everyone waiting on it
+        return await asyncio.shield(task)
+
+    def _store(self, key: Hashable, task: asyncio.Task):
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        # Errors are not kept, the next caller tries again
+        if not (isinstance(result, dict) and "error" in result):
+            self._results[key] = (time.monotonic() + self.ttl, result)
+        self._evict_expired()
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        for key in [key for key, (expires_at, _) in self._results.items() if expires_at <= now]:
+            del self._results[key]
+
+
+def cached_function_map(
+    function_map: Dict[str, Callable], cache: ResultCache, uncached: Iterable[str] = ()
+) -> Dict[str, Callable]:
+    """Wraps the tools so their results go through the cache, keyed by arguments and active context."""
+    uncached = set(uncached)
+    return {name: func if name in uncached else _cached_tool(name, func, cache) for name, func in function_map.items()}
+
+
+def _cached_tool(name: str, func: Callable, cache: ResultCache) -> Callable:
+    # Deadline of the call in flight per key, shared by every caller waiting on it
+    shared_deadlines: Dict[Hashable, ToolDeadline] = {}
+
+    async def run_shared(key: Hashable, kwargs: Dict[str, Any], shared: ToolDeadline):
+        try:
+            return await run_with_deadline(name, func, kwargs, deadline=shared)
+        finally:
+            if shared_deadlines.get(key) is shared:
+                del shared_deadlines[key]
+
+    def start(key: Hashable, kwargs: Dict[str, Any]):
+        shared = shared_deadlines[key] = ToolDeadline(get_tool_budget(name))
+        return run_shared(key, kwargs, shared)
+
+    async def cached(deadline: Optional[ToolDeadline] = None, **kwargs):
+        key = (name, get_active_context(), json.dumps(kwargs, sort_keys=True, default=str))
+        try:
+            return await cache.get_or_run(key, lambda: start(key, kwargs))
+        except asyncio.CancelledError:
+            # The caller's own budget ran out first, it answers with what the shared call gathered so far
+            shared = shared_deadlines.get(key)
+            if deadline is not None and shared is not None:
+                deadline.partial = shared.partial
+            raise
+
+    cached.__name__ = name
+    cached.__doc__ = func.__doc__
+    return cached
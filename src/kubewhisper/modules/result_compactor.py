@@ -0,0 +1,112 @@
+import json
+import re
+from typing import Any, Optional
+
+from kubewhisper.modules.config import Config
+
+# Rough average for JSON-heavy text, used to turn the token budget into bytes
+BYTES_PER_TOKEN = 4
+
+# Increasingly aggressive (max list items, max string length) pairs tried until a result fits
+COMPACTION_LEVELS = [(20, 500), (10, 300), (5, 200), (3, 120), (1, 80)]
+
+# Variable parts of messages that should not keep otherwise identical messages apart
+_NORMALIZE_PATTERNS = [
+    (re.compile(r"\d{4}-\d{2}-\d{2}[T ][\d:.,]+(Z|[+-]\d{2}:?\d{2})?"), "<ts>"),
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.IGNORECASE), "<uuid>"),
+    (re.compile(r"\b(0x)?[0-9a-f]{8,}\b", re.IGNORECASE), "<hex>"),
+    (re.compile(r"\d+"), "#"),
+]
+
+
+def get_output_budget() -> int:
+    """Returns the size budget in bytes for a single tool result."""
+    return min(Config.TOOL_OUTPUT_MAX_BYTES, Config.TOOL_OUTPUT_MAX_TOKENS * BYTES_PER_TOKEN)
+
+
+def _size(value: Any) -> int:
+    return len(json.dumps(value).encode("utf-8"))
+
+
+def _normalize_message(message: str) -> str:
+    for pattern, replacement in _NORMALIZE_PATTERNS:
+        message = pattern.sub(replacement, message)
+    return message.strip().lower()
+
+
+def _is_message_list(value: Any) -> bool:
+    return bool(value) and isinstance(value, list) and all(isinstance(i, dict) and "message" in i for i in value)
+
+
+def _deduplicate_messages(items: list) -> list:
+    """Collapse similar messages into one example with a count, most frequent first."""
+    groups = {}
+    for item in items:
+        key = _normalize_message(str(item["message"]))
+        count = item.get("count", 1)
+        if key not in groups:
+            groups[key] = {**item, "count": count}
+            continue
+        group = groups[key]
+        group["count"] += count
+        if "timestamp" in item:
+            group["last_seen"] = item["timestamp"]
+    return sorted(groups.values(), key=lambda group: group["count"], reverse=True)
+
+
+def _deduplicate(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _deduplicate(item) for key, item in value.items()}
+    if _is_message_list(value):
+        return _deduplicate_messages(value)
+    if isinstance(value, list):
+        return [_deduplicate(item) for item in value]
+    return value
+
+
+def _trim(value: Any, max_items: int, max_chars: int) -> Any:
+    """Limit list lengths and string sizes, keeping the first (most relevant) entries."""
+    if isinstance(value, dict):
+        return {key: _trim(item, max_items, max_chars) for key, item in value.items()}
+    if isinstance(value, list):
+        trimmed = [_trim(item, max_items, max_chars) for item in value[:max_items]]
+        if len(value) > max_items:
+            trimmed.append({"omitted": len(value) - max_items})
+        return trimmed
+    if isinstance(value, str) and len(value) > max_chars:
+        return value[:max_chars] + "…"
+    return value
+
+
+def compact_result(result: Any, max_bytes: Optional[int] = None) -> Any:
+    """Shrink a tool result to fit the output budget.
+
+    Results within the budget are returned unchanged. Larger results get similar
+    messages deduplicated into counts with an example, after which lists and long
+    strings are trimmed step by step until the result fits.
+    """
+    max_bytes = max_bytes or get_output_budget()
+    original_size = _size(result)
+    if original_size <= max_bytes:
+        return result
+
+    deduplicated = _deduplicate(result)
+    compacted = deduplicated
+    for max_items, max_chars in COMPACTION_LEVELS:
+        if _size(compacted) <= max_bytes:
+            break
+        # Always trimmed from the deduplicated result, so omitted counts refer to the original lists
+        compacted = _trim(deduplicated, max_items, max_chars)
+
+    if isinstance(compacted, dict):
+        compacted = {**compacted, "compacted": {"original_bytes": original_size, "bytes": _size(compacted)}}
+        # Drop the largest top-level entries if trimming alone was not enough
+        while _size(compacted) > max_bytes:
+            candidates = [key for key in compacted if key not in ("compacted", "omitted_fields")]
+            if not candidates:
+                break
+            largest = max(candidates, key=lambda key: _size(compacted[key]))
+            compacted.pop(largest)
+            compacted.setdefault("omitted_fields", []).append(largest)
+        compacted["compacted"]["bytes"] = _size(compacted)
+    return compacted
@@ -0,0 +1,47 @@
+"""Rollout progress of a Deployment, judged the way kubectl rollout status does."""
+
+from typing import Any, Dict, NamedTuple
+
+
+class RolloutStatus(NamedTuple):
+    # "complete", "progressing", "failed" or "paused"
+    state: str
+    message: str
+
+    @property
+    def finished(self) -> bool:
+        """Whether waiting longer cannot change the outcome."""
+        return self.state != "progressing"
+
+
+def rollout_status(deployment: Dict[str, Any]) -> RolloutStatus:
+    """Status of a Deployment given as the API's JSON, with camelCase keys."""
+    name = deployment["metadata"]["name"]
+    spec = deployment.get("spec", {})
+    status = deployment.get("status", {})
+
+    if deployment["metadata"].get("generation", 0) > status.get("observedGeneration", 0):
+        return RolloutStatus("progressing", "Waiting for the deployment spec update to be observed")
+    if spec.get("paused"):
+        return RolloutStatus("paused", f"Deployment {name} is paused, resume it to continue the rollout")
+
+    conditions = {condition.get("type"): condition for condition in status.get("conditions", [])}
+    progressing = conditions.get("Progressing", {})
+    if progressing.get("reason") == "ProgressDeadlineExceeded":
+        return RolloutStatus("failed", f"Deployment {name} exceeded its progress deadline")
+    # The deployment controller reports ReplicaSet failures, e.g. an exceeded quota, here
+    replica_failure = conditions.get("ReplicaFailure", {})
+    if replica_failure.get("status") == "True":
+        return RolloutStatus("failed", replica_failure.get("message") or f"Deployment {name} cannot create pods")
+
+    desired = spec.get("replicas", 1)
+    updated = status.get("updatedReplicas", 0)
+    total = status.get("replicas", 0)
+    available = status.get("availableReplicas", 0)
+    if updated < desired:
+        return RolloutStatus("progressing", f"{updated} out of {desired} new replicas have been updated")
+    if total > updated:
+        return RolloutStatus("progressing", f"{total - updated} old replicas are pending termination")
+    if available < updated:
+        return RolloutStatus("progressing", f"{available} of {updated} updated replicas are available")
+    return RolloutStatus("complete", f"Deployment {name} successfully rolled out")
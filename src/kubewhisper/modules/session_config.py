@@ -2,13 +2,14 @@ from kubewhisper.modules.config import Config
 
 
 class SessionConfig:
-    def __init__(self, tools):
+    def __init__(self, tools, text_only=False, audio_format=None):
+        audio_format = audio_format or Config.AUDIO_FORMAT
         self.config = {
-            "modalities": ["text", "audio"],
+            "modalities": ["text"] if text_only else ["text", "audio"],
             "instructions": Config.SESSION_INSTRUCTIONS,
             "voice": "coral",
-            "input_audio_format": "pcm16",
-            "output_audio_format": "pcm16",
+            "input_audio_format": audio_format,
+            "output_audio_format": audio_format,
             "turn_detection": {
                 "type": "server_vad",
                 "threshold": Config.SILENCE_THRESHOLD,
@@ -17,3 +18,6 @@ class SessionConfig:
             },
             "tools": tools,
         }
+        if text_only:
+            # Without audio input there is no speech to detect, turns start with response.create
+            self.config["turn_detection"] = None
@@ -1,12 +1,23 @@
 import asyncio
-import speech_recognition as sr
-from websockets.exceptions import ConnectionClosedError
+import time
 import websockets
 from kubewhisper.modules.logging import log_ws_event, log_warning, logger
 from kubewhisper.modules.websocket_manager import WebSocketManager
-from kubewhisper.modules.kubernetes_tools import function_map as k8s_function_map, tools as k8s_tools
-from kubewhisper.modules.async_microphone import AsyncMicrophone, MicrophoneState
+from kubewhisper.modules.kubernetes_tools import (
+    function_map as k8s_function_map,
+    run_usage_sampler,
+    tools as k8s_tools,
+)
+from kubewhisper.modules.microphone_state import MicrophoneState
+from kubewhisper.modules.headless import NullMicrophone, PromptSource, run_turn
+from kubewhisper.modules.config import Config
+from kubewhisper.modules.metrics import AUDIO_QUEUE_DEPTH, RECONNECTS, start_metrics_server
 from kubewhisper.modules.session_config import SessionConfig
+from kubewhisper.modules.reconnect import ReconnectPolicy
+from kubewhisper.modules.http_cache import close_http_session
+from kubewhisper.modules.log_analyzer import shutdown_process_pool
+from kubewhisper.modules.kube_client import prebuild_api_clients, warm_up as kube_warm_up
+from kubewhisper.utils.utils import log_runtime
 from .event_handler import EventHandler
 
 # Combine function maps and tools
@@ -15,56 +26,170 @@ tools = k8s_tools
 
 
 class SimpleAssistant:
-    def __init__(self, openai_api_key, realtime_api_url):
+    def __init__(
+        self, openai_api_key, realtime_api_url, headless=False, prompts=None, metrics_port=None, gateway_client=False
+    ):
+        """With headless set, the assistant talks in text only, reading prompts from the list or stdin.
+
+        With gateway_client set, the gateway answers tool calls, so no Kubernetes clients are prepared.
+        """
         self.prompts = []
-        self.mic = AsyncMicrophone()
+        self.headless = headless
+        self.gateway_client = gateway_client
+        if headless:
+            self.mic = NullMicrophone()
+            self.prompt_source = PromptSource(prompts)
+        else:
+            # Imported here so headless sessions run on machines without audio libraries
+            from kubewhisper.modules.async_microphone import AsyncMicrophone
+
+            self.mic = AsyncMicrophone()
+        self.metrics_port = metrics_port
+        AUDIO_QUEUE_DEPTH.set_function(lambda: self.mic.queue_depth)
         self.exit_event = asyncio.Event()
         self.ws_manager = WebSocketManager(openai_api_key, realtime_api_url)
-        self.event_handler = EventHandler(self.mic, self.ws_manager, function_map)
-        self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
-        self.session_config = SessionConfig(tools)
+        self.event_handler = EventHandler(self.mic, self.ws_manager, function_map, echo_text=not headless)
+        self.session_config = SessionConfig(tools, text_only=headless)
+        self.startup_timeline = {}
+        self.background_tasks = set()
+        self.usage_sampler = None
 
-    async def run(self):
-        while True:
-            try:
-                await self._establish_connection()
-                ws_task = asyncio.create_task(self.process_ws_messages())
+    async def startup(self):
+        """Open the WebSocket, the Kubernetes client and the audio devices concurrently."""
+        start_time = time.perf_counter()
 
-                logger.info("Conversation started. Speak freely, and the assistant will respond.")
-                if self.prompts:
-                    await self.send_initial_prompts()
-                else:
-                    self.mic.start_recording()
-                    logger.info("Recording started. Listening for speech...")
+        async def ready(component, startup_call):
+            result = await startup_call
+            self.startup_timeline[component] = time.perf_counter() - start_time
+            return result
 
-                await self.send_audio_loop()
-                await ws_task
-                break
+        startup_calls = [
+            ready("audio", asyncio.to_thread(self.mic.open)),
+            ready("websocket", self._establish_connection()),
+        ]
+        if not self.gateway_client:
+            startup_calls.append(ready("kubernetes", asyncio.to_thread(kube_warm_up)))
+        audio_result, websocket_result, *kubernetes_results = await asyncio.gather(
+            *startup_calls, return_exceptions=True
+        )
+        if isinstance(audio_result, BaseException):
+            await self.ws_manager.close()
+            raise audio_result
+        if isinstance(websocket_result, BaseException):
+            # The connection is retried by the reconnect loop in run()
+            logger.warning(f"Could not connect during startup: {websocket_result}")
+            await self.ws_manager.close()
+        if self.gateway_client:
+            logger.info("Tool calls are answered by the gateway, no Kubernetes client needed.")
+        elif isinstance(kubernetes_result := kubernetes_results[0], BaseException):
+            # Not fatal, the tools load the kubeconfig again on first use
+            logger.warning(f"Kubernetes client warm-up failed: {kubernetes_result}")
+        else:
+            logger.info(f"Kubernetes API server {kubernetes_result} ready.")
+            # Clients for the other contexts make later cluster switches instant
+            self.background_tasks.add(task := asyncio.create_task(self._prebuild_api_clients()))
+            task.add_done_callback(self.background_tasks.discard)
+            if Config.USAGE_SAMPLE_INTERVAL > 0:
+                # Builds the history trend questions are answered from
+                self.usage_sampler = asyncio.create_task(run_usage_sampler(Config.USAGE_SAMPLE_INTERVAL))
+
+        timeline = ", ".join(
+            f"{component} {duration:.3f}s"
+            for component, duration in sorted(self.startup_timeline.items(), key=lambda entry: entry[1])
+        )
+        logger.info(f"🚦 Startup readiness: {timeline}")
+        log_runtime("startup", time.perf_counter() - start_time)
+
+    async def _prebuild_api_clients(self):
+        try:
+            await asyncio.to_thread(prebuild_api_clients)
+        except Exception as e:
+            logger.warning(f"Could not prepare clients for all Kubernetes contexts: {e}")
+
+    async def run(self):
+        reconnect_policy = ReconnectPolicy()
+        disconnected_at = None
+        metrics_server = None
+        try:
+            if self.metrics_port is not None:
+                metrics_server = await start_metrics_server(self.metrics_port, Config.METRICS_HOST)
+            await self.startup()
+            while not self.exit_event.is_set():
+                try:
+                    if not self.ws_manager.websocket:
+                        await self._establish_connection()
+                    if disconnected_at is not None:
+                        await self._restore_session()
+                        log_runtime("websocket_reconnect", time.perf_counter() - disconnected_at)
+                        RECONNECTS.inc(outcome="succeeded")
+                        disconnected_at = None
+                        reconnect_policy.reset()
+                        logger.info("Conversation resumed.")
+                    elif self.headless:
+                        logger.info("Conversation started in headless mode.")
+                    else:
+                        logger.info("Conversation started. Speak freely, and the assistant will respond.")
+                        if self.prompts:
+                            await self.send_initial_prompts()
+                        else:
+                            self.mic.start_recording()
+                            logger.info("Recording started. Listening for speech...")
 
-            except Exception as e:
-                should_continue = await self.handle_connection_error(e)
-                if not should_continue:
+                    await self._run_session()
                     break
-            finally:
-                self.mic.stop_recording()
-                self.mic.close()
-                await self.ws_manager.close()
+
+                except Exception as e:
+                    if not reconnect_policy.should_retry(e):
+                        logger.exception(f"Stopping the assistant after an unrecoverable error: {e}")
+                        if disconnected_at is not None:
+                            RECONNECTS.inc(outcome="gave_up")
+                        break
+                    RECONNECTS.inc(outcome="attempted")
+                    if disconnected_at is None:
+                        disconnected_at = time.perf_counter()
+                    delay = reconnect_policy.next_delay()
+                    logger.warning(
+                        f"WebSocket connection lost ({e}). Reconnecting in {delay:.2f}s "
+                        f"(attempt {reconnect_policy.attempt}/{reconnect_policy.max_attempts})..."
+                    )
+                    await self.ws_manager.close()
+                    await asyncio.sleep(delay)
+        finally:
+            # Audio devices stay open across reconnects and are only released here
+            self.exit_event.set()
+            if self.usage_sampler:
+                self.usage_sampler.cancel()
+            self.mic.stop_recording()
+            self.mic.close()
+            await self.ws_manager.close()
+            await close_http_session()
+            shutdown_process_pool()
+            if metrics_server:
+                await metrics_server.cleanup()
 
     async def _establish_connection(self):
         await self.ws_manager.connect()
         await self.ws_manager.initialize_session(self.session_config.config)
 
-    async def handle_connection_error(self, error):
-        if isinstance(error, ConnectionClosedError):
-            if "keepalive ping timeout" in str(error):
-                logger.warning("WebSocket connection lost due to keepalive ping timeout. Reconnecting...")
-                await asyncio.sleep(1)
-                return True
-            logger.exception("WebSocket connection closed unexpectedly.")
+    async def _restore_session(self):
+        """Bring a new connection back to where the lost one was."""
+        self.event_handler.reset()
+        self.mic.stop_receiving()
+        await self.ws_manager.replay_conversation()
+
+    async def _run_session(self):
+        """Run the message and audio loops until one of them ends, propagating connection errors."""
+        ws_task = asyncio.create_task(self.process_ws_messages())
+        if self.headless:
+            input_task = asyncio.create_task(self.prompt_loop())
         else:
-            logger.exception(f"An unexpected error occurred: {error}")
-        return False
+            input_task = asyncio.create_task(self.send_audio_loop())
+        done, pending = await asyncio.wait({ws_task, input_task}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            task.result()
 
     async def process_ws_messages(self):
         while True:
@@ -74,7 +199,7 @@ class SimpleAssistant:
                 await self.event_handler.handle_event(event)
             except websockets.ConnectionClosed:
                 log_warning("⚠️ WebSocket connection lost.")
-                break
+                raise
 
     async def send_user_input(self, user_input):
         await self.ws_manager.send_user_input(user_input)
@@ -84,6 +209,15 @@ class SimpleAssistant:
         for prompt in self.prompts:
             await self.send_user_input(prompt)
 
+    async def prompt_loop(self):
+        """Answer prompts one turn at a time, stopping the assistant when they run out."""
+        while (prompt := await self.prompt_source.next_prompt()) is not None:
+            start_time = time.perf_counter()
+            reply = await run_turn(self.ws_manager, self.event_handler, prompt, Config.HEADLESS_TURN_TIMEOUT)
+            log_runtime("headless_turn", time.perf_counter() - start_time)
+            print(f"Assistant: {reply}", flush=True)
+        self.exit_event.set()
+
     async def send_audio_loop(self):
         try:
             while not self.exit_event.is_set():
@@ -124,8 +258,4 @@ class SimpleAssistant:
                     await asyncio.sleep(0.1)  # Wait while receiving assistant response
         except KeyboardInterrupt:
             logger.info("Keyboard interrupt received. Closing the connection.")
-        finally:
             self.exit_event.set()
-            self.mic.stop_recording()
-            self.mic.close()
-            await self.ws_manager.close()
@@ -0,0 +1,78 @@
+import asyncio
+import importlib
+import sys
+import time
+
+# Modules in the order the assistant loads them. The kubernetes package is listed last because
+# it is only imported on first use, during the startup warm-up.
+STARTUP_MODULES = [
+    "kubewhisper.modules.logging",
+    "kubewhisper.modules.config",
+    "kubewhisper.modules.websocket_manager",
+    "kubewhisper.modules.async_microphone",
+    "kubewhisper.modules.audio",
+    "kubewhisper.modules.event_handler",
+    "kubewhisper.modules.kubernetes_tools",
+    "kubewhisper.modules.simple_assistant",
+    "kubernetes",
+]
+
+
+def _top_level_packages(module_names):
+    """Third-party top-level packages among the given module names."""
+    packages = {name.split(".")[0] for name in module_names}
+    return sorted(p for p in packages if p not in sys.stdlib_module_names and not p.startswith(("kubewhisper", "_")))
+
+
+def profile_imports(module_names=STARTUP_MODULES):
+    """Import each module in turn, returning (module, seconds, newly loaded packages) tuples.
+
+    Times are incremental: a module only pays for what earlier modules did not import yet.
+    """
+    timings = []
+    for module_name in module_names:
+        loaded_before = set(sys.modules)
+        start_time = time.perf_counter()
+        importlib.import_module(module_name)
+        duration = time.perf_counter() - start_time
+        timings.append((module_name, duration, _top_level_packages(set(sys.modules) - loaded_before)))
+    return timings
+
+
+async def profile_init(openai_api_key, realtime_api_url):
+    """Construct the assistant and run its startup phase, returning (step, seconds) tuples."""
+    from kubewhisper.modules.simple_assistant import SimpleAssistant
+
+    timings = []
+    start_time = time.perf_counter()
+    assistant = SimpleAssistant(openai_api_key, realtime_api_url)
+    timings.append(("SimpleAssistant()", time.perf_counter() - start_time))
+
+    start_time = time.perf_counter()
+    try:
+        await assistant.startup()
+        for component, duration in assistant.startup_timeline.items():
+            timings.append((f"startup: {component}", duration))
+        timings.append(("startup: total", time.perf_counter() - start_time))
+    finally:
+        assistant.mic.close()
+        await assistant.ws_manager.close()
+    return timings
+
+
+def profile_startup(openai_api_key, realtime_api_url):
+    """Print import and initialization times of the assistant."""
+    start_time = time.perf_counter()
+    import_timings = profile_imports()
+    imports_total = time.perf_counter() - start_time
+
+    print(f"{'Import':<42} {'Time':>10}  New packages")
+    for module_name, duration, packages in import_timings:
+        print(f"{module_name:<42} {duration * 1000:>8.1f}ms  {', '.join(packages)}")
+    print(f"{'imports total':<42} {imports_total * 1000:>8.1f}ms")
+    print()
+
+    init_timings = asyncio.run(profile_init(openai_api_key, realtime_api_url))
+    print(f"{'Init':<42} {'Time':>10}")
+    for step, duration in init_timings:
+        print(f"{step:<42} {duration * 1000:>8.1f}ms")
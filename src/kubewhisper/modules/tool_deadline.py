@@ -0,0 +1,76 @@
+import asyncio
+import inspect
+import time
+from typing import Any, Callable, Dict, Optional
+
+from kubewhisper.modules.config import Config
+from kubewhisper.modules.logging import log_warning
+
+
+class ToolDeadline:
+    """Latency budget for a single tool call.
+
+    Tools that accept a ``deadline`` keyword use it to bound their API requests and to
+    record what they have gathered so far in ``partial``. When the budget runs out the
+    call is cancelled and the partial result is returned with a ``truncated`` flag.
+    """
+
+    # Lower bound for a single API request so the last request still has a chance to finish
+    MIN_REQUEST_TIMEOUT: float = 0.1
+
+    def __init__(self, budget_seconds: float) -> None:
+        self.budget_seconds = budget_seconds
+        self.expires_at = time.monotonic() + budget_seconds
+        self.partial: Dict[str, Any] = {}
+
+    def remaining(self) -> float:
+        """Seconds left before the budget is exhausted."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def request_timeout(self) -> float:
+        """Timeout to pass as ``_request_timeout`` to a Kubernetes API call."""
+        return max(self.MIN_REQUEST_TIMEOUT, self.remaining())
+
+
+def get_tool_budget(function_name: str) -> float:
+    """Returns the latency budget in seconds for the given tool."""
+    return Config.TOOL_TIMEOUTS.get(function_name, Config.DEFAULT_TOOL_TIMEOUT)
+
+
+def accepts_deadline(func: Callable) -> bool:
+    """Returns True if the tool takes a ``deadline`` keyword argument."""
+    try:
+        return "deadline" in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+async def run_with_deadline(
+    function_name: str, func: Callable, args: Dict[str, Any], deadline: Optional[ToolDeadline] = None
+) -> Dict[str, Any]:
+    """Run a tool within its latency budget, returning partial results on timeout.
+
+    A deadline can be passed in to watch the partial result from outside while the tool runs.
+    """
+    budget = get_tool_budget(function_name)
+    if deadline is None:
+        deadline = ToolDeadline(budget)
+    kwargs = dict(args)
+    if accepts_deadline(func):
+        kwargs["deadline"] = deadline
+
+    try:
+        return await asyncio.wait_for(func(**kwargs), timeout=budget)
+    except TimeoutError:
+        log_warning(f"⏱️ {function_name} exceeded its {budget:.1f}s budget, returning partial result")
+        if deadline.partial:
+            return {**deadline.partial, "truncated": True, "timeout_seconds": budget}
+        return {
+            "error": f"'{function_name}' did not finish within {budget:.1f} seconds",
+            "truncated": True,
+            "timeout_seconds": budget,
+        }
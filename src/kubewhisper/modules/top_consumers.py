@@ -0,0 +1,73 @@
+"""Streaming selection of the pods using the most CPU or memory."""
+
+import heapq
+import itertools
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+
+from kubewhisper.modules.quantity import parse_quantities
+
+RESOURCES = ("cpu", "memory")
+
+
+class TopConsumers:
+    """Keeps the count largest pods seen so far, so memory stays bounded however many pods are fed."""
+
+    def __init__(self, resource: str = "memory", count: int = 5):
+        if resource not in RESOURCES:
+            raise ValueError(f"Unknown resource {resource!r}, expected one of {', '.join(RESOURCES)}")
+        self.resource = resource
+        self.count = count
+        self.pods_seen = 0
+        # Min-heap of (usage, tiebreaker, pod), the smallest of the current top is evicted first
+        self._heap = []
+        self._tiebreaker = itertools.count()
+
+    def add_page(self, items: Iterable[Dict[str, Any]]):
+        """Adds one page of metrics.k8s.io PodMetrics items."""
+        items = list(items)
+        if not items:
+            return
+        self.pods_seen += len(items)
+        usage = self._pod_totals(items)
+
+        # Only the page's own top can make it into the overall top
+        candidates = np.arange(len(items))
+        if len(items) > self.count:
+            candidates = np.argpartition(usage, -self.count)[-self.count :]
+        for index in candidates:
+            entry = (float(usage[index]), next(self._tiebreaker), items[index])
+            if len(self._heap) < self.count:
+                heapq.heappush(self._heap, entry)
+            elif entry[0] > self._heap[0][0]:
+                heapq.heapreplace(self._heap, entry)
+
+    def _pod_totals(self, items: List[Dict[str, Any]]) -> np.ndarray:
+        """Sums container usage per pod, parsing all containers of the page at once."""
+        owners, quantities = [], []
+        for index, item in enumerate(items):
+            for container in item.get("containers", []):
+                owners.append(index)
+                quantities.append(container["usage"].get(self.resource, "0"))
+        if not quantities:
+            return np.zeros(len(items))
+        return np.bincount(owners, weights=parse_quantities(quantities), minlength=len(items))
+
+    def results(self) -> List[Dict[str, Any]]:
+        """The selected pods, largest first."""
+        return [
+            {
+                "pod": item["metadata"]["name"],
+                "namespace": item["metadata"].get("namespace"),
+                self.resource: format_usage(self.resource, usage),
+            }
+            for usage, _, item in sorted(self._heap, key=lambda entry: (-entry[0], entry[1]))
+        ]
+
+
+def format_usage(resource: str, value: float) -> str:
+    """Formats usage the way kubectl top does, millicores for CPU and MiB for memory."""
+    if resource == "cpu":
+        return f"{value * 1000:.0f}m"
+    return f"{value / 2**20:.0f}Mi"
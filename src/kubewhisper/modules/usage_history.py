@@ -0,0 +1,171 @@
+"""Recent CPU and memory usage per node and per namespace, kept in fixed-size arrays."""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from kubewhisper.modules.quantity import parse_quantities
+from kubewhisper.modules.top_consumers import format_usage
+
+RESOURCES = ("cpu", "memory")
+SCOPES = ("node", "namespace")
+
+# Changes smaller than this fraction of the average usage count as flat
+FLAT_CHANGE = 0.05
+
+
+class RingBuffer:
+    """The last capacity samples of (cpu, memory) with their timestamps, overwriting the oldest."""
+
+    def __init__(self, capacity: int):
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.values = np.zeros((capacity, len(RESOURCES)), dtype=np.float32)
+        self.size = 0
+        self._next = 0
+
+    def append(self, timestamp: float, values):
+        self.times[self._next] = timestamp
+        self.values[self._next] = values
+        self._next = (self._next + 1) % len(self.times)
+        self.size = min(self.size + 1, len(self.times))
+
+    @property
+    def oldest(self) -> Optional[float]:
+        return self.ordered()[0][0] if self.size else None
+
+    def ordered(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Timestamps and values, oldest first."""
+        if self.size < len(self.times):
+            return self.times[: self.size], self.values[: self.size]
+        order = np.roll(np.arange(len(self.times)), -self._next)
+        return self.times[order], self.values[order]
+
+
+class UsageSeries:
+    """Full resolution samples for the recent past, and averages of every factor samples for longer."""
+
+    def __init__(self, raw_capacity: int, factor: int, coarse_capacity: int):
+        self.raw = RingBuffer(raw_capacity)
+        self.coarse = RingBuffer(coarse_capacity)
+        self.factor = factor
+        self.last_seen = 0.0
+        self._pending_times = 0.0
+        self._pending_values = np.zeros(len(RESOURCES), dtype=np.float64)
+        self._pending_count = 0
+
+    def append(self, timestamp: float, values):
+        self.raw.append(timestamp, values)
+        self.last_seen = timestamp
+        self._pending_times += timestamp
+        self._pending_values += values
+        self._pending_count += 1
+        if self._pending_count == self.factor:
+            self.coarse.append(self._pending_times / self.factor, self._pending_values / self.factor)
+            self._pending_times = 0.0
+            self._pending_values[:] = 0
+            self._pending_count = 0
+
+    def window(self, since: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Samples from since on, at full resolution as far back as the raw buffer reaches and averaged before."""
+        times, values = self.raw.ordered()
+        oldest = self.raw.oldest
+        if oldest is not None and oldest > since and self.coarse.size:
+            # Averages only for the part of the window the raw samples no longer cover
+            coarse_times, coarse_values = self.coarse.ordered()
+            older = (coarse_times >= since) & (coarse_times < oldest)
+            times = np.concatenate((coarse_times[older], times))
+            values = np.concatenate((coarse_values[older], values))
+        keep = times >= since
+        return times[keep], values[keep]
+
+
+class UsageHistory:
+    """Usage series for every node and namespace of one cluster."""
+
+    def __init__(self, raw_capacity: int = 120, factor: int = 10, coarse_capacity: int = 288, interval: float = 30.0):
+        self.raw_capacity = raw_capacity
+        self.factor = factor
+        self.coarse_capacity = coarse_capacity
+        self.interval = interval
+        self.series: Dict[Tuple[str, str], UsageSeries] = {}
+        self.last_sample: Optional[float] = None
+
+    def record(self, timestamp: float, node_metrics: List[Dict[str, Any]], pod_metrics: List[Dict[str, Any]]):
+        """Adds one sample from the items of the metrics.k8s.io node and pod lists."""
+        if node_metrics:
+            cpu = parse_quantities(item["usage"].get("cpu", "0") for item in node_metrics)
+            memory = parse_quantities(item["usage"].get("memory", "0") for item in node_metrics)
+            for item, values in zip(node_metrics, np.column_stack((cpu, memory))):
+                self._series("node", item["metadata"]["name"]).append(timestamp, values)
+
+        # Container usage summed per namespace in one pass
+        namespaces, owners, cpu_quantities, memory_quantities = {}, [], [], []
+        for item in pod_metrics:
+            owner = namespaces.setdefault(item["metadata"].get("namespace", ""), len(namespaces))
+            for container in item.get("containers", []):
+                owners.append(owner)
+                cpu_quantities.append(container["usage"].get("cpu", "0"))
+                memory_quantities.append(container["usage"].get("memory", "0"))
+        if owners:
+            totals = np.column_stack(
+                [
+                    np.bincount(owners, weights=parse_quantities(quantities), minlength=len(namespaces))
+                    for quantities in (cpu_quantities, memory_quantities)
+                ]
+            )
+            for namespace, owner in namespaces.items():
+                self._series("namespace", namespace).append(timestamp, totals[owner])
+
+        self.last_sample = timestamp
+        self._forget_missing(timestamp)
+
+    def _series(self, scope: str, name: str) -> UsageSeries:
+        series = self.series.get((scope, name))
+        if series is None:
+            series = self.series[(scope, name)] = UsageSeries(self.raw_capacity, self.factor, self.coarse_capacity)
+        return series
+
+    def _forget_missing(self, now: float):
+        """Drops nodes and namespaces that have not been seen for as long as the history reaches back."""
+        horizon = now - self.interval * self.factor * self.coarse_capacity
+        for key in [key for key, series in self.series.items() if series.last_seen < horizon]:
+            del self.series[key]
+
+    def trend(self, scope: str, name: str, resource: str, since: float) -> Optional[Dict[str, Any]]:
+        series = self.series.get((scope, name))
+        if series is None:
+            return None
+        times, values = series.window(since)
+        if not len(times):
+            return None
+        usage = values[:, RESOURCES.index(resource)].astype(np.float64)
+        trend = {
+            scope: name,
+            "samples": len(usage),
+            "minutes_covered": round(float(times[-1] - times[0]) / 60, 1),
+            "first": format_usage(resource, usage[0]),
+            "last": format_usage(resource, usage[-1]),
+            "min": format_usage(resource, usage.min()),
+            "max": format_usage(resource, usage.max()),
+            "average": format_usage(resource, usage.mean()),
+        }
+        if len(usage) > 1 and times[-1] > times[0]:
+            # Least squares slope, less sensitive to a single spike than comparing the endpoints
+            slope_per_hour = np.polyfit((times - times[0]) / 3600, usage, 1)[0]
+            hours = (times[-1] - times[0]) / 3600
+            fitted_change = slope_per_hour * hours
+            baseline = max(abs(usage.mean()), 1e-12)
+            trend["change_per_hour"] = format_usage(resource, slope_per_hour)
+            trend["change_percent"] = round(float(fitted_change / baseline * 100), 1)
+            if abs(fitted_change) < FLAT_CHANGE * baseline:
+                trend["direction"] = "flat"
+            else:
+                trend["direction"] = "rising" if fitted_change > 0 else "falling"
+        return trend
+
+    def trends(self, scope: str, resource: str, since: float, limit: int) -> List[Dict[str, Any]]:
+        """Trends of every node or namespace, the fastest growing first."""
+        trends = [self.trend(scope, name, resource, since) for kind, name in self.series if kind == scope]
+        trends = [trend for trend in trends if trend]
+        trends.sort(key=lambda trend: trend.get("change_percent", 0), reverse=True)
+        return trends[:limit]
@@ -1,14 +1,24 @@
 import json
+from collections import deque
 import websockets
+from kubewhisper.modules.config import Config
+from kubewhisper.modules.conversation_window import ConversationWindow
 from kubewhisper.modules.logging import log_info, log_ws_event
+from kubewhisper.modules.metrics import WEBSOCKET_BYTES
+from kubewhisper.modules.result_compactor import compact_result
 from kubewhisper.utils.utils import base64_encode_audio
 
 
 class WebSocketManager:
-    def __init__(self, openai_api_key, realtime_api_url):
+    def __init__(self, openai_api_key, realtime_api_url, trim_conversation=True):
         self.openai_api_key = openai_api_key
         self.realtime_api_url = realtime_api_url
         self.websocket = None
+        # Recent conversation items, replayed into the new session after a reconnect
+        self.conversation_items = deque(maxlen=Config.RECONNECT_REPLAY_ITEMS)
+        # Items the server holds for this session, trimmed after each response when enabled
+        self.conversation_window = ConversationWindow(Config.CONVERSATION_MAX_ITEMS, Config.CONVERSATION_MAX_BYTES)
+        self.trim_conversation = trim_conversation
 
     async def connect(self):
         """Establish WebSocket connection"""
@@ -24,6 +34,8 @@ class WebSocketManager:
             ping_interval=30,
             ping_timeout=10,
         )
+        # A new connection starts a new, empty conversation
+        self.conversation_window.clear()
         log_info("✅ Connected to the server.")
         return self.websocket
 
@@ -37,14 +49,33 @@ class WebSocketManager:
         """Send a message through the WebSocket"""
         if not self.websocket:
             raise ConnectionError("WebSocket not connected")
-        await self.websocket.send(json.dumps(message))
+        data = json.dumps(message)
+        await self.websocket.send(data)
+        WEBSOCKET_BYTES.inc(len(data), direction="sent")
 
     async def receive_message(self):
         """Receive a message from the WebSocket"""
         if not self.websocket:
             raise ConnectionError("WebSocket not connected")
         message = await self.websocket.recv()
-        return json.loads(message)
+        WEBSOCKET_BYTES.inc(len(message), direction="received")
+        event = json.loads(message)
+        event_type = event.get("type")
+        if event_type == "conversation.item.created":
+            self.conversation_window.add(event.get("item", {}))
+        elif event_type == "conversation.item.deleted":
+            self.conversation_window.discard(event.get("item_id"))
+        elif event_type == "response.done" and self.trim_conversation:
+            await self.trim_conversation_window()
+        return event
+
+    async def trim_conversation_window(self):
+        """Delete the oldest conversation items on the server once the window is over budget"""
+        item_ids = self.conversation_window.evictions()
+        for item_id in item_ids:
+            await self.send_message({"type": "conversation.item.delete", "item_id": item_id})
+        if item_ids:
+            log_info(f"✂️ Removed {len(item_ids)} old conversation items.")
 
     async def send_audio_data(self, audio_data):
         """Send audio data through the WebSocket"""
@@ -69,22 +100,45 @@ class WebSocketManager:
             },
         }
         await self.send_message(event)
+        self.remember_item(event["item"])
         await self.send_message({"type": "response.create"})
 
     async def send_function_call_output(self, call_id, output):
         """Send function call output"""
-        function_call_output = {
-            "type": "conversation.item.create",
-            "item": {
-                "type": "function_call_output",
-                "call_id": call_id,
-                "output": json.dumps(output),
-            },
-        }
-        log_ws_event("Outgoing", function_call_output)
-        await self.send_message(function_call_output)
+        await self.send_function_call_outputs([(call_id, output)])
+
+    async def send_function_call_outputs(self, outputs):
+        """Send the outputs of several function calls followed by a single response request"""
+        for call_id, output in outputs:
+            function_call_output = {
+                "type": "conversation.item.create",
+                "item": {
+                    "type": "function_call_output",
+                    "call_id": call_id,
+                    "output": json.dumps(compact_result(output)),
+                },
+            }
+            log_ws_event("Outgoing", function_call_output)
+            await self.send_message(function_call_output)
+            self.remember_item(function_call_output["item"])
         await self.send_message({"type": "response.create"})
 
+    def remember_item(self, item):
+        """Keep a conversation item so it can be restored after a reconnect"""
+        self.conversation_items.append(item)
+
+    async def replay_conversation(self):
+        """Recreate the remembered conversation items in a new session"""
+        call_ids = {item["call_id"] for item in self.conversation_items if item["type"] == "function_call"}
+        replayed = 0
+        for item in self.conversation_items:
+            # An output without its function call would be rejected by the server
+            if item["type"] == "function_call_output" and item["call_id"] not in call_ids:
+                continue
+            await self.send_message({"type": "conversation.item.create", "item": item})
+            replayed += 1
+        log_info(f"🔁 Replayed {replayed} conversation items.")
+
     async def send_error_message(self, error_message):
         """Send error message"""
         error_item = {
@@ -0,0 +1,19 @@
+"""
+Shared fixtures.
+"""
+
+import pytest
+
+from kubewhisper.modules import simple_assistant
+from kubewhisper.modules.config import Config
+
+
+@pytest.fixture
+def no_cluster(monkeypatch):
+    """Keeps an assistant under test away from the kubeconfig and cluster of the machine running the tests."""
+
+    def warm_up():
+        raise RuntimeError("No Kubernetes cluster in tests")
+
+    monkeypatch.setattr(simple_assistant, "kube_warm_up", warm_up)
+    monkeypatch.setattr(Config, "USAGE_SAMPLE_INTERVAL", 0)
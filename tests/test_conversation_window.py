@@ -0,0 +1,61 @@
+"""
+Tests for trimming the server-side conversation to a rolling window.
+"""
+
+import pytest
+
+from kubewhisper.modules.config import Config
+from kubewhisper.modules.conversation_window import ConversationWindow
+from kubewhisper.modules.realtime_stub import RealtimeStub
+from kubewhisper.modules.simple_assistant import SimpleAssistant
+
+
+def message(item_id, text="hi"):
+    return {"id": item_id, "type": "message", "role": "user", "content": [{"type": "input_text", "text": text}]}
+
+
+def test_oldest_items_are_evicted_once_over_the_item_budget():
+    window = ConversationWindow(max_items=3)
+    for index in range(5):
+        window.add(message(f"item_{index}"))
+    assert window.evictions() == ["item_0", "item_1"]
+    assert window.evictions() == []
+    assert len(window) == 3
+
+
+def test_function_calls_are_evicted_with_their_output():
+    window = ConversationWindow(max_items=3)
+    window.add({"id": "call", "type": "function_call", "call_id": "c1", "name": "get_number_of_pods"})
+    window.add(message("user"))
+    window.add({"id": "output", "type": "function_call_output", "call_id": "c1", "output": "{}"})
+    window.add(message("reply"))
+    assert window.evictions() == ["call", "output"]
+    assert len(window) == 2
+
+
+def test_byte_budget_keeps_at_least_the_newest_item():
+    window = ConversationWindow(max_bytes=200)
+    window.add(message("small"))
+    window.add(message("large", "x" * 1000))
+    assert window.evictions() == ["small"]
+    assert window.evictions() == []
+    window.discard("large")
+    assert window.byte_count == 0
+
+
+@pytest.mark.asyncio
+async def test_long_sessions_keep_a_bounded_conversation(no_cluster, monkeypatch, capsys):
+    monkeypatch.setattr(Config, "CONVERSATION_MAX_ITEMS", 4)
+    stub = RealtimeStub()
+    url = await stub.start()
+    try:
+        prompts = [f"Question {index}" for index in range(10)]
+        assistant = SimpleAssistant("test-key", url, headless=True, prompts=prompts)
+        await assistant.run()
+    finally:
+        await stub.close()
+
+    replies = [line for line in capsys.readouterr().out.splitlines() if line.startswith("Assistant:")]
+    assert len(replies) == 10
+    # One more item may be created before the next trim
+    assert stub.largest_conversation <= 5
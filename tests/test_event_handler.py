@@ -0,0 +1,83 @@
+"""
+Tests for running the function calls of a response and sending their outputs.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from kubewhisper.modules.event_handler import EventHandler
+from kubewhisper.modules.headless import NullMicrophone
+from kubewhisper.modules.websocket_manager import WebSocketManager
+
+
+class RecordingWebSocketManager(WebSocketManager):
+    def __init__(self):
+        super().__init__("test-key", "ws://unused")
+        self.sent = []
+
+    async def send_message(self, message):
+        self.sent.append(message)
+
+
+@pytest.mark.asyncio
+async def test_interleaved_function_calls_are_answered_with_one_response():
+    both_started = asyncio.Event()
+    started = []
+
+    async def get_number_of_pods(namespace=None):
+        started.append("pods")
+        if len(started) == 2:
+            both_started.set()
+        # Only finishes once the other call runs too, so the calls must be concurrent
+        await asyncio.wait_for(both_started.wait(), 1)
+        await asyncio.sleep(0.02)
+        return {"pod_count": 3, "namespace": namespace}
+
+    async def get_number_of_nodes():
+        started.append("nodes")
+        if len(started) == 2:
+            both_started.set()
+        await asyncio.wait_for(both_started.wait(), 1)
+        return {"node_count": 2}
+
+    ws_manager = RecordingWebSocketManager()
+    handler = EventHandler(
+        NullMicrophone(),
+        ws_manager,
+        {"get_number_of_pods": get_number_of_pods, "get_number_of_nodes": get_number_of_nodes},
+        echo_text=False,
+    )
+
+    events = [
+        {"type": "response.created"},
+        {
+            "type": "response.output_item.added",
+            "item": {"type": "function_call", "call_id": "a", "name": "get_number_of_pods"},
+        },
+        {
+            "type": "response.output_item.added",
+            "item": {"type": "function_call", "call_id": "b", "name": "get_number_of_nodes"},
+        },
+        {"type": "response.function_call_arguments.delta", "call_id": "a", "delta": '{"names'},
+        {"type": "response.function_call_arguments.delta", "call_id": "b", "delta": "{}"},
+        {"type": "response.function_call_arguments.delta", "call_id": "a", "delta": 'pace": "web"}'},
+        {"type": "response.function_call_arguments.done", "call_id": "b"},
+        {"type": "response.function_call_arguments.done", "call_id": "a"},
+        {"type": "response.done"},
+    ]
+    for event in events:
+        await handler.handle_event(event)
+
+    outputs = {
+        message["item"]["call_id"]: json.loads(message["item"]["output"])
+        for message in ws_manager.sent
+        if message["type"] == "conversation.item.create"
+    }
+    assert outputs == {"a": {"pod_count": 3, "namespace": "web"}, "b": {"node_count": 2}}
+    assert [message["type"] for message in ws_manager.sent].count("response.create") == 1
+    assert ws_manager.sent[-1] == {"type": "response.create"}
+    assert not handler.function_call_tasks
+    # The turn continues with the model's answer to the outputs
+    assert not handler.turn_complete.is_set()
@@ -0,0 +1,46 @@
+"""
+Tests for the G.711 codecs and audio formats.
+"""
+
+import numpy as np
+import pytest
+
+from kubewhisper.modules.audio_format import get_audio_format
+from kubewhisper.modules.g711 import alaw_decode, alaw_encode, ulaw_decode, ulaw_encode
+
+ALL_SAMPLES = np.arange(-32768, 32768, dtype=np.int16)
+
+
+@pytest.mark.parametrize("encode,decode", [(ulaw_encode, ulaw_decode), (alaw_encode, alaw_decode)])
+def test_round_trip_error_is_within_the_segment_step(encode, decode):
+    encoded = encode(ALL_SAMPLES.tobytes())
+    assert len(encoded) == len(ALL_SAMPLES)
+    decoded = np.frombuffer(decode(encoded), dtype=np.int16).astype(np.int32)
+    error = np.abs(decoded - ALL_SAMPLES)
+    # Companding keeps the error relative to the amplitude, about 1/32 of it at most
+    assert np.all(error <= np.maximum(np.abs(ALL_SAMPLES.astype(np.int32)) // 16, 16))
+
+
+def test_known_code_words():
+    silence = np.zeros(2, dtype=np.int16).tobytes()
+    assert ulaw_encode(silence) == b"\xff\xff"
+    assert alaw_encode(silence) == b"\xd5\xd5"
+    extremes = np.array([32767, -32768], dtype=np.int16).tobytes()
+    assert ulaw_encode(extremes) == b"\x80\x00"
+    assert alaw_encode(extremes) == b"\xaa\x2a"
+    assert np.frombuffer(ulaw_decode(b"\xff\x7f"), dtype=np.int16).tolist() == [0, 0]
+
+
+def test_g711_formats_play_back_at_24khz():
+    audio_format = get_audio_format("g711_ulaw")
+    assert audio_format.sample_rate == 8000
+    tone = (np.sin(2 * np.pi * 440 * np.arange(8000) / 8000) * 10000).astype(np.int16)
+    playback = audio_format.to_playback(audio_format.encode(tone.tobytes()))
+    assert abs(len(playback) // 2 - 24000) <= 1
+
+
+def test_pcm16_is_passed_through_and_unknown_formats_are_rejected():
+    audio = b"\x01\x02\x03\x04"
+    assert get_audio_format("pcm16").encode(audio) is audio
+    with pytest.raises(ValueError):
+        get_audio_format("opus")
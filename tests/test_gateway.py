@@ -0,0 +1,123 @@
+"""
+Tests for gateway mode and the result cache shared by its clients.
+"""
+
+import asyncio
+
+import pytest
+
+from kubewhisper.modules import kube_client
+from kubewhisper.modules.config import Config
+from kubewhisper.modules.gateway import Gateway, is_tool_call_event
+from kubewhisper.modules.load_generator import run_load
+from kubewhisper.modules.realtime_stub import RealtimeStub
+from kubewhisper.modules.result_cache import ResultCache, cached_function_map
+from kubewhisper.modules.tool_deadline import run_with_deadline
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    cache = ResultCache(ttl=60)
+    calls = []
+
+    async def list_pods():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"pod_count": 3}
+
+    results = await asyncio.gather(*(cache.get_or_run("pods", list_pods) for _ in range(5)))
+    assert results == [{"pod_count": 3}] * 5
+    assert await cache.get_or_run("pods", list_pods) == {"pod_count": 3}
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (5, 1)
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached():
+    cache = ResultCache(ttl=60)
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        return {"error": "API server unavailable"}
+
+    await cache.get_or_run("pods", failing)
+    await cache.get_or_run("pods", failing)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_keys_include_arguments_and_session_context():
+    calls = []
+
+    async def count_pods(namespace="default"):
+        calls.append((kube_client.get_active_context(), namespace))
+        return {"pod_count": len(calls)}
+
+    tools = cached_function_map({"count_pods": count_pods}, ResultCache(ttl=60))
+
+    async def session(context, namespace):
+        kube_client.start_session()
+        kube_client.set_active_context(context)
+        return await tools["count_pods"](namespace=namespace)
+
+    await asyncio.gather(session("prod", "default"), session("prod", "default"), session("staging", "default"))
+    await asyncio.create_task(session("prod", "kube-system"))
+    assert sorted(calls) == [("prod", "default"), ("prod", "kube-system"), ("staging", "default")]
+    assert kube_client.get_active_context() is None
+
+
+def test_tool_call_events_are_hidden_from_clients():
+    assert is_tool_call_event({"type": "response.function_call_arguments.done"})
+    assert is_tool_call_event({"type": "response.output_item.added", "item": {"type": "function_call"}})
+    assert not is_tool_call_event({"type": "response.output_item.added", "item": {"type": "message"}})
+    assert is_tool_call_event({"type": "response.done", "response": {"output": [{"type": "function_call"}]}})
+    assert not is_tool_call_event({"type": "response.done", "response": {"output": [{"type": "message"}]}})
+
+
+@pytest.mark.asyncio
+async def test_gateway_answers_tool_calls_for_all_clients(monkeypatch):
+    monkeypatch.setattr(Config, "GATEWAY_CACHE_TTL", 60)
+    calls = []
+
+    async def count_pods():
+        calls.append(1)
+        return {"pod_count": 3}
+
+    stub = RealtimeStub(tool_calls=["count_pods"])
+    upstream_url = await stub.start()
+    tools = [{"type": "function", "name": "count_pods", "parameters": {"type": "object", "properties": {}}}]
+    gateway = Gateway("test-key", upstream_url, {"count_pods": count_pods}, tools, port=0)
+    gateway_url = await gateway.start()
+    try:
+        # The clients have no tools of their own, every call is answered by the gateway
+        summary = await run_load(sessions=3, turns=2, url=gateway_url, function_map={}, tools=[])
+    finally:
+        await gateway.close()
+        await stub.close()
+
+    assert summary["turns"] == 6
+    assert summary["errors"] == 0
+    assert len(calls) == 1
+    assert stub.sessions == 3
+
+
+@pytest.mark.asyncio
+async def test_callers_whose_budget_runs_out_get_the_shared_partial_result(monkeypatch):
+    monkeypatch.setitem(Config.TOOL_TIMEOUTS, "cluster_status", 0.1)
+
+    async def cluster_status(deadline):
+        deadline.partial = {"cluster_health": {"total_nodes": 3}}
+        await asyncio.sleep(1)
+        return {"cluster_health": {"total_nodes": 3}, "status_summary": "All Systems Normal"}
+
+    tools = cached_function_map({"cluster_status": cluster_status}, ResultCache(ttl=60))
+
+    # Both callers time out on their own budget before the shared call's, which started last
+    results = await asyncio.gather(
+        *(run_with_deadline("cluster_status", tools["cluster_status"], {}) for _ in range(2))
+    )
+    for result in results:
+        assert result["cluster_health"] == {"total_nodes": 3}
+        assert result["truncated"] is True
+        assert "error" not in result
@@ -0,0 +1,70 @@
+"""
+Tests for headless sessions against the local Realtime stand-in server.
+"""
+
+import pytest
+
+from kubewhisper.modules import simple_assistant
+from kubewhisper.modules.config import Config
+from kubewhisper.modules.load_generator import run_load, summarize_turns
+from kubewhisper.modules.realtime_stub import RealtimeStub
+from kubewhisper.modules.simple_assistant import SimpleAssistant
+
+
+@pytest.mark.asyncio
+async def test_load_generator_completes_every_turn_with_tool_calls():
+    calls = []
+
+    async def count_pods():
+        calls.append(1)
+        return {"pod_count": 3}
+
+    tools = [{"type": "function", "name": "count_pods", "parameters": {"type": "object", "properties": {}}}]
+    summary = await run_load(
+        sessions=3, turns=4, tool_calls=["count_pods"], function_map={"count_pods": count_pods}, tools=tools
+    )
+
+    assert summary["turns"] == 12
+    assert summary["errors"] == 0
+    assert len(calls) == 12
+    assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"]
+
+
+@pytest.mark.asyncio
+async def test_headless_assistant_answers_prompts_and_exits(no_cluster, capsys):
+    stub = RealtimeStub()
+    url = await stub.start()
+    try:
+        assistant = SimpleAssistant("test-key", url, headless=True, prompts=["How many pods?", "And nodes?"])
+        assert assistant.session_config.config["modalities"] == ["text"]
+        await assistant.run()
+    finally:
+        await stub.close()
+
+    replies = [line for line in capsys.readouterr().out.splitlines() if line.startswith("Assistant:")]
+    assert replies == ["Assistant: Done: How many pods?", "Assistant: Done: And nodes?"]
+
+
+@pytest.mark.asyncio
+async def test_gateway_clients_leave_the_clusters_to_the_gateway(monkeypatch, capsys):
+    warm_ups = []
+    monkeypatch.setattr(simple_assistant, "kube_warm_up", lambda: warm_ups.append(1))
+    monkeypatch.setattr(Config, "USAGE_SAMPLE_INTERVAL", 30)
+    stub = RealtimeStub()
+    url = await stub.start()
+    try:
+        assistant = SimpleAssistant("test-key", url, headless=True, prompts=["How many pods?"], gateway_client=True)
+        await assistant.run()
+    finally:
+        await stub.close()
+
+    assert warm_ups == []
+    assert assistant.usage_sampler is None
+    assert "kubernetes" not in assistant.startup_timeline
+
+
+def test_summarize_turns():
+    summary = summarize_turns([0.1, 0.2, 0.3, 0.4], elapsed=2.0, errors=["timeout"])
+    assert summary["turns_per_second"] == 2.0
+    assert summary["errors"] == 1
+    assert summary["p50_ms"] == 250.0
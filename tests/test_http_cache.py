@@ -0,0 +1,77 @@
+"""
+Tests for the conditional-request HTTP cache, run against a local stand-in for the GitHub API.
+"""
+
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from kubewhisper.modules import http_cache
+from kubewhisper.modules.config import Config
+from kubewhisper.modules.kubernetes_tools import get_kubernetes_latest_version_information
+
+RELEASES = [
+    {"tag_name": "v1.33.0-rc.1", "prerelease": True, "draft": False, "published_at": "2025-04-10", "html_url": "rc"},
+    {"tag_name": "v1.32.3", "prerelease": False, "draft": False, "published_at": "2025-03-11", "html_url": "ga"},
+]
+ETAG = '"releases-v1"'
+
+
+@pytest_asyncio.fixture
+async def github(tmp_path, monkeypatch):
+    requests = []
+
+    async def releases(request):
+        requests.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == ETAG:
+            return web.Response(status=304)
+        return web.Response(text=json.dumps(RELEASES), content_type="application/json", headers={"ETag": ETAG})
+
+    app = web.Application()
+    app.router.add_get("/repos/kubernetes/kubernetes/releases", releases)
+    server = TestServer(app)
+    await server.start_server()
+    monkeypatch.setattr(Config, "GITHUB_API_URL", str(server.make_url("")))
+    monkeypatch.setattr(Config, "HTTP_CACHE_DIR", str(tmp_path))
+    yield requests
+    await http_cache.close_http_session()
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_fresh_cache_answers_without_a_request(github):
+    first = await get_kubernetes_latest_version_information()
+    second = await get_kubernetes_latest_version_information()
+
+    assert first["latest_stable_version"] == second["latest_stable_version"] == "1.32.3"
+    assert (first["source"], second["source"]) == ("network", "fresh")
+    assert github == [None]
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_revalidated_with_etag(github, monkeypatch):
+    await get_kubernetes_latest_version_information()
+    monkeypatch.setattr(Config, "HTTP_CACHE_MAX_AGE", 0)
+
+    url = f"{Config.GITHUB_API_URL.rstrip('/')}/repos/kubernetes/kubernetes/releases"
+    body, source = await http_cache.fetch_json(url, stale_while_revalidate=False)
+
+    assert body == RELEASES
+    assert source == "network"
+    assert github == [None, ETAG]
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_returned_immediately_and_refreshed_in_background(github, monkeypatch):
+    await get_kubernetes_latest_version_information()
+    monkeypatch.setattr(Config, "HTTP_CACHE_MAX_AGE", 0)
+
+    result = await get_kubernetes_latest_version_information()
+    assert result["source"] == "stale"
+
+    await asyncio.gather(*http_cache._revalidations.values())
+    assert github == [None, ETAG]
@@ -0,0 +1,97 @@
+"""
+Tests for the shared Kubernetes client helpers.
+"""
+
+import gzip
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import yaml
+from kubernetes import client
+
+from kubewhisper.modules import kube_client
+from kubewhisper.modules.kube_client import get_api_client, list_json, persist_current_context, prebuild_api_clients
+from kubewhisper.modules.kubeconfig_index import KubeconfigIndex
+
+
+def test_persist_current_context_replaces_kubeconfig_atomically(tmp_path):
+    kubeconfig = tmp_path / "config"
+    kubeconfig.write_text(yaml.safe_dump({"current-context": "dev", "contexts": [{"name": "dev"}, {"name": "prod"}]}))
+    os.chmod(kubeconfig, 0o600)
+
+    persist_current_context("prod", str(kubeconfig))
+
+    assert yaml.safe_load(kubeconfig.read_text())["current-context"] == "prod"
+    assert os.stat(kubeconfig).st_mode & 0o777 == 0o600
+    assert [path.name for path in tmp_path.iterdir()] == ["config"]
+
+
+def test_switching_clusters_keeps_the_prebuilt_clients(monkeypatch, tmp_path):
+    kubeconfig = tmp_path / "config"
+
+    def write(prod_server):
+        servers = {"dev": "https://dev:6443", "prod": prod_server}
+        kube_config = {
+            "clusters": [{"name": name, "cluster": {"server": server}} for name, server in servers.items()],
+            "contexts": [{"name": name, "context": {"cluster": name, "user": "admin"}} for name in servers],
+            "users": [{"name": "admin", "user": {"token": "secret"}}],
+            "current-context": "dev",
+        }
+        kubeconfig.write_text(yaml.safe_dump(kube_config))
+
+    write("https://prod:6443")
+    index = KubeconfigIndex([str(kubeconfig)])
+    monkeypatch.setattr(kube_client, "get_kubeconfig_index", index.refresh)
+    monkeypatch.setattr(kube_client, "_api_clients", {})
+    monkeypatch.setattr(kube_client, "_api_client_sources", {})
+    monkeypatch.setattr(kube_client, "_api_clients_generation", 0)
+
+    prebuild_api_clients()
+    dev, prod = get_api_client("dev"), get_api_client("prod")
+    generation = index.generation
+
+    persist_current_context("prod", str(kubeconfig))
+    assert get_api_client("dev") is dev
+    assert get_api_client("prod") is prod
+    assert index.generation > generation
+
+    # Only the client of the context whose entries changed is rebuilt
+    write("https://prod-new:6443")
+    os.utime(kubeconfig, ns=(0, os.stat(kubeconfig).st_mtime_ns + 1))
+    assert get_api_client("dev") is dev
+    assert get_api_client("prod") is not prod
+    assert get_api_client("prod").configuration.host == "https://prod-new:6443"
+
+
+def test_list_json_reads_gzip_compressed_lists():
+    body = json.dumps({"kind": "PodList", "items": [{"metadata": {"name": f"pod-{i}"}} for i in range(100)]}).encode()
+    accepted_encodings = []
+
+    class PodListHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            accepted_encodings.append(self.headers.get("Accept-Encoding"))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Encoding", "gzip")
+            compressed = gzip.compress(body)
+            self.send_header("Content-Length", str(len(compressed)))
+            self.end_headers()
+            self.wfile.write(compressed)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), PodListHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        api_client = client.ApiClient(client.Configuration(host=f"http://127.0.0.1:{server.server_port}"))
+        api_client.set_default_header("Accept-Encoding", "gzip")
+        pods = list_json(client.CoreV1Api(api_client).list_pod_for_all_namespaces)
+    finally:
+        server.shutdown()
+
+    assert accepted_encodings == ["gzip"]
+    assert [pod["metadata"]["name"] for pod in pods["items"]][:2] == ["pod-0", "pod-1"]
+    assert len(pods["items"]) == 100
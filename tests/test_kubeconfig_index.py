@@ -0,0 +1,56 @@
+"""
+Tests for the parsed kubeconfig index.
+"""
+
+import os
+
+import yaml
+
+from kubewhisper.modules.kubeconfig_index import KubeconfigIndex, get_kubeconfig_paths
+
+
+def _write_kubeconfig(path, contexts, current_context=None):
+    kube_config = {
+        "clusters": [{"name": cluster, "cluster": {"server": f"https://{cluster}"}} for _, cluster in contexts],
+        "contexts": [{"name": name, "context": {"cluster": cluster, "user": "admin"}} for name, cluster in contexts],
+        "users": [{"name": "admin", "user": {"token": "secret", "client-key": "keys/admin.key"}}],
+    }
+    if current_context:
+        kube_config["current-context"] = current_context
+    path.write_text(yaml.safe_dump(kube_config))
+
+
+def test_kubeconfig_paths_follow_kubeconfig_variable(monkeypatch, tmp_path):
+    monkeypatch.setenv("KUBECONFIG", os.pathsep.join([str(tmp_path / "a"), "", str(tmp_path / "b")]))
+    assert get_kubeconfig_paths() == [str(tmp_path / "a"), str(tmp_path / "b")]
+
+
+def test_files_are_merged_with_first_file_winning(tmp_path):
+    first, second = tmp_path / "first", tmp_path / "second"
+    _write_kubeconfig(first, [("dev", "dev-cluster")])
+    _write_kubeconfig(second, [("dev", "other-cluster"), ("prod", "prod-cluster")], current_context="prod")
+
+    index = KubeconfigIndex([str(first), str(second)]).refresh()
+
+    assert list(index.contexts_by_name) == ["dev", "prod"]
+    assert index.find_context("dev")["context"]["cluster"] == "dev-cluster"
+    assert index.find_context("prod-cluster")["name"] == "prod"
+    assert index.current_context_name == "prod"
+    assert index.current_context_file == str(second)
+    assert index.config["users"][0]["user"]["client-key"] == str(tmp_path / "keys" / "admin.key")
+
+
+def test_index_reloads_only_when_a_file_changes(tmp_path):
+    kubeconfig = tmp_path / "config"
+    _write_kubeconfig(kubeconfig, [("dev", "dev-cluster")], current_context="dev")
+    index = KubeconfigIndex([str(kubeconfig)]).refresh()
+    generation = index.generation
+
+    assert index.refresh().generation == generation
+
+    _write_kubeconfig(kubeconfig, [("dev", "dev-cluster"), ("prod", "prod-cluster")], current_context="dev")
+    stat = os.stat(kubeconfig)
+    os.utime(kubeconfig, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert index.refresh().generation == generation + 1
+    assert "prod" in index.contexts_by_name
@@ -0,0 +1,177 @@
+"""
+Tests for incremental log analysis.
+"""
+
+import asyncio
+import datetime
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from kubewhisper.modules import kubernetes_tools
+from kubewhisper.modules.config import Config
+from kubewhisper.modules.log_analyzer import (
+    DeploymentLogState,
+    LogAnalyzer,
+    classify_batch,
+    classify_line,
+    classify_lines,
+    parse_log_line,
+)
+
+NOW = datetime.datetime(2025, 1, 1, 12, 0, tzinfo=datetime.timezone.utc)
+
+
+def log(*lines):
+    return "\n".join(f"{(NOW - datetime.timedelta(minutes=ago)).isoformat()} {message}" for ago, message in lines)
+
+
+async def ingest(state, pod, container, logs, now):
+    """Reads and classifies logs the way analyze_deployment_logs does."""
+    batch = state.select_new(pod, container, logs, now)
+    return state.record(batch, await classify_batch(batch.lines))
+
+
+def test_parse_log_line_with_nanoseconds():
+    timestamp, text = parse_log_line("2025-01-01T11:59:58.123456789Z Connection refused")
+    assert timestamp == datetime.datetime(2025, 1, 1, 11, 59, 58, 123456, tzinfo=datetime.timezone.utc)
+    assert text == "2025-01-01T11:59:58.123456789Z"
+    assert parse_log_line("not a timestamp") is None
+
+
+def test_classify_line():
+    assert classify_line("FATAL: connection refused") == ["critical", "connection"]
+    assert classify_line("all good") == []
+
+
+@pytest.mark.asyncio
+async def test_lines_already_read_are_not_counted_again():
+    state = DeploymentLogState()
+    first = log((90, "error: too old"), (10, "error: disk full"), (1, "warning: slow"))
+    assert await ingest(state, "pod", "app", first, NOW) == {"exception": 1, "disk": 1, "warning": 1}
+
+    # The next read overlaps with the last line, as since_seconds is rounded up
+    later = NOW + datetime.timedelta(minutes=2)
+    second = first + "\n" + f"{later.isoformat()} request timed out"
+    assert await ingest(state, "pod", "app", second, later) == {"timeout": 1}
+
+    result = state.result(later, 1, {"timeout": 1})
+    assert result["summary"]["total_errors"] == 4
+    assert result["summary"]["new_since_last_check"] == {"total": 1, "error_types": {"timeout": 1}}
+    assert [e["age_minutes"] for e in result["detailed_errors"]["disk"]] == [12.0]
+
+
+@pytest.mark.asyncio
+async def test_counts_roll_off_after_the_window():
+    state = DeploymentLogState(window_minutes=60)
+    await ingest(state, "pod", "app", log((50, "error"), (5, "error")), NOW)
+    state.prune(NOW + datetime.timedelta(minutes=20))
+    assert state.counts() == {"exception": 1}
+    assert len(state.recent["exception"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_cursor_since_seconds_and_forgotten_pods():
+    state = DeploymentLogState()
+    await ingest(state, "pod", "app", log((2, "started")), NOW)
+    assert state.cursor("pod", "app").since_seconds(NOW) == 121
+    state.forget_missing(set())
+    assert state.cursors == {}
+
+
+def test_analyzer_keeps_recent_deployments():
+    analyzer = LogAnalyzer(max_deployments=2)
+    first = analyzer.state("ctx", "default", "a")
+    analyzer.state("ctx", "default", "b")
+    assert analyzer.state("ctx", "default", "a") is first
+    analyzer.state("ctx", "default", "c")
+    assert set(analyzer._states) == {("ctx", "default", "a"), ("ctx", "default", "c")}
+
+
+@pytest.mark.asyncio
+async def test_parallel_classification_matches_serial():
+    rng = random.Random(3)
+    messages = ["all good", "ERROR: failed", "connection reset", "warn: disk full", "panic: timeout", "forbidden"]
+    lines = [f"{i} {rng.choice(messages)}" for i in range(1200)]
+
+    pool = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        parallel = await classify_batch(lines, pool, chunk_lines=100, min_parallel_lines=10)
+    finally:
+        pool.shutdown()
+    assert parallel == classify_lines(lines)
+    assert await classify_batch(lines) == classify_lines(lines)
+
+
+@pytest.fixture
+def cluster(monkeypatch):
+    """Three pods of one deployment with five error lines each."""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    logs = {
+        f"pod-{index}": "\n".join(
+            f"{(now - datetime.timedelta(minutes=minute)).isoformat()} error {index}-{minute}" for minute in range(5)
+        )
+        for index in range(3)
+    }
+    pods = [
+        SimpleNamespace(
+            metadata=SimpleNamespace(name=name), spec=SimpleNamespace(containers=[SimpleNamespace(name="app")])
+        )
+        for name in logs
+    ]
+
+    class Apps:
+        def read_namespaced_deployment(self, name, namespace, **kwargs):
+            return SimpleNamespace(spec=SimpleNamespace(selector=SimpleNamespace(match_labels={"app": name})))
+
+    class Core:
+        def list_namespaced_pod(self, namespace, label_selector, **kwargs):
+            return SimpleNamespace(items=pods)
+
+        def read_namespaced_pod_log(self, name, **kwargs):
+            return logs[name]
+
+    analyzer = LogAnalyzer()
+    monkeypatch.setattr(kubernetes_tools, "apps_v1_api", lambda context: Apps())
+    monkeypatch.setattr(kubernetes_tools, "core_v1_api", lambda context: Core())
+    monkeypatch.setattr(kubernetes_tools, "log_analyzer", analyzer)
+    monkeypatch.setattr(Config, "LOG_CLASSIFY_WORKERS", 0)
+    return analyzer
+
+
+@pytest.mark.asyncio
+async def test_lines_of_a_cancelled_analysis_are_counted_next_time(cluster, monkeypatch):
+    stall = asyncio.Event()
+    real_classify_batch = kubernetes_tools.classify_batch
+
+    async def classify_batch_stalling_on_the_last_pod(lines, *args, **kwargs):
+        if not stall.is_set() and any(line.endswith("error 2-0") for line in lines):
+            await asyncio.sleep(60)
+        return await real_classify_batch(lines, *args, **kwargs)
+
+    monkeypatch.setattr(kubernetes_tools, "classify_batch", classify_batch_stalling_on_the_last_pod)
+
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(kubernetes_tools.analyze_deployment_logs("web", context="ctx"), timeout=0.5)
+
+    stall.set()
+    result = await kubernetes_tools.analyze_deployment_logs("web", context="ctx")
+    assert result["summary"]["total_errors"] == 15
+
+
+@pytest.mark.asyncio
+async def test_log_state_is_kept_per_context_name(cluster, monkeypatch):
+    monkeypatch.setattr(kubernetes_tools, "get_active_context", lambda: None)
+    monkeypatch.setattr(
+        kubernetes_tools, "get_kubeconfig_index", lambda: SimpleNamespace(current_context_name="kind-dev")
+    )
+
+    await kubernetes_tools.analyze_deployment_logs("web")
+    result = await kubernetes_tools.analyze_deployment_logs("web", context="kind-dev")
+
+    # Both calls read the same cluster, so the second one finds nothing new
+    assert result["summary"]["new_since_last_check"]["total"] == 0
+    assert list(cluster._states) == [("kind-dev", "default", "web")]
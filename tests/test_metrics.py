@@ -0,0 +1,66 @@
+"""
+Tests for the in-process metrics and their HTTP endpoint.
+"""
+
+import socket
+
+import aiohttp
+import pytest
+
+from kubewhisper.modules.metrics import Counter, Gauge, Histogram, render_metrics, start_metrics_server
+
+
+def test_counter_renders_per_label_set():
+    counter = Counter("test_requests_total", "Requests.", ["result"])
+    counter.inc(result="hit")
+    counter.inc(2, result="miss")
+    counter.inc(result="hit")
+
+    assert counter.value(result="hit") == 2
+    rendered = counter.render()
+    assert "# TYPE test_requests_total counter" in rendered
+    assert 'test_requests_total{result="hit"} 2' in rendered
+    assert 'test_requests_total{result="miss"} 2' in rendered
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    rendered = histogram.render()
+    assert 'test_latency_seconds_bucket{le="0.1"} 2' in rendered
+    assert 'test_latency_seconds_bucket{le="1.0"} 3' in rendered
+    assert 'test_latency_seconds_bucket{le="+Inf"} 4' in rendered
+    assert "test_latency_seconds_sum 3.65" in rendered
+    assert "test_latency_seconds_count 4" in rendered
+
+
+def test_gauge_reads_function_when_rendered():
+    depth = [3]
+    gauge = Gauge("test_queue_depth", "Queue depth.")
+    gauge.set_function(lambda: depth[0])
+    assert "test_queue_depth 3" in gauge.render()
+    depth[0] = 7
+    assert "test_queue_depth 7" in gauge.render()
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_serves_registered_metrics():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    Counter("test_endpoint_total", "Endpoint test.").inc()
+
+    runner = await start_metrics_server(port)
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"http://127.0.0.1:{port}/metrics") as response:
+                assert response.status == 200
+                body = await response.text()
+    finally:
+        await runner.cleanup()
+
+    assert "test_endpoint_total 1" in body
+    assert "# TYPE kubewhisper_turn_seconds histogram" in body
+    assert body == render_metrics()
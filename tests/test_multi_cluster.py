@@ -0,0 +1,101 @@
+"""
+Tests for querying several clusters concurrently.
+"""
+
+import asyncio
+
+import pytest
+
+from kubewhisper.modules import multi_cluster
+from kubewhisper.modules.config import Config
+from kubewhisper.modules.multi_cluster import for_clusters
+from kubewhisper.modules.tool_deadline import ToolDeadline, accepts_deadline, run_with_deadline
+
+
+@pytest.fixture
+def contexts(monkeypatch):
+    resolved = {"prod": "prod-context", "staging": "staging-context", "slow": "slow-context", "unknown": None}
+    monkeypatch.setattr(multi_cluster, "resolve_contexts", lambda clusters: resolved)
+    monkeypatch.setattr(Config, "CLUSTER_QUERY_TIMEOUT", 0.1)
+
+
+async def count_pods(context=None):
+    if context == "slow-context":
+        await asyncio.sleep(1)
+    return {"pod_count": {"prod-context": 10, "staging-context": 3}.get(context, 1)}
+
+
+@pytest.mark.asyncio
+async def test_without_clusters_only_the_current_cluster_is_queried():
+    assert await for_clusters(count_pods)() == {"pod_count": 1}
+
+
+@pytest.mark.asyncio
+async def test_results_are_merged_with_per_cluster_errors(contexts):
+    result = await for_clusters(count_pods)(clusters="all")
+
+    assert result["clusters"]["prod"] == {"pod_count": 10}
+    assert result["totals"] == {"pod_count": 13}
+    assert "Timed out" in result["errors"]["slow"]
+    assert "not found" in result["errors"]["unknown"]
+    assert result["clusters_queried"] == 4
+
+
+def test_wrapper_keeps_the_tool_name_and_accepts_a_deadline():
+    wrapper = for_clusters(count_pods)
+
+    assert wrapper.__name__ == "count_pods"
+    assert wrapper.__wrapped__ is count_pods
+    assert accepts_deadline(wrapper)
+
+
+@pytest.mark.asyncio
+async def test_clusters_are_not_queried_once_the_deadline_is_spent(contexts):
+    calls = []
+
+    async def tool(context=None):
+        calls.append(context)
+        return {"pod_count": 1}
+
+    result = await for_clusters(tool)(clusters="all", deadline=ToolDeadline(0))
+
+    assert "No time left" in result["error"]
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_slow_clusters_time_out_within_a_short_tool_budget(monkeypatch):
+    monkeypatch.setattr(multi_cluster, "resolve_contexts", lambda clusters: {"prod": "prod-context", "slow": "slow"})
+    monkeypatch.setitem(Config.TOOL_TIMEOUTS, "count_pods", 1.0)
+
+    async def count_pods(context=None):
+        if context == "slow":
+            await asyncio.sleep(5)
+        return {"pod_count": 10}
+
+    result = await run_with_deadline("count_pods", for_clusters(count_pods), {"clusters": "all"})
+
+    assert result["clusters"] == {"prod": {"pod_count": 10}}
+    assert "Timed out" in result["errors"]["slow"]
+    assert result["clusters_queried"] == 2
+
+
+@pytest.mark.asyncio
+async def test_pending_clusters_are_in_the_partial_result_as_timed_out(monkeypatch):
+    monkeypatch.setattr(multi_cluster, "resolve_contexts", lambda clusters: {"prod": "prod-context", "slow": "slow"})
+    deadline = ToolDeadline(5)
+
+    async def count_pods(context=None):
+        if context == "slow":
+            await asyncio.sleep(5)
+        return {"pod_count": 10}
+
+    task = asyncio.create_task(for_clusters(count_pods)(clusters="all", deadline=deadline))
+    await asyncio.sleep(0.1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert deadline.partial["clusters"] == {"prod": {"pod_count": 10}}
+    assert "Timed out" in deadline.partial["errors"]["slow"]
+    assert deadline.partial["clusters_queried"] == 2
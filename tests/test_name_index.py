@@ -0,0 +1,41 @@
+"""
+Tests for the fuzzy resource name index.
+"""
+
+from kubewhisper.modules.name_index import NameIndex, normalize
+
+
+def index_with(*names, kind="deployment"):
+    index = NameIndex()
+    index.replace(kind, names)
+    return index
+
+
+def test_spoken_names_normalize_like_resource_names():
+    assert normalize("payment service") == normalize("payments-svc")
+    assert normalize("Postgres Primary") == normalize("postgres_primary")
+    assert normalize("worker two") == normalize("worker-2")
+
+
+def test_best_match_finds_the_closest_name():
+    index = index_with(("shop", "payments-svc"), ("shop", "payment-gateway"), ("db", "postgres-primary"))
+    match = index.best_match("payment service", "deployment")
+    assert (match.namespace, match.name, match.score) == ("shop", "payments-svc", 1.0)
+    assert index.best_match("postgres", "deployment").name == "postgres-primary"
+    assert index.best_match("frontend", "deployment") is None
+
+
+def test_equal_scores_prefer_the_requested_namespace():
+    index = index_with(("staging", "web"), ("prod", "web"))
+    assert index.best_match("web", "deployment", namespace="prod").namespace == "prod"
+    assert index.best_match("web", "deployment", namespace="staging").namespace == "staging"
+
+
+def test_replace_only_applies_changes_and_keeps_kinds_apart():
+    index = index_with(("default", "api"), ("default", "worker"))
+    index.replace("service", [("default", "api-svc")])
+    assert index.replace("deployment", [("default", "api"), ("default", "scheduler")]) == (1, 1)
+    assert len(index) == 3
+    assert index.best_match("worker", "deployment") is None
+    assert index.best_match("api service", "service").name == "api-svc"
+    assert index.best_match("scheduler", "deployment").name == "scheduler"
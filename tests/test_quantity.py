@@ -0,0 +1,69 @@
+"""
+Tests for Kubernetes quantity parsing and node usage aggregation.
+"""
+
+import numpy as np
+import pytest
+
+from kubewhisper.modules.node_usage import summarize_node_usage
+from kubewhisper.modules.quantity import parse_quantities, parse_quantity
+
+QUANTITIES = {
+    "250m": 0.25,
+    "2": 2.0,
+    "1500000n": 0.0015,
+    "300u": 0.0003,
+    "1.5Gi": 1.5 * 2**30,
+    "128974848": 128974848.0,
+    "129e6": 129e6,
+    "123Mi": 123 * 2**20,
+    "16318536Ki": 16318536 * 2**10,
+    "1k": 1000.0,
+    "2M": 2e6,
+    "3G": 3e9,
+    "1T": 1e12,
+    "1P": 1e15,
+    "2E": 2e18,
+    "1Ei": 2.0**60,
+    ".5": 0.5,
+}
+
+
+@pytest.mark.parametrize("quantity,expected", QUANTITIES.items())
+def test_parse_quantity(quantity, expected):
+    assert parse_quantity(quantity) == pytest.approx(expected)
+
+
+def test_parse_quantities_matches_single_parsing():
+    parsed = parse_quantities(QUANTITIES)
+    np.testing.assert_allclose(parsed, [QUANTITIES[q] for q in QUANTITIES])
+
+
+@pytest.mark.parametrize("quantity", ["", "Mi", "1.2.3", "5X"])
+def test_invalid_quantities_are_rejected(quantity):
+    with pytest.raises(ValueError):
+        parse_quantity(quantity)
+    with pytest.raises(ValueError):
+        parse_quantities([quantity])
+
+
+def test_summarize_node_usage():
+    nodes = [{"name": f"node-{i}", "cpu": "4", "memory": "8Gi"} for i in range(4)]
+    metrics = [
+        {"metadata": {"name": "node-0"}, "usage": {"cpu": "1000m", "memory": "2Gi"}},
+        {"metadata": {"name": "node-1"}, "usage": {"cpu": "3900000000n", "memory": "4Gi"}},
+        {"metadata": {"name": "node-2"}, "usage": {"cpu": "1", "memory": "2097152Ki"}},
+    ]
+    summary = summarize_node_usage(nodes, metrics)
+
+    assert summary["nodes_with_metrics"] == 3
+    assert summary["cpu_cores"] == {"used": 5.9, "allocatable": 12.0}
+    assert summary["avg_cpu_usage"] == "49.2%"
+    assert summary["avg_memory_usage"] == "2.7GB"
+    assert summary["node_utilization"][0] == {"node": "node-1", "cpu": "97.5%", "memory": "50.0%"}
+    assert len(summary["node_utilization"]) == 3
+    assert summary["outliers"] == ["node-1"]
+
+
+def test_summarize_node_usage_without_metrics():
+    assert summarize_node_usage([{"name": "a", "cpu": "1", "memory": "1Gi"}], []) == {"nodes_with_metrics": 0}
@@ -0,0 +1,38 @@
+"""
+Tests for the WebSocket reconnect policy.
+"""
+
+from websockets.exceptions import ConnectionClosedError, ConnectionClosedOK
+from websockets.frames import Close
+
+from kubewhisper.modules.reconnect import ReconnectPolicy
+
+
+def test_transient_close_codes_are_retried():
+    keepalive_timeout = ConnectionClosedError(None, Close(1011, "keepalive ping timeout"))
+    abnormal_closure = ConnectionClosedError(None, None)
+    service_restart = ConnectionClosedError(Close(1012, "service restart"), None)
+
+    for error in (keepalive_timeout, abnormal_closure, service_restart, ConnectionRefusedError(), TimeoutError()):
+        assert ReconnectPolicy.is_transient(error)
+
+
+def test_normal_close_and_other_errors_are_not_retried():
+    assert not ReconnectPolicy.is_transient(ConnectionClosedOK(Close(1000, ""), Close(1000, ""), True))
+    assert not ReconnectPolicy.is_transient(ConnectionClosedError(Close(1008, "policy violation"), None))
+    assert not ReconnectPolicy.is_transient(ValueError("bad message"))
+
+
+def test_backoff_is_capped_and_stops_after_max_attempts():
+    policy = ReconnectPolicy(base_delay=1.0, max_delay=4.0, max_attempts=5)
+    error = ConnectionClosedError(None, None)
+
+    delays = []
+    while policy.should_retry(error):
+        delays.append(policy.next_delay())
+
+    assert len(delays) == 5
+    assert all(0 <= delay <= 4.0 for delay in delays)
+
+    policy.reset()
+    assert policy.should_retry(error)
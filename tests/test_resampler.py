@@ -0,0 +1,53 @@
+"""
+Tests for streaming resampling of microphone audio.
+"""
+
+import numpy as np
+import pytest
+
+from kubewhisper.modules.resampler import Resampler
+
+
+def sine(rate, frequency=1000, seconds=1.0, amplitude=8000):
+    t = np.arange(int(rate * seconds)) / rate
+    return (np.sin(2 * np.pi * frequency * t) * amplitude).astype(np.int16)
+
+
+def dominant_frequency(samples, rate):
+    spectrum = np.abs(np.fft.rfft(samples.astype(np.float64)))
+    return np.fft.rfftfreq(len(samples), 1 / rate)[np.argmax(spectrum)]
+
+
+@pytest.mark.parametrize("input_rate", [16000, 44100, 48000])
+def test_resampling_keeps_duration_and_pitch(input_rate):
+    resampler = Resampler(input_rate)
+    audio = sine(input_rate)
+    frame = input_rate // 50
+    output = b"".join(resampler.process(audio[i : i + frame].tobytes()) for i in range(0, len(audio), frame))
+    samples = np.frombuffer(output, dtype=np.int16)
+
+    assert abs(len(samples) - 24000) <= 1
+    assert dominant_frequency(samples, 24000) == pytest.approx(1000, abs=2)
+
+
+def test_chunked_output_matches_one_pass():
+    audio = sine(44100, frequency=440).tobytes()
+    whole = np.frombuffer(Resampler(44100).process(audio), dtype=np.int16)
+
+    resampler = Resampler(44100)
+    chunks = [audio[i : i + 1764] for i in range(0, len(audio), 1764)]
+    chunked = np.frombuffer(b"".join(resampler.process(chunk) for chunk in chunks), dtype=np.int16)
+
+    assert len(chunked) == len(whole)
+    assert np.max(np.abs(chunked.astype(np.int32) - whole)) <= 1
+
+
+def test_downsampling_removes_content_above_the_new_nyquist():
+    # 20 kHz is above 12 kHz, without filtering it would alias to 4 kHz
+    output = Resampler(48000).process(sine(48000, frequency=20000).tobytes())
+    assert np.abs(np.frombuffer(output, dtype=np.int16)).max() < 800
+
+
+def test_same_rate_passes_audio_through():
+    audio = sine(24000).tobytes()
+    assert Resampler(24000).process(audio) is audio
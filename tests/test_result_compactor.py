@@ -0,0 +1,58 @@
+"""
+Tests for compaction of tool results sent to the model.
+"""
+
+import json
+
+from kubewhisper.modules.result_compactor import compact_result
+
+
+def _log_analysis(lines):
+    return {
+        "summary": {"total_errors": len(lines), "pods_analyzed": 3},
+        "detailed_errors": {
+            "exception": [
+                {"timestamp": f"2025-01-01T10:{i % 60:02d}:00Z", "message": message, "age_minutes": i}
+                for i, message in enumerate(lines)
+            ]
+        },
+    }
+
+
+def test_small_result_is_unchanged():
+    result = {"pod_count": 12}
+    assert compact_result(result, max_bytes=1000) is result
+
+
+def test_similar_messages_are_deduplicated_with_counts():
+    lines = [f"2025-01-01T10:00:{i % 60:02d}Z ERROR request {i} failed after 30s" for i in range(2000)]
+    lines += ["2025-01-01T10:00:00Z ERROR cannot connect to database"] * 5
+
+    compacted = compact_result(_log_analysis(lines), max_bytes=4000)
+
+    errors = compacted["detailed_errors"]["exception"]
+    assert errors[0]["count"] == 2000
+    assert errors[1]["count"] == 5
+    assert compacted["summary"]["total_errors"] == 2005
+    assert len(json.dumps(compacted)) <= 4000
+
+
+def test_long_fields_and_lists_are_trimmed_to_budget():
+    lines = [f"unique failure {chr(65 + i % 26)}{'x' * 2000}{chr(65 + i // 26)}" for i in range(300)]
+
+    compacted = compact_result(_log_analysis(lines), max_bytes=3000)
+
+    assert len(json.dumps(compacted)) <= 3000
+    assert compacted["compacted"]["original_bytes"] > 3000
+
+
+def test_omitted_counts_refer_to_the_original_list():
+    result = {"pods": [{"name": f"pod-{i:03d}", "phase": "Running"} for i in range(100)]}
+
+    compacted = compact_result(result, max_bytes=800)
+
+    pods = compacted["pods"]
+    kept = [pod for pod in pods if "omitted" not in pod]
+    omitted = sum(pod.get("omitted", 0) for pod in pods)
+    assert len(kept) + omitted == 100
+    assert len(json.dumps(compacted)) <= 800
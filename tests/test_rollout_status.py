@@ -0,0 +1,145 @@
+"""
+Tests for judging deployment rollouts like kubectl rollout status.
+"""
+
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from kubewhisper.modules import kubernetes_tools
+from kubewhisper.modules.rollout_status import rollout_status
+from kubewhisper.modules.tool_deadline import ToolDeadline
+
+
+def deployment(desired=3, generation=2, observed=2, paused=False, conditions=(), **status):
+    return {
+        "metadata": {"name": "web", "namespace": "default", "generation": generation},
+        "spec": {"replicas": desired, "paused": paused},
+        "status": {"observedGeneration": observed, "conditions": list(conditions), **status},
+    }
+
+
+def test_rollout_steps_are_reported_in_kubectl_order():
+    assert rollout_status(deployment(observed=1)).message == "Waiting for the deployment spec update to be observed"
+    assert rollout_status(deployment(updatedReplicas=1, replicas=4)).message == (
+        "1 out of 3 new replicas have been updated"
+    )
+    assert rollout_status(deployment(updatedReplicas=3, replicas=4)).message == "1 old replicas are pending termination"
+    waiting = rollout_status(deployment(updatedReplicas=3, replicas=3, availableReplicas=2))
+    assert (waiting.state, waiting.message) == ("progressing", "2 of 3 updated replicas are available")
+    assert not waiting.finished
+
+
+def test_complete_rollout():
+    status = rollout_status(deployment(updatedReplicas=3, replicas=3, availableReplicas=3))
+    assert status.state == "complete"
+    assert status.finished
+
+
+def test_failures_end_the_wait():
+    deadline = {"type": "Progressing", "status": "False", "reason": "ProgressDeadlineExceeded"}
+    assert rollout_status(deployment(conditions=[deadline], updatedReplicas=1)).state == "failed"
+
+    quota = {"type": "ReplicaFailure", "status": "True", "message": "exceeded quota: compute"}
+    failed = rollout_status(deployment(conditions=[quota], updatedReplicas=1))
+    assert (failed.state, failed.message, failed.finished) == ("failed", "exceeded quota: compute", True)
+
+    assert rollout_status(deployment(paused=True, updatedReplicas=1)).state == "paused"
+
+
+class FakeWatchResponse:
+    status = 200
+
+    def __init__(self, events, before_each=None):
+        self.events = events
+        self.before_each = before_each
+        self.closed = False
+
+    def stream(self, amt=None, decode_content=False):
+        for event_type, deployment in self.events:
+            if self.before_each:
+                self.before_each()
+            yield (json.dumps({"type": event_type, "object": deployment}) + "\n").encode()
+
+    def close(self):
+        self.closed = True
+
+    def release_conn(self):
+        pass
+
+
+class FakeAppsV1:
+    def __init__(self, listed, response):
+        self.listed = listed
+        self.response = response
+        self.watch_kwargs = None
+
+    def list_namespaced_deployment(self, namespace, **kwargs):
+        """
+        :return: V1DeploymentList
+        """
+        if kwargs.get("watch"):
+            self.watch_kwargs = kwargs
+            return self.response
+        body = {"metadata": {"resourceVersion": "41"}, "items": [self.listed]}
+        return SimpleNamespace(data=json.dumps(body).encode())
+
+
+@pytest.mark.asyncio
+async def test_waiting_follows_the_watch_until_the_rollout_completes(monkeypatch):
+    started = deployment(updatedReplicas=1, replicas=4)
+    response = FakeWatchResponse(
+        [
+            ("MODIFIED", deployment(updatedReplicas=3, replicas=4)),
+            ("MODIFIED", deployment(updatedReplicas=3, replicas=3, availableReplicas=3)),
+            ("MODIFIED", deployment(paused=True)),
+        ]
+    )
+    apps = FakeAppsV1(started, response)
+    monkeypatch.setattr(kubernetes_tools, "apps_v1_api", lambda context=None: apps)
+
+    result = await kubernetes_tools.get_rollout_status("web", deadline=ToolDeadline(45))
+
+    assert result["state"] == "complete"
+    assert result["replicas"] == {"desired": 3, "updated": 3, "available": 3}
+    assert "still_waiting" not in result
+    assert apps.watch_kwargs["field_selector"] == "metadata.name=web"
+    assert apps.watch_kwargs["resource_version"] == "41"
+    assert response.closed
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_wait_stops_the_watch(monkeypatch):
+    waiting = threading.Event()
+    release = threading.Event()
+
+    def block():
+        waiting.set()
+        release.wait(5)
+
+    response = FakeWatchResponse(
+        [("MODIFIED", deployment(updatedReplicas=2, replicas=4)) for _ in range(3)], before_each=block
+    )
+    apps = FakeAppsV1(deployment(updatedReplicas=1, replicas=4), response)
+    monkeypatch.setattr(kubernetes_tools, "apps_v1_api", lambda context=None: apps)
+    deadline = ToolDeadline(45)
+
+    task = asyncio.create_task(kubernetes_tools.get_rollout_status("web", deadline=deadline))
+    await asyncio.to_thread(waiting.wait, 5)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    answered = deadline.partial
+    release.set()
+
+    # The watch ends after the next event instead of running until its timeout
+    for _ in range(50):
+        if response.closed:
+            break
+        await asyncio.sleep(0.02)
+    assert response.closed
+    assert deadline.partial is answered
+    assert answered["replicas"]["updated"] == 1
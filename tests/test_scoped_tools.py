@@ -0,0 +1,179 @@
+"""
+Tests for pod, event and cluster status tools scoped to a namespace or label selector.
+"""
+
+import datetime
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from kubewhisper.modules import kubernetes_tools
+
+
+def minutes_ago(minutes):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return (now - datetime.timedelta(minutes=minutes)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def pod(namespace, name, phase="Running", **labels):
+    return {"metadata": {"namespace": namespace, "name": name, "labels": labels}, "status": {"phase": phase}}
+
+
+def event(namespace, name, reason, minutes, kind="Pod", type="Warning"):
+    return {
+        "metadata": {"namespace": namespace, "name": f"{name}.{reason.lower()}", "labels": {}},
+        "type": type,
+        "reason": reason,
+        "message": f"{reason} on {name}",
+        "lastTimestamp": minutes_ago(minutes),
+        "involvedObject": {"namespace": namespace, "kind": kind, "name": name},
+    }
+
+
+def lookup(item, path):
+    for key in path.split("."):
+        item = item.get(key, {})
+    return item
+
+
+class FakeCoreV1:
+    """Applies namespaces and selectors like the API server, recording every list call."""
+
+    def __init__(self, pods, events):
+        self.items = {"pod": pods, "event": events}
+        self.calls = []
+
+    def _list(self, call, resource, namespace=None, label_selector=None, field_selector=None, **kwargs):
+        self.calls.append((call, namespace, label_selector, field_selector))
+        items = [item for item in self.items[resource] if namespace in (None, item["metadata"]["namespace"])]
+        for term in label_selector.split(",") if label_selector else []:
+            key, value = term.split("=")
+            items = [item for item in items if item["metadata"]["labels"].get(key) == value]
+        for term in field_selector.split(",") if field_selector else []:
+            key, value = term.split("=")
+            items = [item for item in items if lookup(item, key) == value]
+        return SimpleNamespace(data=json.dumps({"items": items}).encode())
+
+    def list_namespaced_pod(self, namespace, **kwargs):
+        return self._list("list_namespaced_pod", "pod", namespace, **kwargs)
+
+    def list_pod_for_all_namespaces(self, **kwargs):
+        return self._list("list_pod_for_all_namespaces", "pod", **kwargs)
+
+    def list_namespaced_event(self, namespace, **kwargs):
+        return self._list("list_namespaced_event", "event", namespace, **kwargs)
+
+    def list_event_for_all_namespaces(self, **kwargs):
+        return self._list("list_event_for_all_namespaces", "event", **kwargs)
+
+    def list_node(self, **kwargs):
+        node = SimpleNamespace(
+            metadata=SimpleNamespace(name="node-1"), status=SimpleNamespace(allocatable={"cpu": "4", "memory": "8Gi"})
+        )
+        return SimpleNamespace(items=[node])
+
+
+class FakeCustomObjects:
+    def list_cluster_custom_object(self, **kwargs):
+        return {"items": [{"metadata": {"name": "node-1"}, "usage": {"cpu": "1", "memory": "2Gi"}}]}
+
+
+@pytest.fixture
+def core(monkeypatch):
+    # The "web" pods live in two namespaces, with events in storage order rather than by time
+    core = FakeCoreV1(
+        pods=[
+            pod("shop", "web-1", app="web"),
+            pod("shop", "web-2", phase="Pending", app="web"),
+            pod("shop", "db-1", app="db"),
+            pod("blog", "web-3", app="web"),
+        ],
+        events=[
+            event("shop", "web-1", "BackOff", 30),
+            event("shop", "db-1", "OOMKilled", 2),
+            event("shop", "web-2", "FailedScheduling", 1),
+            event("shop", "web-1", "Pulled", 20, type="Normal"),
+            event("shop", "web-1", "Unhealthy", 5),
+            event("shop", "shop-web", "ScalingReplicaSet", 3, kind="Deployment", type="Normal"),
+            event("blog", "web-3", "Killing", 10, type="Normal"),
+            event("shop", "web-2", "FailedMount", 8),
+        ],
+    )
+    monkeypatch.setattr(kubernetes_tools, "core_v1_api", lambda context=None: core)
+    monkeypatch.setattr(kubernetes_tools, "custom_objects_api", lambda context=None: FakeCustomObjects())
+    return core
+
+
+@pytest.mark.asyncio
+async def test_pod_count_is_filtered_by_the_api_server(core):
+    assert (await kubernetes_tools.get_number_of_pods())["pod_count"] == 4
+
+    result = await kubernetes_tools.get_number_of_pods(namespace="shop", label_selector="app=web")
+
+    assert result == {"pod_count": 2, "namespace": "shop", "label_selector": "app=web"}
+    assert core.calls == [
+        ("list_pod_for_all_namespaces", None, None, None),
+        ("list_namespaced_pod", "shop", "app=web", None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_label_selected_events_are_the_newest_of_the_selected_pods(core):
+    result = await kubernetes_tools.get_last_events(label_selector="app=web")
+
+    assert [event["message"] for event in result["events"]] == [
+        "FailedScheduling on web-2",
+        "Unhealthy on web-1",
+        "FailedMount on web-2",
+        "Killing on web-3",
+    ]
+    assert result["namespace"] == "all"
+    assert core.calls == [
+        ("list_pod_for_all_namespaces", None, "app=web", None),
+        ("list_event_for_all_namespaces", None, None, "involvedObject.kind=Pod"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_events_of_a_namespace(core):
+    result = await kubernetes_tools.get_last_events(namespace="blog")
+
+    assert [event["reason"] for event in result["events"]] == ["Killing"]
+    assert core.calls == [("list_namespaced_event", "blog", None, None)]
+
+
+@pytest.mark.asyncio
+async def test_cluster_status_scopes_pods_and_warnings(core):
+    result = await kubernetes_tools.get_cluster_status(namespace="shop", label_selector="app=web")
+
+    assert result["scope"] == {"namespace": "shop", "label_selector": "app=web"}
+    assert result["cluster_health"]["total_nodes"] == 1
+    assert result["cluster_health"]["pod_count"] == {"total": 2, "Running": 1, "Pending": 1}
+    # OOMKilled is about db-1 and is left out, BackOff is older than 15 minutes
+    assert sorted(issue["reason"] for issue in result["recent_issues"]["summary"]) == [
+        "FailedMount",
+        "FailedScheduling",
+        "Unhealthy",
+    ]
+    assert core.calls[-2:] == [
+        ("list_namespaced_pod", "shop", "app=web", None),
+        ("list_namespaced_event", "shop", None, "type=Warning,involvedObject.kind=Pod"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cluster_status_without_a_selector_reports_every_warning(core):
+    result = await kubernetes_tools.get_cluster_status(namespace="shop")
+
+    assert result["cluster_health"]["pod_count"]["total"] == 3
+    assert result["recent_issues"]["count"] == 4
+    assert core.calls[-1] == ("list_namespaced_event", "shop", None, "type=Warning")
+
+
+def test_event_filter_matches_pod_events_by_namespace_and_name():
+    matches = kubernetes_tools._event_filter([pod("shop", "web-1"), pod("blog", "web-3")])
+
+    assert matches("shop", "Pod", "web-1")
+    assert not matches("blog", "Pod", "web-1")
+    assert not matches("shop", "Deployment", "web-1")
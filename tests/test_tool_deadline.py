@@ -0,0 +1,45 @@
+"""
+Tests for deadline-aware tool execution.
+"""
+
+import asyncio
+
+import pytest
+
+from kubewhisper.modules.config import Config
+from kubewhisper.modules.tool_deadline import run_with_deadline
+
+
+@pytest.fixture
+def short_budget(monkeypatch):
+    monkeypatch.setitem(Config.TOOL_TIMEOUTS, "slow_tool", 0.05)
+
+
+@pytest.mark.asyncio
+async def test_fast_tool_result_is_returned_unchanged():
+    async def fast_tool(name):
+        return {"name": name}
+
+    assert await run_with_deadline("fast_tool", fast_tool, {"name": "nodes"}) == {"name": "nodes"}
+
+
+@pytest.mark.asyncio
+async def test_timed_out_tool_returns_partial_result(short_budget):
+    async def slow_tool(deadline=None):
+        deadline.partial["pods_analyzed"] = 3
+        await asyncio.sleep(1)
+        return {"pods_analyzed": 10}
+
+    result = await run_with_deadline("slow_tool", slow_tool, {})
+    assert result["pods_analyzed"] == 3
+    assert result["truncated"] is True
+
+
+@pytest.mark.asyncio
+async def test_timed_out_tool_without_partial_result_reports_error(short_budget):
+    async def slow_tool():
+        await asyncio.sleep(1)
+
+    result = await run_with_deadline("slow_tool", slow_tool, {})
+    assert "error" in result
+    assert result["truncated"] is True
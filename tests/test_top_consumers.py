@@ -0,0 +1,48 @@
+"""
+Tests for selecting the pods that use the most resources.
+"""
+
+import random
+
+import pytest
+
+from kubewhisper.modules.top_consumers import TopConsumers
+
+
+def pod_metrics(name, *memory_mi, cpu="10m"):
+    return {
+        "metadata": {"name": name, "namespace": "default"},
+        "containers": [{"name": f"c{i}", "usage": {"cpu": cpu, "memory": f"{m}Mi"}} for i, m in enumerate(memory_mi)],
+    }
+
+
+def test_containers_are_summed_per_pod():
+    top = TopConsumers("memory", count=2)
+    top.add_page([pod_metrics("a", 100, 300), pod_metrics("b", 350), pod_metrics("c", 10)])
+    assert top.results() == [
+        {"pod": "a", "namespace": "default", "memory": "400Mi"},
+        {"pod": "b", "namespace": "default", "memory": "350Mi"},
+    ]
+
+
+def test_selection_across_pages_matches_a_full_sort():
+    rng = random.Random(7)
+    pods = [pod_metrics(f"pod-{i}", rng.randint(1, 5000)) for i in range(1000)]
+    top = TopConsumers("memory", count=10)
+    for start in range(0, len(pods), 64):
+        top.add_page(pods[start : start + 64])
+
+    expected = sorted(pods, key=lambda pod: -int(pod["containers"][0]["usage"]["memory"][:-2]))[:10]
+    assert [entry["pod"] for entry in top.results()] == [pod["metadata"]["name"] for pod in expected]
+    assert top.pods_seen == 1000
+
+
+def test_cpu_is_reported_in_millicores():
+    top = TopConsumers("cpu", count=1)
+    top.add_page([pod_metrics("a", 1, cpu="1500000n"), pod_metrics("b", 1, cpu="250m")])
+    assert top.results() == [{"pod": "b", "namespace": "default", "cpu": "250m"}]
+
+
+def test_unknown_resource_is_rejected():
+    with pytest.raises(ValueError):
+        TopConsumers("disk")
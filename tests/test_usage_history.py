@@ -0,0 +1,76 @@
+"""
+Tests for the in-memory usage history and its trends.
+"""
+
+import numpy as np
+
+from kubewhisper.modules.usage_history import RingBuffer, UsageHistory
+
+
+def node(name, cpu, memory_mi):
+    return {"metadata": {"name": name}, "usage": {"cpu": cpu, "memory": f"{memory_mi}Mi"}}
+
+
+def pod(namespace, *memory_mi):
+    return {
+        "metadata": {"name": "pod", "namespace": namespace},
+        "containers": [
+            {"name": f"c{i}", "usage": {"cpu": "100m", "memory": f"{m}Mi"}} for i, m in enumerate(memory_mi)
+        ],
+    }
+
+
+def test_ring_buffer_keeps_the_newest_samples_in_order():
+    ring = RingBuffer(3)
+    for second in range(5):
+        ring.append(second, (second, second * 2))
+    times, values = ring.ordered()
+    assert times.tolist() == [2, 3, 4]
+    assert values[:, 1].tolist() == [4, 6, 8]
+
+
+def test_namespaces_sum_their_containers():
+    history = UsageHistory()
+    history.record(0, [], [pod("shop", 100, 50), pod("shop", 250), pod("db", 400)])
+    assert history.trend("namespace", "shop", "memory", since=0)["last"] == "400Mi"
+    assert history.trend("namespace", "db", "cpu", since=0)["last"] == "100m"
+
+
+def test_rising_memory_is_reported_with_its_rate():
+    history = UsageHistory(interval=60)
+    for minute in range(30):
+        history.record(minute * 60, [node("a", "500m", 1000 + 10 * minute), node("b", "500m", 800)], [])
+
+    rising = history.trend("node", "a", "memory", since=0)
+    assert rising["direction"] == "rising"
+    assert rising["change_per_hour"] == "600Mi"
+    assert (rising["first"], rising["last"], rising["samples"]) == ("1000Mi", "1290Mi", 30)
+    assert history.trend("node", "b", "memory", since=0)["direction"] == "flat"
+    assert [trend["node"] for trend in history.trends("node", "memory", since=0, limit=5)] == ["a", "b"]
+
+
+def test_older_windows_are_answered_from_downsampled_averages():
+    history = UsageHistory(raw_capacity=10, factor=5, coarse_capacity=10, interval=60)
+    for minute in range(40):
+        history.record(minute * 60, [node("a", "1", 1000 + minute)], [])
+
+    series = history.series[("node", "a")]
+    assert series.raw.size == 10
+    assert series.coarse.size == 8
+    recent = history.trend("node", "a", "memory", since=35 * 60)
+    assert recent["samples"] == 5
+    # Averages from before the oldest raw sample, then the 10 raw samples
+    older = history.trend("node", "a", "memory", since=0)
+    assert older["samples"] == 6 + 10
+    assert older["minutes_covered"] == 37.0
+    times, _ = series.window(0)
+    assert np.all(np.diff(times) > 0)
+    assert np.isclose(series.coarse.ordered()[1][0, 1], (1000 + 2) * 2**20)
+
+
+def test_usage_trend_is_only_offered_for_the_sampled_context():
+    from kubewhisper.modules import kubernetes_tools
+
+    schema = next(tool for tool in kubernetes_tools.tools if tool["name"] == "get_usage_trend")
+    assert "clusters" not in schema["parameters"]["properties"]
+    assert kubernetes_tools.function_map["get_usage_trend"] is kubernetes_tools.get_usage_trend